@@ -0,0 +1,267 @@
+# Benchmark harness for the string finder algorithm
+#
+# Generates seeded grids of several kinds and sizes, times the search APIs
+# across word lengths and writes machine-readable JSON results that can be
+# compared against a saved baseline run.
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Add parent directory to path to import string_finder
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from string_finder import (MatrixIndex, find_all_strings, find_string_in_matrix,
+                           find_string_with_path)
+
+DEFAULT_SIZES = (10, 100, 500, 1000, 2000)
+QUICK_SIZES = (10, 100)
+DEFAULT_LENGTHS = (3, 5, 8, 12)
+
+# Relative English letter frequencies, used for natural-language grids
+LETTER_FREQUENCIES = {
+    'E': 12.7, 'T': 9.1, 'A': 8.2, 'O': 7.5, 'I': 7.0, 'N': 6.7, 'S': 6.3,
+    'H': 6.1, 'R': 6.0, 'D': 4.3, 'L': 4.0, 'C': 2.8, 'U': 2.8, 'M': 2.4,
+    'W': 2.4, 'F': 2.2, 'G': 2.0, 'Y': 2.0, 'P': 1.9, 'B': 1.5, 'V': 1.0,
+    'K': 0.8, 'J': 0.2, 'X': 0.2, 'Q': 0.1, 'Z': 0.1,
+}
+
+
+def generate_grid(kind, size, rng):
+    """
+    Generate a square grid of characters.
+
+    Args:
+        kind (str): 'random' (uniform A-Z), 'low_entropy' (two letters,
+                    REPEAT_MATRIX-style) or 'natural' (English letter frequencies)
+        size (int): Number of rows and columns
+        rng (random.Random): Seeded random generator
+
+    Returns:
+        list[list[str]]: Generated matrix
+    """
+    if kind == 'random':
+        letters, weights = list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'), None
+    elif kind == 'low_entropy':
+        letters, weights = ['A', 'B'], None
+    elif kind == 'natural':
+        letters, weights = list(LETTER_FREQUENCIES), list(LETTER_FREQUENCIES.values())
+    else:
+        raise ValueError(f"Unknown grid kind {kind!r}")
+    return [rng.choices(letters, weights, k=size) for _ in range(size)]
+
+
+def generate_words(matrix, length, count, rng):
+    """
+    Generate query words, half spelled by random walks in the grid and half random.
+
+    Args:
+        matrix (list[list[str]]): Grid the words are searched in
+        length (int): Length of each word
+        count (int): Number of words
+        rng (random.Random): Seeded random generator
+
+    Returns:
+        list[str]: Generated words
+    """
+    size = len(matrix)
+    letters = sorted({char for row in matrix for char in row})
+    words = []
+    for i in range(count):
+        if i % 2:
+            words.append(''.join(rng.choice(letters) for _ in range(length)))
+            continue
+        # Self-avoiding random walk; restart if it gets stuck
+        while True:
+            r, c = rng.randrange(size), rng.randrange(size)
+            path = [(r, c)]
+            while len(path) < length:
+                moves = [(r + dr, c + dc) for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0))
+                         if 0 <= r + dr < size and 0 <= c + dc < size and (r + dr, c + dc) not in path]
+                if not moves:
+                    break
+                r, c = rng.choice(moves)
+                path.append((r, c))
+            if len(path) == length:
+                words.append(''.join(matrix[r][c] for r, c in path))
+                break
+    return words
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_case(name, call, items, max_seconds):
+    """
+    Time one benchmark case.
+
+    Every item is timed separately, until all items ran or the time budget is
+    spent. Peak memory is measured in a separate traced call on the first
+    item, so tracing doesn't distort the timings.
+
+    Args:
+        name (str): Benchmark name
+        call (callable): Function called once per item
+        items (list): Query arguments
+        max_seconds (float): Time budget for the case
+
+    Returns:
+        dict: Latency percentiles (ms), throughput and peak memory (KiB)
+    """
+    latencies = []
+    deadline = time.perf_counter() + max_seconds
+    for item in items:
+        start = time.perf_counter()
+        call(item)
+        latencies.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            break
+
+    tracemalloc.start()
+    call(items[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'name': name,
+        'queries': len(latencies),
+        'latency_ms': {
+            'mean': 1000 * statistics.mean(latencies),
+            'p50': 1000 * percentile(latencies, 0.50),
+            'p90': 1000 * percentile(latencies, 0.90),
+            'p99': 1000 * percentile(latencies, 0.99),
+        },
+        'throughput_qps': len(latencies) / total if total else float('inf'),
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def run_benchmarks(kinds, sizes, lengths, queries, max_seconds, seed):
+    """
+    Run every benchmark case for every grid kind, size and word length.
+
+    Returns:
+        list[dict]: One result record per case
+    """
+    results = []
+    for kind in kinds:
+        for size in sizes:
+            rng = random.Random(f"{seed}-{kind}-{size}")
+            matrix = generate_grid(kind, size, rng)
+            index = MatrixIndex(matrix)
+            for length in lengths:
+                if length > size * size:
+                    continue
+                words = generate_words(matrix, length, queries, rng)
+                cases = [
+                    ('find_string_in_matrix', lambda word: find_string_in_matrix(matrix, word), words),
+                    ('find_string_with_path', lambda word: find_string_with_path(matrix, word), words),
+                    ('find_string_with_path[backtrack]',
+                     lambda word: find_string_with_path(matrix, word, engine='backtrack'), words),
+                    ('find_string_with_path[bidirectional]',
+                     lambda word: find_string_with_path(matrix, word, engine='bidirectional'), words),
+                    ('MatrixIndex.find_string_with_path', index.find_string_with_path, words),
+                    ('find_all_strings', lambda batch: find_all_strings(matrix, batch), [words]),
+                ]
+                for name, call, items in cases:
+                    record = run_case(name, call, items, max_seconds)
+                    record.update(grid=kind, size=size, word_length=length)
+                    results.append(record)
+                    print(f"{kind:>11} {size:>5}x{size:<5} len={length:<3} {name:<40} "
+                          f"p50={record['latency_ms']['p50']:9.3f} ms  "
+                          f"p99={record['latency_ms']['p99']:9.3f} ms  "
+                          f"{record['throughput_qps']:10.1f} q/s  "
+                          f"peak={record['peak_memory_kb']:10.1f} KiB", flush=True)
+    return results
+
+
+def case_key(record):
+    """Key identifying the same benchmark case across runs."""
+    return (record['name'], record['grid'], record['size'], record['word_length'])
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare median latencies against a baseline run.
+
+    Args:
+        results (list[dict]): Current results
+        baseline (dict): Baseline report as written by this script
+        tolerance (float): Allowed relative slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        list[str]: Descriptions of cases that regressed
+    """
+    previous = {case_key(record): record for record in baseline['results']}
+    regressions = []
+    for record in results:
+        old = previous.get(case_key(record))
+        if old is None:
+            continue
+        ratio = record['latency_ms']['p50'] / max(old['latency_ms']['p50'], 1e-9)
+        record['baseline_p50_ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(f"{'/'.join(map(str, case_key(record)))}: p50 {ratio:.2f}x baseline")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the string finder algorithm")
+    parser.add_argument('--kinds', nargs='+', default=['random', 'low_entropy', 'natural'],
+                        choices=['random', 'low_entropy', 'natural'], help="grid kinds to generate")
+    parser.add_argument('--sizes', nargs='+', type=int, default=None,
+                        help=f"grid sizes (default {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--quick', action='store_true',
+                        help=f"only run sizes {' '.join(map(str, QUICK_SIZES))}")
+    parser.add_argument('--lengths', nargs='+', type=int, default=list(DEFAULT_LENGTHS),
+                        help="word lengths to query")
+    parser.add_argument('--queries', type=int, default=20, help="words per case")
+    parser.add_argument('--max-seconds', type=float, default=5.0, help="time budget per case")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--output', help="write JSON results to this file")
+    parser.add_argument('--baseline', help="compare against a previous JSON results file")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed relative p50 slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    results = run_benchmarks(args.kinds, sizes, args.lengths, args.queries, args.max_seconds, args.seed)
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions against {args.baseline}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,20 +8,39 @@ Author: jmartinl
 Date: September 22, 2025
 """
 
-def find_string_in_matrix(matrix, target_string):
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from threading import Lock
+from time import perf_counter
+
+def find_string_in_matrix(matrix, target_string, engine='greedy', workers=None, stats=None, cache=None,
+                          timeout=None, max_nodes=None, memo=False):
     """
     Find a string in a 2D character matrix using horizontal and vertical moves.
     
     Args:
-        matrix (list[list[str]]): 2D matrix of characters
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
         target_string (str): String to search for
+        engine (str): Search engine to use, one of ENGINES
+        workers (int or None): Number of worker processes, None to search in-process
+        stats (SearchStats or None): Filled in with statistics about the search
+        cache (SearchCache or None): Cache to look the result up in and store it to
+        timeout (float or None): Seconds the search may run, None for no limit
+        max_nodes (int or None): Number of cells the search may add to paths, None for no limit
+        memo (bool): Skip cells that can't continue the string, see DeadEndMemo
         
     Returns:
-        bool: True if string is found, False otherwise
+        bool or SearchResult: True if string is found, False otherwise; a SearchResult
+                              when timeout or max_nodes is given
         
     """
+    if timeout is not None or max_nodes is not None:
+        return find_string_with_path(matrix, target_string, engine, workers, stats, cache,
+                                     timeout, max_nodes, memo)
     # Use find_string_with_path to determine if the string exists
-    path = find_string_with_path(matrix, target_string)
+    path = find_string_with_path(matrix, target_string, engine, workers, stats, cache, memo=memo)
     return path is not None
 
 def manhattan_distance(p1, p2):
@@ -37,6 +56,40 @@ def manhattan_distance(p1, p2):
     """
     return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
 
+# Horizontal and vertical single-step moves: right, left, down, up
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+# Available search engines:
+# - greedy: bidirectional walk from the rarest character, fast but may miss paths
+# - backtrack: exhaustive depth-first search, always finds a path if one exists
+# - bidirectional: exhaustive search growing both halves of the string from a
+#   rare anchor character or pair, best for long strings with a distinctive middle
+# - frontier: exhaustive search from the start cells left by a relaxed
+#   reachability pass, vectorized with NumPy on large grids when it is installed
+ENGINES = ('greedy', 'backtrack', 'bidirectional', 'frontier')
+
+# Start positions are checked against the positions of up to RARE_ANCHORS of
+# the rarest characters of a string, if they occur at most RARE_ANCHOR_LIMIT times
+RARE_ANCHORS = 3
+RARE_ANCHOR_LIMIT = 64
+
+# Number of halves found per anchor that the bidirectional engine tries to
+# join with each path of the other half before searching for a new one
+JOIN_CANDIDATES = 8
+
+# Grids with at least this many cells run relaxed reachability with NumPy, if installed
+VECTORIZE_MIN_CELLS = 4096
+
+# Default number of rows and columns of the tiles searched by find_string_tiled
+TILE_SIZE = 1024
+
+# Searches with a timeout read the clock once per this many cells added to paths
+DEADLINE_CHECK_NODES = 64
+
+# Cells a pattern search may add to paths from each anchor before moving on to
+# the next one; anchors left unfinished are retried with four times as many
+PATTERN_ANCHOR_NODES = 1024
+
 # Get all positions of a character in a string
 def get_char_positions_in_string(tgt_string, char):
     """
@@ -51,6 +104,22 @@ def get_char_positions_in_string(tgt_string, char):
     """
     return [i for i, c in enumerate(tgt_string) if c == char]
 
+def _can_revisit(word):
+    """
+    Check whether a path spelling a word could visit the same cell twice.
+    
+    Grid moves alternate between the two colours of a checkerboard, so a path
+    returns to a cell only after an even number of steps, and the character
+    spelled on both visits must be the same.
+    
+    Args:
+        word (str or bytes): Word to check
+        
+    Returns:
+        bool: True if two indices of equal parity hold the same character
+    """
+    return any(len(set(word[parity::2])) < len(word[parity::2]) for parity in (0, 1))
+
 def get_char_positions_in_matrix(matrix, char):
     """
     Get all positions of a character in the matrix.
@@ -69,91 +138,315 @@ def get_char_positions_in_matrix(matrix, char):
                 positions.append((r, c))
     return positions
 
-def find_string_with_path(matrix, target_string):
+def find_string_with_path(matrix, target_string, engine='greedy', workers=None, stats=None, cache=None,
+                          timeout=None, max_nodes=None, memo=False):
     """
     Find a string in a 2D character matrix and return the path.
     
+    With a timeout or node budget the search gives up once the budget is
+    spent and reports a SearchResult instead of a path, see
+    MatrixIndex.find_string_with_path.
+    
     Args:
-        matrix (list[list[str]]): 2D matrix of characters
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+        target_string (str): String to search for
+        engine (str): Search engine to use, one of ENGINES
+        workers (int or None): Number of worker processes, None to search in-process
+        stats (SearchStats or None): Filled in with statistics about the search
+        cache (SearchCache or None): Cache to look the result up in and store it to;
+                                     with a budget or memo only its indexes are reused
+        timeout (float or None): Seconds the search may run, None for no limit
+        max_nodes (int or None): Number of cells the search may add to paths, None for no limit
+        memo (bool): Skip cells that can't continue the string, see DeadEndMemo
+        
+    Returns:
+        list[tuple[int, int]] or None or SearchResult: List of (row, col) coordinates
+            forming the path, or None if string is not found; a SearchResult when
+            timeout or max_nodes is given
+                                      
+    """
+    if timeout is not None or max_nodes is not None or memo:
+        index = MatrixIndex(matrix) if cache is None else cache.get_index(matrix)
+        return index.find_string_with_path(target_string, engine, workers, stats, timeout, max_nodes, memo)
+    if cache is not None:
+        return cache.find_string_with_path(matrix, target_string, engine, workers, stats)
+    # Build a throwaway index; callers running many queries should keep a MatrixIndex
+    return MatrixIndex(matrix).find_string_with_path(target_string, engine, workers, stats)
+
+def find_all_strings(matrix, words, workers=None):
+    """
+    Find many strings in a 2D character matrix in a single pass.
+    
+    The words are merged into a prefix trie and one depth-first search is run
+    per starting cell, so shared prefixes are only walked once and branches
+    that fall off the trie are pruned immediately.
+    
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+        words (Iterable[str]): Strings to search for
+        workers (int or None): Number of worker processes, None to search in-process
+        
+    Returns:
+        dict[str, list[tuple[int, int]] or None]: Mapping of each word to its path,
+                                                 or None if the word is not found
+    """
+    return MatrixIndex(matrix).find_all_strings(words, workers)
+
+async def async_find_string_with_path(matrix, target_string, engine='greedy', timeout=None, service=None):
+    """
+    Find a string in a 2D character matrix without blocking the event loop.
+    
+    The search runs in the executor of an AsyncSearchService, and identical
+    queries against the same board that are in flight together share one search.
+    
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
         target_string (str): String to search for
+        engine (str): Search engine to use, one of ENGINES
+        timeout (float or None): Seconds to wait for the result, None to wait indefinitely
+        service (AsyncSearchService or None): Service running the search, None for a shared default
         
     Returns:
         list[tuple[int, int]] or None: List of (row, col) coordinates forming the path,
                                       or None if string is not found
                                       
+    Raises:
+        TimeoutError: If the result isn't ready within timeout
     """
+    service = service or _get_default_service()
+    return await service.find_string_with_path(matrix, target_string, engine, timeout)
 
-    # Return None for empty matrix
-    if not matrix or not matrix[0]:
+async def async_find_all_strings(matrix, words, engine='greedy', timeout=None, service=None):
+    """
+    Find many strings in a 2D character matrix without blocking the event loop.
+    
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+        words (Iterable[str]): Strings to search for
+        engine (str): Search engine to use, one of ENGINES
+        timeout (float or None): Seconds to wait for all results, None to wait indefinitely
+        service (AsyncSearchService or None): Service running the searches, None for a shared default
+        
+    Returns:
+        dict[str, list[tuple[int, int]] or None]: Mapping of each word to its path,
+                                                 or None if the word is not found
+                                                 
+    Raises:
+        TimeoutError: If the results aren't ready within timeout
+    """
+    service = service or _get_default_service()
+    return await service.find_all_strings(matrix, words, engine, timeout)
+
+def find_string_relaxed(matrix, target_string):
+    """
+    Check whether a string can be spelled by a walk that may revisit cells.
+    
+    This is a fast necessary condition for find_string_in_matrix: False
+    proves the string can't be found, True means it might be.
+    
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+        target_string (str): String to check
+        
+    Returns:
+        bool: True if a walk spelling the string exists, False otherwise
+    """
+    return MatrixIndex(matrix).find_string_relaxed(target_string)
+
+def iter_string_paths(matrix, target_string, limit=None):
+    """
+    Lazily generate every distinct path spelling a string in a 2D character matrix.
+    
+    Paths are produced one at a time as the search finds them, so callers can
+    stop early or page through the results without holding them all in memory.
+    
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+        target_string (str): String to search for
+        limit (int or None): Maximum number of paths to generate, None for all
+        
+    Yields:
+        list[tuple[int, int]]: List of (row, col) coordinates of each path
+    """
+    return MatrixIndex(matrix).iter_string_paths(target_string, limit)
+
+def count_string_occurrences(matrix, target_string, simple=False):
+    """
+    Count the distinct paths spelling a string in a 2D character matrix.
+    
+    Paths are counted by dynamic programming over (cell, string index) layers
+    rather than enumerated, using the same moves as get_valid_moves.
+    
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+        target_string (str): String to count
+        simple (bool): Only count paths that never reuse a cell
+        
+    Returns:
+        int: Number of distinct paths
+    """
+    return MatrixIndex(matrix).count_string_occurrences(target_string, simple)
+
+def find_pattern_with_path(matrix, pattern):
+    """
+    Find a wildcard pattern in a 2D character matrix and return the path.
+    
+    Patterns use ``?`` for any single character, ``*`` for any run of
+    characters (including none), ``[...]`` for character classes such as
+    ``[AEIOU]``, ``[A-F]`` or ``[^XYZ]``, and a backslash to match the next
+    character literally. See compile_pattern.
+    
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+        pattern (str or StringPattern): Pattern to search for
+        
+    Returns:
+        list[tuple[int, int]] or None: List of (row, col) coordinates forming the path,
+                                      or None if nothing matches
+                                      
+    Raises:
+        ValueError: If the pattern is malformed
+    """
+    return MatrixIndex(matrix).find_pattern_with_path(pattern)
+
+def find_string_tiled(grid, target_string, tile_size=TILE_SIZE, engine='backtrack', workers=None):
+    """
+    Find a string in a grid too large to index at once, one tile at a time.
+    
+    The grid is split into square tiles of tile_size rows and columns, and
+    each tile is searched together with a halo of len(target_string) - 1
+    cells on every side, so every path starting in a tile fits inside it.
+    Only one tile (per worker) is copied and indexed at a time, so memory
+    is bounded by the tile size rather than the grid size. Halos are
+    searched by both neighboring tiles, so tiles should be much larger
+    than the strings searched for. The halos only guarantee that a path is
+    found when tiles are searched exhaustively, hence the default engine.
+    
+    Args:
+        grid (str or list[list[str]] or CompactGrid): Path of a grid file, read
+                                                      memory-mapped, or a 2D matrix
+        target_string (str): String to search for
+        tile_size (int): Number of rows and columns of each tile, without its halo
+        engine (str): Search engine to use within tiles, one of ENGINES; greedy may miss paths
+        workers (int or None): Number of worker processes searching tiles, None to
+                               search in-process
+        
+    Returns:
+        list[tuple[int, int]] or None: List of (row, col) coordinates forming the path,
+                                      or None if string is not found
+                                      
+    Raises:
+        ValueError: If tile_size is less than 1
+    """
+    if tile_size < 1:
+        raise ValueError(f"tile_size must be at least 1, got {tile_size}")
+    if isinstance(grid, str):
+        mapped = load_matrix(grid)
+        try:
+            return find_string_tiled(mapped, target_string, tile_size, engine, workers)
+        finally:
+            if isinstance(mapped, MappedGrid):
+                mapped.close()
+    grid = as_compact_grid(grid)
+    if not grid.rows or not grid.cols:
         return None
-    # Return empty path for empty string
     if not target_string:
         return []
 
-    # First, get the positions of all characters in the target string
-    char_positions = {char: get_char_positions_in_matrix(matrix, char) for char in set(target_string)}
-    # If any character in the target string is not found or there are less occurrences than in the searched string, return None
-    # And keep track of the character with the lowest amount of positions
-    min_char = None
-    min_count = len(matrix) * len(matrix[0]) + 1
-    for char in target_string:
-        if not char_positions.get(char) or len(char_positions[char]) < target_string.count(char):
-            return None
-        if len(char_positions[char]) < min_count:
-            min_count = len(char_positions[char])
-            min_char = char
-
-    path = list(None for _ in target_string)
-    # Start from each position of the character with the fewest occurrences
-    start_positions = char_positions[min_char]
-    for start in start_positions:
-        # For every matrix start position iterate on its position in the target string
-        for start_index in get_char_positions_in_string(target_string, min_char):
-            path[start_index] = start
-            # Check for every valid direction whether the predecessor character is reachable
-            # If so, start an iterative approach until the first character is reached
-            # In that approach, do not check positions already in the path
-            visited = set()
-            current = start
-            idx = start_index
-            while current and current not in visited and idx > 0:
-                visited.add(current)
-                # Get the valid moves from the current position
-                for direction in get_valid_moves(matrix, current[0], current[1]):
-                    if direction in char_positions.get(target_string[idx - 1], []):
-                        path[idx - 1] = direction
-                        current = direction
-                        idx -= 1
-                        break
-                else:
-                    break
-            # Do the same for the successor characters but first remove the start position from visited if existent
-            if start in visited:
-                visited.remove(start)
-            current = start
-            idx = start_index
-            while current and current not in visited and idx < len(target_string) - 1:
-                visited.add(current)
-                for direction in get_valid_moves(matrix, current[0], current[1]):
-                    if direction in char_positions.get(target_string[idx + 1], []) and direction not in visited:
-                        path[idx + 1] = direction
-                        current = direction
-                        idx += 1
-                        break
-                else:
-                    # Go back to the previous position and remove the current from the path and the previous from the visited set
-                    if idx > start_index:
-                        path[idx] = None
-                        idx -= 1
-                        current = path[idx]
-                        visited.remove(current)
-                    else:
-                        break
-            # If the length of the path matches the length of the target string and there are no None values, return the path
-            if len(path) == len(target_string) and all(pos is not None for pos in path):
-                return path
+    tiles = _iter_tiles(grid.rows, grid.cols, tile_size, len(target_string) - 1)
+    if workers is not None and workers > 1:
+        results = _search_tiles_parallel(grid, tiles, target_string, engine, workers)
+    else:
+        # Neighbor tables of the tile shapes, kept for this search only
+        adjacencies = {}
+        results = ((tile, _search_tile(grid, tile, target_string, engine, adjacencies)) for tile in tiles)
+    try:
+        for (row, col, _, _), path in results:
+            if path is not None:
+                # Shift the path from tile to grid coordinates
+                return [(row + r, col + c) for r, c in path]
+    finally:
+        results.close()
     return None
 
+def build_trie(words, key=None):
+    """
+    Build a prefix trie from a collection of words.
+    
+    Args:
+        words (Iterable[str]): Words to insert
+        key (callable or None): Maps a word to the sequence inserted into the trie,
+                                defaults to the word itself
+        
+    Returns:
+        dict: Nested dictionaries keyed by character; the key None marks
+              the end of a word and holds the word itself
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in (word if key is None else key(word)):
+            node = node.setdefault(char, {})
+        node[None] = word
+    return trie
+
+def compile_pattern(pattern):
+    """
+    Compile a wildcard pattern into a sequence of match tokens.
+    
+    Args:
+        pattern (str): Pattern using ``?``, ``*``, ``[...]`` classes and backslash escapes
+        
+    Returns:
+        StringPattern: Compiled pattern, reusable across matrices
+        
+    Raises:
+        ValueError: If a class is not closed or the pattern ends with a backslash
+    """
+    tokens = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 == len(pattern):
+                raise ValueError(f"Pattern {pattern!r} ends with an escape")
+            tokens.append(('char', pattern[i + 1]))
+            i += 2
+        elif char == '?':
+            tokens.append(('any',))
+            i += 1
+        elif char == '*':
+            # Consecutive stars match the same runs as one
+            if not tokens or tokens[-1] != ('star',):
+                tokens.append(('star',))
+            i += 1
+        elif char == '[':
+            end = i + 1
+            negated = end < len(pattern) and pattern[end] == '^'
+            end += negated
+            # A ] right after the opening bracket is a member
+            first = end
+            while end < len(pattern) and (pattern[end] != ']' or end == first):
+                end += 1
+            if end >= len(pattern):
+                raise ValueError(f"Unterminated character class in pattern {pattern!r}")
+            members = pattern[first:end]
+            ranges = []
+            j = 0
+            while j < len(members):
+                if j + 2 < len(members) and members[j + 1] == '-':
+                    ranges.append((members[j], members[j + 2]))
+                    j += 3
+                else:
+                    ranges.append((members[j], members[j]))
+                    j += 1
+            tokens.append(('class', tuple(ranges), negated))
+            i = end + 1
+        else:
+            tokens.append(('char', char))
+            i += 1
+    return StringPattern(pattern, tokens)
+
 def is_valid_position(matrix, row, col):
     """
     Check if a position is valid within the matrix bounds.
@@ -183,36 +476,3725 @@ def get_valid_moves(matrix, row, col):
     Returns:
         list[tuple[int, int]]: List of valid (row, col) positions
     """
+    if not matrix or not matrix[0]:
+        return []
+    rows, cols = len(matrix), len(matrix[0])
     moves = []
     # Horizontal and vertical directions
-    directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # right, left, down, up
-    
-    for dr, dc in directions:
+    for dr, dc in DIRECTIONS:  # right, left, down, up
         new_row, new_col = row + dr, col + dc
-        if is_valid_position(matrix, new_row, new_col):
+        if 0 <= new_row < rows and 0 <= new_col < cols:
             moves.append((new_row, new_col))
     
     return moves
 
 
-if __name__ == "__main__":
-    # Example usage - you can test your implementation here
-    sample_matrix = [
-        ['H', 'E', 'L', 'L', 'O'],
-        ['W', 'O', 'R', 'L', 'D'],
-        ['P', 'Y', 'T', 'H', 'O'],
-        ['N', 'A', 'L', 'G', 'N']
-    ]
+class Adjacency:
+    """
+    Neighbor table for every cell of a grid shape, in CSR layout.
+
+    The neighbors of cell ``c`` are ``targets[offsets[c]:offsets[c + 1]]``,
+    listed in the same right, left, down, up order as get_valid_moves. Both
+    arrays are flat machine integers, so a 1000x1000 table takes about 20 MB
+    instead of one tuple object per cell. Cell ids follow the grid's row
+    stride; ids in the padding between rows have no neighbors.
+    """
+
+    __slots__ = ('rows', 'cols', 'stride', 'offsets', 'targets')
+
+    def __init__(self, rows, cols, stride=None):
+        """
+        Compute the neighbor table for a grid shape.
+
+        Args:
+            rows (int): Number of rows
+            cols (int): Number of columns
+            stride (int or None): Distance between the ids of vertically adjacent cells,
+                                  defaults to cols
+        """
+        stride = cols if stride is None else stride
+        self.rows = rows
+        self.cols = cols
+        self.stride = stride
+        typecode = 'i' if rows * stride < 2 ** 31 else 'q'
+        self.offsets = offsets = array(typecode, [0])
+        self.targets = targets = array(typecode)
+        padding = [0] * (stride - cols)
+        # Valid moves only depend on whether a cell is on the first or last
+        # row, so the cell-relative steps are computed once per row kind
+        row_steps = {}
+        for r in range(rows):
+            kind = (r == 0, r == rows - 1)
+            if kind not in row_steps:
+                row_steps[kind] = [[dr * stride + dc for dr, dc in DIRECTIONS
+                                    if 0 <= r + dr < rows and 0 <= c + dc < cols]
+                                   for c in range(cols)]
+            cell = r * stride
+            for steps in row_steps[kind]:
+                targets.extend([cell + step for step in steps])
+                offsets.append(len(targets))
+                cell += 1
+            if padding:
+                offsets.extend([len(targets)] * len(padding))
+
+    @classmethod
+    def from_arrays(cls, rows, cols, stride, offsets, targets):
+        """
+        Wrap precomputed offsets and targets, such as arrays mapped from an index file.
+
+        Args:
+            rows (int): Number of rows
+            cols (int): Number of columns
+            stride (int): Distance between the ids of vertically adjacent cells
+            offsets (array or memoryview): rows * stride + 1 offsets into targets
+            targets (array or memoryview): Neighbor cell ids
+
+        Returns:
+            Adjacency: Neighbor table using the given arrays
+        """
+        adjacency = cls.__new__(cls)
+        adjacency.rows = rows
+        adjacency.cols = cols
+        adjacency.stride = stride
+        adjacency.offsets = offsets
+        adjacency.targets = targets
+        return adjacency
+
+    def __len__(self):
+        return self.rows * self.stride
+
+    def __getitem__(self, cell):
+        return self.targets[self.offsets[cell]:self.offsets[cell + 1]]
+
+
+@lru_cache(maxsize=16)
+def get_adjacency(rows, cols, stride=None):
+    """
+    Get the shared neighbor table for a grid shape.
     
-    print("Sample matrix:")
-    for row in sample_matrix:
-        print(' '.join(row))
+    Tables only depend on the shape, so they are computed once and reused by
+    every index over a matrix of the same size.
     
-    # Test your implementation
-    result = find_string_with_path(sample_matrix, "HELLO")
-    assert result is not None, "String 'HELLO' should be found in the matrix"
-    print(f"Found 'HELLO': {result}")
+    Args:
+        rows (int): Number of rows
+        cols (int): Number of columns
+        stride (int or None): Distance between the ids of vertically adjacent cells,
+                              defaults to cols
+        
+    Returns:
+        Adjacency: Neighbor table for the shape
+    """
+    return Adjacency(rows, cols, stride)
 
-    result = find_string_with_path(sample_matrix, "HWPN")
-    assert result is not None, "String 'HWPN' should be found in the matrix"
-    print(f"Found 'HWPN': {result}")
+
+class CompactGrid:
+    """
+    Flat row-major character grid addressed by integer cell ids.
+
+    Cell (row, col) has id ``row * stride + col``, where the stride equals
+    the number of columns unless the rows are separated by padding (such as
+    line endings in a file). All characters are kept in a single string
+    rather than a list of lists of one-character strings, so an ASCII board
+    costs one byte per cell. The grid also behaves like a sequence of rows,
+    so ``grid[row][col]`` works wherever a list of lists is expected.
+
+    The cells may also be a bytes-like buffer holding one Latin-1 byte per
+    cell. Reading such a cell yields an int, so search code compares cells
+    against ``encode(target_string)`` rather than the string itself.
+    """
+
+    __slots__ = ('cells', 'rows', 'cols', 'stride')
+
+    def __init__(self, cells, rows, cols, stride=None):
+        """
+        Wrap a flat buffer of cells.
+
+        Args:
+            cells (str or bytes-like): Row-major cell characters
+            rows (int): Number of rows
+            cols (int): Number of columns
+            stride (int or None): Offset between the starts of consecutive rows,
+                                  defaults to cols
+
+        Raises:
+            ValueError: If the number of cells doesn't match the shape
+        """
+        stride = cols if stride is None else stride
+        # The padding after the last row may be missing
+        expected = (rows - 1) * stride + cols if rows else 0
+        if not expected <= len(cells) <= rows * stride:
+            raise ValueError(f"Expected {expected} cells for a {rows}x{cols} grid, got {len(cells)}")
+        self.cells = cells
+        self.rows = rows
+        self.cols = cols
+        self.stride = stride
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Build a compact grid from a list-of-lists matrix.
+
+        Args:
+            matrix (list[list[str]]): 2D matrix of characters
+
+        Returns:
+            CompactGrid: Grid holding the same characters
+
+        Raises:
+            ValueError: If rows differ in length or cells are not single characters
+        """
+        rows = len(matrix) if matrix else 0
+        cols = len(matrix[0]) if rows else 0
+        row_strings = [''.join(row) for row in matrix] if rows else []
+        for row, row_string in zip(matrix or [], row_strings):
+            if len(row) != cols or len(row_string) != cols:
+                raise ValueError("Matrix rows must have equal length and single-character cells")
+        return cls(''.join(row_strings), rows, cols)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError("grid row out of range")
+        start = row * self.stride
+        cells = self.cells[start:start + self.cols]
+        return cells if isinstance(cells, str) else bytes(cells).decode('latin-1')
+
+    def __repr__(self):
+        return f"{type(self).__name__}(rows={self.rows}, cols={self.cols})"
+
+    def cell_id(self, row, col):
+        """
+        Get the cell id of a position.
+
+        Args:
+            row (int): Row index
+            col (int): Column index
+
+        Returns:
+            int: Flat cell id
+        """
+        return row * self.stride + col
+
+    def position(self, cell):
+        """
+        Get the position of a cell id.
+
+        Args:
+            cell (int): Flat cell id
+
+        Returns:
+            tuple[int, int]: (row, col) position
+        """
+        return divmod(cell, self.stride)
+
+    def encode(self, text):
+        """
+        Convert a string to the values stored in the cells.
+
+        Args:
+            text (str): String to convert
+
+        Returns:
+            str or bytes or None: Sequence comparable with the cells, or None if
+                                  some character can't be stored in this grid
+        """
+        if isinstance(self.cells, str):
+            return text
+        try:
+            return text.encode('latin-1')
+        except UnicodeEncodeError:
+            return None
+
+    def find_cells(self, code):
+        """
+        Get the ids of all cells holding a value, in row-major order.
+
+        Args:
+            code (str or int): Cell value, as produced by encode
+
+        Returns:
+            list[int]: Matching cell ids
+        """
+        cells = self.cells
+        needle = code if isinstance(cells, str) else bytes((code,))
+        found = []
+        cell = cells.find(needle)
+        while cell != -1:
+            found.append(cell)
+            cell = cells.find(needle, cell + 1)
+        if self.stride != self.cols:
+            found = [cell for cell in found if cell % self.stride < self.cols]
+        return found
+
+    def region(self, row, col, rows, cols):
+        """
+        Copy a rectangle of cells into a new grid.
+
+        Only the cells of the rectangle are read, so copying a region of a
+        memory-mapped grid doesn't load the rest of the file.
+
+        Args:
+            row (int): Top row of the rectangle
+            col (int): Left column of the rectangle
+            rows (int): Number of rows
+            cols (int): Number of columns
+
+        Returns:
+            CompactGrid: Grid holding the rectangle, with the same kind of cells
+
+        Raises:
+            IndexError: If the rectangle doesn't lie within the grid
+        """
+        if not (0 <= row <= row + rows <= self.rows and 0 <= col <= col + cols <= self.cols):
+            raise IndexError("grid region out of range")
+        cells, stride = self.cells, self.stride
+        parts = [cells[start:start + cols] for start in range(row * stride + col, (row + rows) * stride, stride)]
+        if isinstance(cells, list):
+            parts = [''.join(part) for part in parts]
+        joined = ''.join(parts) if isinstance(cells, (str, list)) else b''.join(parts)
+        return CompactGrid(joined, rows, cols)
+
+    def to_matrix(self):
+        """
+        Convert the grid back to a list-of-lists matrix.
+
+        Returns:
+            list[list[str]]: 2D matrix of characters
+        """
+        return [list(row) for row in self]
+
+
+class MappedGrid(CompactGrid):
+    """
+    Compact grid reading its cells straight from a memory-mapped text file.
+
+    The file holds one row per line, all rows the same width. Each line
+    ending is treated as padding at the end of the row, so a cell is read
+    from the mapping at ``row * stride + col`` without copying.
+    Pickling a mapped grid pickles its path, and unpickling maps the file again.
+    """
+
+    __slots__ = ('path',)
+
+    def __init__(self, cells, rows, cols, stride, path):
+        """
+        Wrap an open memory mapping.
+
+        Args:
+            cells (mmap.mmap): Mapping of the grid file
+            rows (int): Number of rows
+            cols (int): Number of columns
+            stride (int): Bytes per line, including the line ending
+            path (str): Path of the mapped file
+        """
+        super().__init__(cells, rows, cols, stride)
+        self.path = path
+
+    def __reduce__(self):
+        return load_matrix, (self.path, True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the memory mapping."""
+        self.cells.close()
+
+
+class MutableGrid(CompactGrid):
+    """
+    Compact grid whose cells can be changed in place.
+
+    The cells are kept as a list of one-character strings rather than a
+    single string, so changing a cell doesn't copy the board. Indexes built
+    over the grid are not told about changes; use MutableIndex to keep the
+    lookup tables in step with the cells.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, cells, rows, cols, stride=None):
+        """
+        Copy the cells of a grid into a mutable list.
+
+        Args:
+            cells (str or list[str]): Row-major cell characters
+            rows (int): Number of rows
+            cols (int): Number of columns
+            stride (int or None): Offset between the starts of consecutive rows,
+                                  defaults to cols
+        """
+        super().__init__(list(cells), rows, cols, stride)
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError("grid row out of range")
+        start = row * self.stride
+        return ''.join(self.cells[start:start + self.cols])
+
+    def encode(self, text):
+        # Cells hold characters, so strings compare as they are
+        return text
+
+    def find_cells(self, code):
+        stride, cols = self.stride, self.cols
+        return [cell for cell, value in enumerate(self.cells)
+                if value == code and cell % stride < cols]
+
+    def set_cell(self, row, col, char):
+        """
+        Change the character of one cell.
+
+        Args:
+            row (int): Row index
+            col (int): Column index
+            char (str): New character
+
+        Returns:
+            str: Previous character of the cell
+
+        Raises:
+            IndexError: If the position is outside the grid
+            ValueError: If char is not a single character
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError("grid position out of range")
+        if not isinstance(char, str) or len(char) != 1:
+            raise ValueError(f"Expected a single character, got {char!r}")
+        cell = row * self.stride + col
+        old, self.cells[cell] = self.cells[cell], char
+        return old
+
+
+def load_matrix(path, mmap=True):
+    """
+    Load a character grid stored as one row per line.
+    
+    All lines must have the same width and the same line ending. With mmap
+    the file is memory-mapped and each byte is one cell, so it must be
+    ASCII; otherwise the file is read as UTF-8 text into a CompactGrid.
+    
+    Args:
+        path (str): Path of the grid file
+        mmap (bool): Map the file instead of reading it into memory
+        
+    Returns:
+        CompactGrid: The loaded grid, a MappedGrid when mapped
+        
+    Raises:
+        ValueError: If the lines are not all the same width, or a mapped
+            file is not ASCII
+    """
+    if not mmap:
+        with open(path, encoding='utf-8', newline='') as handle:
+            lines = handle.read().splitlines()
+        return CompactGrid.from_matrix([list(line) for line in lines])
+
+    import mmap as mmap_module
+    import re
+
+    with open(path, 'rb') as handle:
+        size = handle.seek(0, 2)
+        if not size:
+            return CompactGrid('', 0, 0)
+        cells = mmap_module.mmap(handle.fileno(), 0, access=mmap_module.ACCESS_READ)
+    # Multi-byte UTF-8 characters would be split into several Latin-1 cells
+    if re.search(rb'[\x80-\xff]', cells):
+        cells.close()
+        raise ValueError(f"{path}: grid is not ASCII, load it with mmap=False")
+    line_end = cells.find(b'\n')
+    if line_end == -1:
+        return MappedGrid(cells, 1, size, size, path)
+    cols = line_end - (line_end > 0 and cells[line_end - 1] == ord('\r'))
+    stride = line_end + 1
+    rows, remainder = divmod(size, stride)
+    # The last line may lack its line ending
+    if remainder:
+        rows += 1
+        if remainder != cols:
+            cells.close()
+            raise ValueError(f"{path}: lines must all be {cols} characters wide")
+    grid = MappedGrid(cells, rows, cols, stride, path)
+    # Every full line must end exactly one stride after the previous one
+    newline = ord('\n')
+    if any(cells[end] != newline for end in range(line_end, rows * stride - remainder, stride)):
+        grid.close()
+        raise ValueError(f"{path}: lines must all be {cols} characters wide")
+    return grid
+
+
+def as_compact_grid(matrix):
+    """
+    Get a compact grid for a matrix, converting list-of-lists input.
+
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+
+    Returns:
+        CompactGrid: The matrix itself if already compact, otherwise a converted copy
+    """
+    if isinstance(matrix, CompactGrid):
+        return matrix
+    return CompactGrid.from_matrix(matrix)
+
+
+def matrix_fingerprint(matrix):
+    """
+    Get a key identifying the contents of a matrix.
+
+    Equal list-of-lists matrices and text grids get equal fingerprints.
+    Grids holding Latin-1 bytes, such as memory-mapped files, are hashed
+    as bytes, so they only match other byte grids.
+
+    Args:
+        matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+
+    Returns:
+        tuple[int, int, str]: Number of rows, number of columns and a digest of the cells
+
+    Raises:
+        ValueError: If rows differ in length or cells are not single characters
+    """
+    from hashlib import blake2b
+
+    digest = blake2b(digest_size=16)
+    if isinstance(matrix, CompactGrid):
+        rows, cols, cells = matrix.rows, matrix.cols, matrix.cells
+        if isinstance(cells, (str, list)):
+            text = cells if matrix.stride == cols else ''.join(matrix)
+            digest.update(text.encode('utf-8', 'surrogatepass'))
+        else:
+            digest.update(b'latin-1:')
+            for start in range(0, rows * matrix.stride, matrix.stride):
+                digest.update(cells[start:start + cols])
+    else:
+        rows = len(matrix) if matrix else 0
+        cols = len(matrix[0]) if rows else 0
+        text = ''.join([''.join(row) for row in matrix]) if rows else ''
+        if len(text) != rows * cols or any(len(row) != cols for row in matrix):
+            raise ValueError("Matrix rows must have equal length and single-character cells")
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+    return rows, cols, digest.hexdigest()
+
+
+# Index files start with a fixed header, followed by 8-byte aligned sections
+INDEX_MAGIC = b'SFINDEX\0'
+INDEX_VERSION = 1
+# magic, version, cell kind (INDEX_CELL_KINDS), integer typecode, byte order,
+# rows, cols, stride, cells, characters, positions, neighbor targets, bigrams, crc32
+_INDEX_HEADER = '<8sHBcc3x8QI4x'
+# Cell encodings in index files: text stored as Latin-1 or UTF-32, and byte grids
+INDEX_CELL_KINDS = ('latin-1', 'utf-32-le', 'bytes')
+
+
+def save_index(index, path):
+    """
+    Save the lookup tables of an index to a binary file for load_index.
+
+    The file holds the cells (one byte per cell when they all fit Latin-1,
+    four otherwise), the position list, colour counts and bigram counts of
+    every character, and the adjacency table, as flat machine integers in
+    native byte order. A CRC32 checksum covers everything after the header.
+    The file is written next to path and then renamed over it, so readers
+    never see a partial file.
+
+    Args:
+        index (MatrixIndex): Index to save
+        path (str): Destination file
+    """
+    import os
+    import struct
+    import sys
+    import zlib
+
+    grid = index.grid
+    cells = grid.cells
+    if isinstance(cells, (str, list)):
+        cells = ''.join(cells)
+        kind = 0 if all(ord(char) < 256 for char in set(cells)) else 1
+        data = cells.encode(INDEX_CELL_KINDS[kind], 'surrogatepass')
+        keys = set(cells)
+        code = ord
+    else:
+        kind = 2
+        data = bytes(cells)
+        keys = set(data)
+        code = int
+    # Padding between rows holds no positions
+    keys = [key for key in sorted(keys) if index.positions[key]]
+    codes = array('I', map(code, keys))
+
+    typecode = memoryview(index.adjacency.offsets).format
+    starts = array(typecode, [0])
+    evens = array(typecode)
+    positions = array(typecode)
+    for key in keys:
+        positions.extend(index.positions[key])
+        starts.append(len(positions))
+        evens.append(index.colour_counts(key)[0])
+    pairs = index.bigram_counts
+    firsts = array('I', [code(a) for a, _ in pairs])
+    seconds = array('I', [code(b) for _, b in pairs])
+    counts = array('q', pairs.values())
+
+    sections = [data, codes, starts, evens, positions, index.adjacency.offsets,
+                index.adjacency.targets, firsts, seconds, counts]
+    payload = []
+    for section in sections:
+        chunk = section if isinstance(section, bytes) else memoryview(section).tobytes()
+        payload.append(chunk + b'\0' * (-len(chunk) % 8))
+    crc = 0
+    for chunk in payload:
+        crc = zlib.crc32(chunk, crc)
+    header = struct.pack(_INDEX_HEADER, INDEX_MAGIC, INDEX_VERSION, kind, typecode.encode(),
+                         sys.byteorder[:1].encode(),
+                         grid.rows, grid.cols, grid.stride, len(cells), len(keys),
+                         len(positions), len(index.adjacency.targets), len(pairs), crc)
+
+    temporary = f"{path}.tmp{os.getpid()}"
+    with open(temporary, 'wb') as handle:
+        handle.write(header)
+        for chunk in payload:
+            handle.write(chunk)
+    os.replace(temporary, path)
+
+
+def load_index(path, verify=True):
+    """
+    Load an index saved by save_index.
+
+    The file is memory-mapped and the position lists and adjacency table are
+    used in place as memoryviews, so loading creates no per-cell objects and
+    takes about as long as checking the checksum. Other tables are built
+    lazily as usual.
+
+    Args:
+        path (str): Index file
+        verify (bool): Check the CRC32 checksum of the file contents
+
+    Returns:
+        MatrixIndex: Index ready to serve queries
+
+    Raises:
+        ValueError: If the file is not an index file, has an unsupported version,
+                    was saved with another byte order or fails the checksum
+    """
+    import mmap
+    import struct
+    import sys
+    import zlib
+
+    with open(path, 'rb') as handle:
+        size = handle.seek(0, 2)
+        header_size = struct.calcsize(_INDEX_HEADER)
+        if size < header_size:
+            raise ValueError(f"{path}: not a string finder index file")
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    (magic, version, kind, typecode, byteorder, rows, cols, stride, cell_count, key_count,
+     position_count, target_count, pair_count, crc) = struct.unpack_from(_INDEX_HEADER, mapped)
+    if magic != INDEX_MAGIC:
+        raise ValueError(f"{path}: not a string finder index file")
+    if version != INDEX_VERSION:
+        raise ValueError(f"{path}: unsupported index version {version}, expected {INDEX_VERSION}")
+    if kind >= len(INDEX_CELL_KINDS):
+        raise ValueError(f"{path}: unknown cell encoding {kind}")
+    if byteorder != sys.byteorder[:1].encode():
+        raise ValueError(f"{path}: index was saved on a machine with another byte order")
+    view = memoryview(mapped)
+    if verify and zlib.crc32(view[header_size:]) != crc:
+        raise ValueError(f"{path}: index checksum mismatch, the file is corrupt")
+
+    typecode = typecode.decode()
+    offset = header_size
+
+    def section(count, itemsize, fmt=None):
+        nonlocal offset
+        chunk = view[offset:offset + count * itemsize]
+        offset += count * itemsize + (-(count * itemsize) % 8)
+        return chunk if fmt is None else chunk.cast(fmt)
+
+    itemsize = array(typecode).itemsize
+    data = section(cell_count, 4 if kind == 1 else 1)
+    codes = section(key_count, 4, 'I')
+    starts = section(key_count + 1, itemsize, typecode)
+    evens = section(key_count, itemsize, typecode)
+    positions = section(position_count, itemsize, typecode)
+    offsets = section(rows * stride + 1, itemsize, typecode)
+    targets = section(target_count, itemsize, typecode)
+    firsts = section(pair_count, 4, 'I')
+    seconds = section(pair_count, 4, 'I')
+    counts = section(pair_count, 8, 'q')
+
+    if kind == 2:
+        cells = bytes(data)
+        key = int
+    else:
+        cells = str(data, INDEX_CELL_KINDS[kind], 'surrogatepass')
+        key = chr
+
+    index = MatrixIndex(CompactGrid(cells, rows, cols, stride),
+                        Adjacency.from_arrays(rows, cols, stride, offsets, targets))
+    for i, code in enumerate(codes):
+        cell_list = positions[starts[i]:starts[i + 1]]
+        index.positions[key(code)] = cell_list
+        index._colour_counts[key(code)] = (evens[i], len(cell_list) - evens[i])
+    index._bigram_counts = Counter({(key(a), key(b)): n for a, b, n in zip(firsts, seconds, counts)})
+    index.source = path
+    return index
+
+
+class _CellPositions(dict):
+    """Cell value -> cell ids table, filled in the first time a value is looked up."""
+
+    __slots__ = ('grid',)
+
+    def __init__(self, grid):
+        super().__init__()
+        self.grid = grid
+
+    def __missing__(self, code):
+        cells = self[code] = self.grid.find_cells(code)
+        return cells
+
+    def get(self, code, default=None):
+        return self[code] or default
+
+
+class SearchStats:
+    """
+    Statistics about one search, filled in when passed as ``stats=``.
+
+    Counters are collected in local variables by the engines and copied here
+    when the search ends, so a search without stats pays nothing extra. An
+    optional hook is called as ``hook(event, (row, col), index)`` for the
+    events 'start' (a start position is tried), 'expand' (a cell is added to
+    the path) and 'backtrack' (a cell is removed from the path after a dead
+    end). Counters are only collected for in-process searches; with several
+    workers only the engine, result and wall time are recorded.
+
+    Attributes:
+        engine (str): Engine that ran the search
+        found (bool): Whether a path was found
+        rejected (str or None): Why the string was rejected before searching
+                                ('length', 'char_counts', 'parity', 'bigrams' or
+                                'relaxed'), if it was
+        anchor_char (str or None): Character whose positions seeded the search
+        start_positions (int): Number of start positions tried
+        nodes_expanded (int): Number of cells added to the path
+        backtracks (int): Number of cells removed from the path after a dead end
+        pruned (int): Number of candidate cells skipped because they were already on the path
+                      or ruled out as start positions
+        elapsed (float): Wall time of the search in seconds
+    """
+
+    __slots__ = ('hook', 'engine', 'found', 'rejected', 'anchor_char', 'start_positions',
+                 'nodes_expanded', 'backtracks', 'pruned', 'elapsed')
+
+    def __init__(self, hook=None):
+        """
+        Create empty statistics.
+
+        Args:
+            hook (callable or None): Called as hook(event, (row, col), index) during the search
+        """
+        self.hook = hook
+        self.reset()
+
+    def reset(self):
+        """Clear all statistics, keeping the hook."""
+        self.engine = None
+        self.found = False
+        self.rejected = None
+        self.anchor_char = None
+        self.start_positions = 0
+        self.nodes_expanded = 0
+        self.backtracks = 0
+        self.pruned = 0
+        self.elapsed = 0.0
+
+    def as_dict(self):
+        """
+        Get the statistics as a dictionary.
+
+        Returns:
+            dict: Statistic name -> value, without the hook
+        """
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'hook'}
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"SearchStats({fields})"
+
+    def _add(self, anchor, start_positions, nodes_expanded, backtracks, pruned):
+        """Add the counters of an engine run."""
+        self.anchor_char = anchor if anchor is None or isinstance(anchor, str) else chr(anchor)
+        self.start_positions += start_positions
+        self.nodes_expanded += nodes_expanded
+        self.backtracks += backtracks
+        self.pruned += pruned
+
+
+class SearchResult:
+    """
+    Outcome of a search run with a timeout or node budget.
+
+    Attributes:
+        status (str): 'found', 'not_found', or 'undetermined' if the budget ran
+                      out before the search could tell
+        path (list[tuple[int, int]] or None): Path found, None unless status is 'found'
+        partial_path (list[tuple[int, int]]): Longest path the search reached that spells
+                                              a part of the string, the whole path if found
+        partial_index (int): Index in the string of the first character of partial_path
+    """
+
+    __slots__ = ('status', 'path', 'partial_path', 'partial_index')
+
+    def __init__(self, status, path=None, partial_path=None, partial_index=0):
+        self.status = status
+        self.path = path
+        self.partial_path = (path or []) if partial_path is None else partial_path
+        self.partial_index = partial_index
+
+    def __repr__(self):
+        return (f"SearchResult(status={self.status!r}, path={self.path!r}, "
+                f"partial_path={self.partial_path!r}, partial_index={self.partial_index!r})")
+
+    @property
+    def found(self):
+        """bool: Whether a path was found."""
+        return self.status == 'found'
+
+
+class _BudgetExhausted(Exception):
+    """Raised by _SearchBudget to abort a search whose budget ran out."""
+
+
+class _SearchBudget:
+    """
+    SearchStats hook that aborts a search once its time or node budget is spent.
+
+    The engines only call a hook when one is set, so budgets cost nothing
+    in unbounded searches. The clock is read every DEADLINE_CHECK_NODES
+    events rather than on every one. Positions reported by the events are
+    kept by string index, to remember the longest partial path reached.
+    """
+
+    __slots__ = ('deadline', 'max_nodes', 'hook', 'nodes', 'cells', 'anchor', 'best', 'best_index')
+
+    def __init__(self, timeout, max_nodes, hook=None):
+        """
+        Start the budget clock.
+
+        Args:
+            timeout (float or None): Seconds the search may run, None for no limit
+            max_nodes (int or None): Number of start and expand events allowed, None for no limit
+            hook (callable or None): Hook of the caller's SearchStats, still called for every event
+        """
+        self.deadline = None if timeout is None else perf_counter() + timeout
+        self.max_nodes = max_nodes
+        self.hook = hook
+        self.nodes = 0
+        # String index -> position of the cells on the current path
+        self.cells = {}
+        self.anchor = 0
+        self.best = []
+        self.best_index = 0
+
+    def __call__(self, event, position, index):
+        if self.hook is not None:
+            self.hook(event, position, index)
+        cells = self.cells
+        if event == 'backtrack':
+            cells.pop(index, None)
+            return
+        if self.deadline is not None and not self.nodes % DEADLINE_CHECK_NODES \
+                and perf_counter() > self.deadline:
+            raise _BudgetExhausted
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _BudgetExhausted
+        if event == 'start':
+            cells.clear()
+            self.anchor = index
+        else:
+            # Halves dropped without backtrack events leave cells beyond this one
+            step = 1 if index > self.anchor else -1
+            stale = index + step
+            while cells.pop(stale, None) is not None:
+                stale += step
+        cells[index] = position
+        if len(cells) > len(self.best):
+            self._record()
+
+    def _record(self):
+        """Keep the current path around the anchor if it is the longest valid one so far."""
+        cells = self.cells
+        low = high = self.anchor
+        while low - 1 in cells:
+            low -= 1
+        while high + 1 in cells:
+            high += 1
+        path = [cells[index] for index in range(low, high + 1)]
+        if len(path) > len(self.best) and len(set(path)) == len(path) and \
+                all(manhattan_distance(a, b) == 1 for a, b in zip(path, path[1:])):
+            self.best = path
+            self.best_index = low
+
+
+class DeadEndMemo:
+    """
+    Lazily filled bitsets of the (cell, string index) states that can't complete a string.
+
+    A state is dead in a walking direction when the rest of the string in
+    that direction can't be spelled from the cell, even revisiting cells.
+    That only depends on the cell and the index, not on the cells the
+    current path has used, so a dead state found in one branch of a search
+    is cut off in every later branch with a single bit test. States are
+    resolved on first use by a depth-first search that records every state
+    it settles, and two bits are kept per state and direction: whether it
+    is settled and whether it is dead. The bitsets of a direction are only
+    allocated once a state is resolved in it, so engines walking only
+    toward the end of the string never pay for the other direction.
+
+    The cell of a state is assumed to hold the character at its index;
+    engines only ask about cells they found holding it.
+
+    Attributes:
+        index (MatrixIndex): Index over the grid searched
+        target_string (str or bytes): Encoded string
+        size (int): Number of cell ids per string index
+    """
+
+    __slots__ = ('index', 'target_string', 'size', '_bits', '_settled', '_dead')
+
+    def __init__(self, index, target_string):
+        """
+        Create a memo with no state settled yet.
+
+        Args:
+            index (MatrixIndex): Index over the grid searched
+            target_string (str or bytes): Non-empty encoded string to search for
+        """
+        self.index = index
+        self.target_string = target_string
+        self.size = index.rows * index.grid.stride
+        self._bits = (len(target_string) * self.size + 7) >> 3
+        # Indexed by walking direction: [0] toward the start, [1] toward the end;
+        # None until a state is resolved in that direction
+        self._settled = [None, None]
+        self._dead = [None, None]
+
+    def __repr__(self):
+        return f"DeadEndMemo(length={len(self.target_string)}, size={self.size})"
+
+    def live(self, cell, index, step=1):
+        """
+        Check whether a walk can complete the string from a state.
+
+        Args:
+            cell (int): Cell id, holding the character at index
+            index (int): String index
+            step (int): 1 to walk toward the end of the string, -1 toward its start
+
+        Returns:
+            bool: False if the string can't be completed in that direction from the state
+        """
+        state = index * self.size + cell
+        side = step > 0
+        settled = self._settled[side]
+        if settled is not None and settled[state >> 3] & (1 << (state & 7)):
+            return not self._dead[side][state >> 3] & (1 << (state & 7))
+        return self._resolve(cell, index, step)
+
+    def _resolve(self, cell, index, step):
+        """Settle a state and the states below it by an iterative depth-first search."""
+        side = step > 0
+        settled, dead = self._settled[side], self._dead[side]
+        if settled is None:
+            settled = self._settled[side] = bytearray(self._bits)
+            dead = self._dead[side] = bytearray(self._bits)
+        target_string, size = self.target_string, self.size
+        neighbors_by_char = self.index.neighbors_by_char
+        end = len(target_string) - 1 if step > 0 else 0
+        if index == end:
+            settled[(index * size + cell) >> 3] |= 1 << ((index * size + cell) & 7)
+            return True
+        # Frames of (cell, index, moves left), each frame's cell next to the one below it
+        stack = [(cell, index, iter(neighbors_by_char(cell).get(target_string[index + step], ())))]
+        while stack:
+            current, at, moves = stack[-1]
+            following = at + step
+            for neighbor in moves:
+                state = following * size + neighbor
+                byte, bit = state >> 3, 1 << (state & 7)
+                if settled[byte] & bit:
+                    if dead[byte] & bit:
+                        continue
+                elif following != end:
+                    stack.append((neighbor, following,
+                                  iter(neighbors_by_char(neighbor).get(target_string[following + step], ()))))
+                    break
+                else:
+                    settled[byte] |= bit
+                # A live neighbor completes every state on the stack
+                for current, at, _ in stack:
+                    state = at * size + current
+                    settled[state >> 3] |= 1 << (state & 7)
+                return True
+            else:
+                stack.pop()
+                state = at * size + current
+                settled[state >> 3] |= 1 << (state & 7)
+                dead[state >> 3] |= 1 << (state & 7)
+        return False
+
+
+class StringPattern:
+    """
+    Wildcard pattern compiled by compile_pattern.
+
+    The tokens form a linear automaton: each token but ``*`` consumes one
+    cell, while ``*`` loops on any cell and can be left without consuming
+    one. Tokens are ('char', c), ('any',), ('class', ranges, negated) or
+    ('star',), where ranges are inclusive (low, high) character pairs.
+
+    Attributes:
+        pattern (str): Source pattern
+        tokens (tuple[tuple, ...]): Match tokens
+    """
+
+    __slots__ = ('pattern', 'tokens')
+
+    def __init__(self, pattern, tokens):
+        self.pattern = pattern
+        self.tokens = tuple(tokens)
+
+    def __repr__(self):
+        return f"StringPattern({self.pattern!r})"
+
+    @property
+    def min_length(self):
+        """int: Number of cells of the shortest matching path."""
+        return sum(token[0] != 'star' for token in self.tokens)
+
+
+class MatrixIndex:
+    """
+    Precomputed lookup tables for serving many queries against one matrix.
+
+    The positions of each character are collected the first time it is
+    queried and then kept, and the valid moves of every cell come from the
+    cached adjacency table for its shape, so repeated queries don't rescan
+    the grid. Internally cells are addressed by their CompactGrid cell id and
+    hold the values produced by CompactGrid.encode; positions are only
+    converted back to (row, col) tuples for returned paths.
+    """
+
+    def __init__(self, matrix, adjacency=None):
+        """
+        Set up the index tables for a matrix.
+
+        Args:
+            matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+            adjacency (Adjacency or None): Neighbor table to use, None for the shared
+                                           table of the matrix shape
+        """
+        self.grid = grid = as_compact_grid(matrix)
+        self.rows = grid.rows
+        self.cols = grid.cols
+        # Character -> list of cell ids, in row-major order
+        self.positions = _CellPositions(grid)
+        # Transition tables, built on first use
+        self._bigram_counts = None
+        self._transitions = {}
+        # Character -> (cells on even squares, cells on odd squares) of a checkerboard
+        self._colour_counts = {}
+        # Cells as a rows x cols NumPy uint32 array, built on first vectorized query
+        self._code_array = None
+        # Neighbor table shared by all indexes over matrices of this shape
+        if adjacency is None:
+            adjacency = get_adjacency(self.rows, self.cols, grid.stride)
+        self.adjacency = adjacency
+        # Index file the tables were loaded from, so worker processes can map it too
+        self.source = None
+
+    def get_char_positions(self, char):
+        """
+        Get all positions of a character in the indexed matrix.
+
+        Args:
+            char (str): Character to find
+
+        Returns:
+            list[tuple[int, int]]: List of (row, col) positions where char is found
+        """
+        codes = self.grid.encode(char)
+        if not codes:
+            return []
+        return self.to_path(self.positions.get(codes[0], []))
+
+    @property
+    def bigram_counts(self):
+        """
+        Counter of ordered character pairs found in adjacent cells.
+
+        Every pair of adjacent cells is counted in both directions, since a
+        path can step either way between them.
+
+        Returns:
+            Counter[tuple[str, str]]: Number of adjacent occurrences of each pair
+        """
+        if self._bigram_counts is None:
+            cells, cols = self.grid.cells, self.cols
+            counts = Counter()
+            previous = None
+            for start in range(0, self.rows * self.grid.stride, self.grid.stride):
+                row = cells[start:start + cols]
+                counts.update(zip(row, row[1:]))
+                if previous is not None:
+                    counts.update(zip(previous, row))
+                previous = row
+            counts.update({(b, a): n for (a, b), n in list(counts.items())})
+            self._bigram_counts = counts
+        return self._bigram_counts
+
+    def has_bigrams(self, target_string):
+        """
+        Check that every adjacent pair of the target occurs somewhere in the matrix.
+
+        Args:
+            target_string (str): String to check
+
+        Returns:
+            bool: False if the string provably can't be found, True otherwise
+        """
+        target_string = self.grid.encode(target_string)
+        if target_string is None:
+            return False
+        counts = self.bigram_counts
+        return all(pair in counts for pair in zip(target_string, target_string[1:]))
+
+    def neighbors_by_char(self, cell):
+        """
+        Get the neighbors of a cell grouped by their character.
+
+        Groups are computed on first request and cached, keeping the
+        right, left, down, up order within each group.
+
+        Args:
+            cell (int): Flat cell id
+
+        Returns:
+            dict[str, tuple[int, ...]]: Character -> neighbor cell ids holding it
+        """
+        groups = self._transitions.get(cell)
+        if groups is None:
+            cells = self.grid.cells
+            groups = {}
+            for neighbor in self.adjacency[cell]:
+                groups[cells[neighbor]] = groups.get(cells[neighbor], ()) + (neighbor,)
+            self._transitions[cell] = groups
+        return groups
+
+    def colour_counts(self, code):
+        """
+        Count the cells holding a value on each colour of a checkerboard.
+
+        Args:
+            code (str or int): Cell value, as produced by CompactGrid.encode
+
+        Returns:
+            tuple[int, int]: Cells with even and with odd row + col
+        """
+        counts = self._colour_counts.get(code)
+        if counts is None:
+            stride = self.grid.stride
+            odd = sum(sum(divmod(cell, stride)) & 1 for cell in self.positions[code])
+            counts = self._colour_counts[code] = (len(self.positions[code]) - odd, odd)
+        return counts
+
+    def parity_options(self, target_string):
+        """
+        Get the checkerboard colours the first character of a path could be on.
+
+        Every move changes the colour of the square, so the characters at even
+        string indices all sit on the colour of the first cell and those at
+        odd indices on the other one. A colour is only possible if each
+        character occurs often enough on the colours it needs.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string
+
+        Returns:
+            list[int]: Possible colours (0 for even row + col, 1 for odd)
+        """
+        even = Counter(target_string[0::2])
+        odd = Counter(target_string[1::2])
+        options = []
+        for colour in (0, 1):
+            if (all(self.colour_counts(char)[colour] >= count for char, count in even.items()) and
+                    all(self.colour_counts(char)[1 - colour] >= count for char, count in odd.items())):
+                options.append(colour)
+        return options
+
+    def rejection_reason(self, target_string):
+        """
+        Check cheap conditions that prove a string can't be found.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string
+
+        Returns:
+            str or None: 'length', 'char_counts', 'parity' or 'bigrams' if the
+                         string can't be found, None if it might be
+        """
+        if len(target_string) > self.rows * self.cols:
+            return 'length'
+        positions = self.positions
+        for char, count in Counter(target_string).items():
+            if len(positions[char]) < count:
+                return 'char_counts'
+        if not self.parity_options(target_string):
+            return 'parity'
+        counts = self.bigram_counts
+        if not all(pair in counts for pair in zip(target_string, target_string[1:])):
+            return 'bigrams'
+        return None
+
+    def _start_filter(self, target_string):
+        """
+        Build a check ruling out start positions that can't lead to a path.
+
+        A cell is ruled out for string index i when its colour contradicts
+        every possible parity of the path, or when one of the rarest
+        characters of the string (at index j) has no other occurrence within
+        Manhattan distance abs(i - j) of the cell.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string
+
+        Returns:
+            callable or None: admit(cell, index) -> bool, or None if nothing can be ruled out
+        """
+        colours = self.parity_options(target_string)
+        stride = self.grid.stride
+        # Up to RARE_ANCHORS indices of the rarest characters, with their positions
+        indices = sorted(range(len(target_string)), key=lambda i: len(self.positions[target_string[i]]))
+        anchors = [(j, [divmod(cell, stride) for cell in self.positions[target_string[j]]])
+                   for j in indices[:RARE_ANCHORS]
+                   if len(self.positions[target_string[j]]) <= RARE_ANCHOR_LIMIT]
+        if len(colours) == 2 and not anchors:
+            return None
+
+        def admit(cell, index):
+            point = divmod(cell, stride)
+            if len(colours) == 1 and (sum(point) + index) & 1 != colours[0]:
+                return False
+            for j, points in anchors:
+                steps = abs(index - j)
+                if steps and not any(0 < manhattan_distance(point, other) <= steps for other in points):
+                    return False
+            return True
+
+        return admit
+
+    def to_path(self, cells):
+        """
+        Convert cell ids to (row, col) positions.
+
+        Args:
+            cells (Iterable[int]): Flat cell ids
+
+        Returns:
+            list[tuple[int, int]]: Matching (row, col) positions
+        """
+        stride = self.grid.stride
+        return [divmod(cell, stride) for cell in cells]
+
+    def find_string_in_matrix(self, target_string, engine='greedy', workers=None, stats=None,
+                              timeout=None, max_nodes=None, memo=False):
+        """
+        Check whether a string can be found in the indexed matrix.
+
+        Args:
+            target_string (str): String to search for
+            engine (str): Search engine to use, one of ENGINES
+            workers (int or None): Number of worker processes, None to search in-process
+            stats (SearchStats or None): Filled in with statistics about the search
+            timeout (float or None): Seconds the search may run, None for no limit
+            max_nodes (int or None): Number of nodes the search may visit, None for no limit
+            memo (bool): Skip states recorded as dead ends in a DeadEndMemo of the string
+
+        Returns:
+            bool or SearchResult: True if string is found, False otherwise; a SearchResult
+                                  when timeout or max_nodes is given
+        """
+        result = self.find_string_with_path(target_string, engine, workers, stats, timeout, max_nodes, memo)
+        if timeout is not None or max_nodes is not None:
+            return result
+        return result is not None
+
+    def find_all_strings(self, words, workers=None):
+        """
+        Find many strings in the indexed matrix in a single pass.
+
+        With several workers the word list is split into batches, and each
+        worker process runs its own trie search over its share of the words.
+
+        Args:
+            words (Iterable[str]): Strings to search for
+            workers (int or None): Number of worker processes, None to search in-process
+
+        Returns:
+            dict[str, list[tuple[int, int]] or None]: Mapping of each word to its path,
+                                                     or None if the word is not found
+        """
+        if workers is not None and workers > 1:
+            return self._find_all_parallel(words, workers)
+        results = dict.fromkeys(words)
+        # Nothing can be found in an empty matrix, not even the empty string
+        if not self.rows or not self.cols:
+            return results
+        if '' in results:
+            results[''] = []
+        encode = self.grid.encode
+        trie = build_trie((word for word in results if word and encode(word) is not None), encode)
+        remaining = len(results) - ('' in results)
+
+        cells = self.grid.cells
+        offsets = self.adjacency.offsets
+        targets = self.adjacency.targets
+        visited = bytearray(self.rows * self.grid.stride)
+        starts = (start for char in list(trie) for start in self.positions[char])
+        for start in starts:
+            if not remaining:
+                break
+            node = trie.get(cells[start])
+            if node is None:
+                continue
+            # Parallel stacks: path cells, trie nodes and pending neighbors per depth
+            path = [start]
+            nodes = [node]
+            moves = [iter(targets[offsets[start]:offsets[start + 1]])]
+            visited[start] = 1
+            while moves:
+                node = nodes[-1]
+                word = node.pop(None, None)
+                if word is not None:
+                    # Record the first path for each word and drop it from the trie
+                    results[word] = self.to_path(path)
+                    remaining -= 1
+                for cell in moves[-1]:
+                    if visited[cell]:
+                        continue
+                    child = node.get(cells[cell])
+                    if child is not None:
+                        path.append(cell)
+                        nodes.append(child)
+                        moves.append(iter(targets[offsets[cell]:offsets[cell + 1]]))
+                        visited[cell] = 1
+                        break
+                else:
+                    # Dead end: backtrack and prune trie branches with no words left
+                    cell = path.pop()
+                    nodes.pop()
+                    moves.pop()
+                    visited[cell] = 0
+                    if not node:
+                        parent = nodes[-1] if nodes else trie
+                        del parent[cells[cell]]
+        return results
+
+    def iter_string_paths(self, target_string, limit=None):
+        """
+        Lazily generate every distinct path spelling a string in the indexed matrix.
+
+        Args:
+            target_string (str): String to search for
+            limit (int or None): Maximum number of paths to generate, None for all
+
+        Yields:
+            list[tuple[int, int]]: List of (row, col) coordinates of each path
+        """
+        if not self.rows or not self.cols or limit == 0:
+            return
+        if not target_string:
+            yield []
+            return
+        if not self.has_bigrams(target_string):
+            return
+        paths = self._iter_backtrack(self.grid.encode(target_string))
+        for count, path in enumerate(paths, 1):
+            yield self.to_path(path)
+            if count == limit:
+                paths.close()
+                return
+
+    def count_string_occurrences(self, target_string, simple=False):
+        """
+        Count the distinct paths spelling a string in the indexed matrix.
+
+        Without simple, paths may visit a cell more than once and are counted
+        layer by layer: the number of paths ending on each cell holding
+        character i + 1 is the sum of the counts of its neighbors for
+        character i.
+
+        A path can only come back to a cell after an even number of steps,
+        and both visits must spell the same character. When the string has
+        no such repeated character, no path can reuse a cell and the layered
+        count is already exact for simple paths. Otherwise simple paths are
+        counted by a depth-first search that only enters cells from which the
+        rest of the string can still be completed.
+
+        Args:
+            target_string (str): String to count
+            simple (bool): Only count paths that never reuse a cell
+
+        Returns:
+            int: Number of distinct paths
+        """
+        if not self.rows or not self.cols:
+            return 0
+        if not target_string:
+            return 1
+        if not self.has_bigrams(target_string):
+            return 0
+        word = self.grid.encode(target_string)
+        if simple and _can_revisit(word):
+            return self._count_simple(word)
+
+        neighbors_by_char = self.neighbors_by_char
+        counts = dict.fromkeys(self.positions[word[0]], 1)
+        for char in word[1:]:
+            layer = {}
+            for cell, count in counts.items():
+                for neighbor in neighbors_by_char(cell).get(char, ()):
+                    layer[neighbor] = layer.get(neighbor, 0) + count
+            if not layer:
+                return 0
+            counts = layer
+        return sum(counts.values())
+
+    def _count_simple(self, word):
+        """
+        Count simple paths by depth-first search over completable cells.
+
+        Args:
+            word (str or bytes): Non-empty encoded string to count
+
+        Returns:
+            int: Number of paths that never reuse a cell
+        """
+        neighbors_by_char = self.neighbors_by_char
+        length = len(word)
+        # alive[i] holds the cells of character i from which the rest of the
+        # string can be spelled, ignoring cell reuse
+        alive = [set(self.positions[word[-1]])]
+        for i in range(length - 2, -1, -1):
+            following = alive[-1]
+            alive.append({cell for cell in self.positions[word[i]]
+                          if any(n in following for n in neighbors_by_char(cell).get(word[i + 1], ()))})
+        alive.reverse()
+
+        total = 0
+        visited = bytearray(self.rows * self.grid.stride)
+        for start in alive[0]:
+            path = [start]
+            moves = [iter(neighbors_by_char(start).get(word[1], ()) if length > 1 else ())]
+            visited[start] = 1
+            while path:
+                if len(path) < length:
+                    depth_alive = alive[len(path)]
+                    for cell in moves[-1]:
+                        if not visited[cell] and cell in depth_alive:
+                            visited[cell] = 1
+                            path.append(cell)
+                            if len(path) < length:
+                                moves.append(iter(neighbors_by_char(cell).get(word[len(path)], ())))
+                            break
+                    else:
+                        visited[path.pop()] = 0
+                        moves.pop()
+                else:
+                    total += 1
+                    visited[path.pop()] = 0
+        return total
+
+    def find_pattern_with_path(self, pattern):
+        """
+        Find a wildcard pattern in the indexed matrix and return the path.
+
+        The search anchors on the literal character of the pattern with the
+        fewest occurrences in the matrix, as the greedy engine does with the
+        rarest character of a string, or on the cells matching the first
+        token when the pattern has no literals. From each anchor cell the
+        tokens before it are matched backward and those after it forward,
+        both by backtracking over the automaton, on disjoint cells.
+
+        A star loops on unused cells until the rest of the pattern can
+        continue, heading for the nearest cells where it can, so matches
+        needing a star to detour around cells used later in the pattern are
+        found too. Runs of tokens between stars that can't be spelled even
+        with revisits reject the pattern up front.
+
+        Since stars can detour in exponentially many ways, each anchor is
+        searched for at most PATTERN_ANCHOR_NODES cells before the next one
+        is tried. Anchors searched to the end without a match are dropped,
+        and the rest are retried with a four times larger budget, so an
+        anchor boxed in by its own prefix can't hold up the others.
+
+        Args:
+            pattern (str or StringPattern): Pattern to search for
+
+        Returns:
+            list[tuple[int, int]] or None: List of (row, col) coordinates forming the path,
+                                          or None if nothing matches
+
+        Raises:
+            ValueError: If the pattern is malformed
+        """
+        if not isinstance(pattern, StringPattern):
+            pattern = compile_pattern(pattern)
+        tokens = list(pattern.tokens)
+        # Stars at either end can match nothing, so they never matter for finding a path
+        while tokens and tokens[0] == ('star',):
+            tokens.pop(0)
+        while tokens and tokens[-1] == ('star',):
+            tokens.pop()
+        if not self.rows or not self.cols:
+            return None
+        if not tokens:
+            return []
+        if pattern.min_length > self.rows * self.cols:
+            return None
+
+        matchers = [self._token_matcher(token) for token in tokens]
+        if any(matcher is False for matcher in matchers):
+            return None
+        # Literal characters must occur at least as often as the pattern uses them
+        literals = Counter(matcher for matcher in matchers if not callable(matcher) and matcher is not None)
+        for code, count in literals.items():
+            if len(self.positions[code]) < count:
+                return None
+        # Every part between stars has to be spelled somewhere, allowing revisits
+        segment = []
+        for matcher in matchers + [None]:
+            if matcher is not None:
+                segment.append(matcher)
+            elif not self._relaxed_pattern_starts(segment):
+                return None
+            else:
+                segment = []
+
+        if literals:
+            anchor = min((i for i, matcher in enumerate(matchers) if matcher in literals),
+                         key=lambda i: len(self.positions[matchers[i]]))
+        else:
+            anchor = 0
+        # Anchor cells must begin the star-free tokens around the anchor in both directions
+        low, high = anchor, anchor
+        while low > 0 and matchers[low - 1] is not None:
+            low -= 1
+        while high < len(matchers) and matchers[high] is not None:
+            high += 1
+        starts = self._relaxed_pattern_starts(matchers[anchor:low - 1 if low else None:-1]) & \
+            self._relaxed_pattern_starts(matchers[anchor:high])
+
+        prefix = matchers[:anchor][::-1]
+        suffix = matchers[anchor + 1:]
+        visited = bytearray(self.rows * self.grid.stride)
+        pending = sorted(starts)
+        budget = PATTERN_ANCHOR_NODES
+        while pending:
+            unfinished = []
+            for start in pending:
+                try:
+                    path = self._match_pattern_at(start, prefix, suffix, visited, [budget])
+                except _BudgetExhausted:
+                    unfinished.append(start)
+                    continue
+                if path is not None:
+                    return self.to_path(path)
+            pending = unfinished
+            budget *= 4
+        return None
+
+    def _match_pattern_at(self, start, prefix, suffix, visited, nodes):
+        """
+        Find a pattern path through an anchor cell, walking the tokens before it backward.
+
+        Args:
+            start (int): Anchor cell
+            prefix (list): Matchers before the anchor, nearest first
+            suffix (list): Matchers after the anchor
+            visited (bytearray): Cells that can't be used, left as it was
+            nodes (list[int]): Number of cells the search may still add to paths,
+                               decremented in place
+
+        Returns:
+            list[int] or None: Cell ids of the path, or None if there is none through start
+
+        Raises:
+            _BudgetExhausted: If nodes runs out before the search could tell
+        """
+        visited[start] = 1
+        try:
+            # The suffix has to exist on its own before prefixes are tried
+            if self._first_pattern_extension(start, suffix, visited, nodes) is None:
+                return None
+            prefixes = self._iter_pattern_extend(start, prefix, visited, nodes)
+            try:
+                for before in prefixes:
+                    after = self._first_pattern_extension(start, suffix, visited, nodes)
+                    if after is not None:
+                        return before[::-1] + [start] + after
+            finally:
+                prefixes.close()
+        finally:
+            visited[start] = 0
+        return None
+
+    def _token_matcher(self, token):
+        """
+        Translate a pattern token into the form the pattern search matches cells with.
+
+        Returns:
+            The encoded value for a literal, None for a star, a callable
+            testing a cell value for ``?`` and classes, or False for a
+            literal that can't be stored in this grid
+        """
+        kind = token[0]
+        if kind == 'star':
+            return None
+        if kind == 'char':
+            codes = self.grid.encode(token[1])
+            return False if codes is None else codes[0]
+        if kind == 'any':
+            return lambda code: True
+        _, ranges, negated = token
+        to_char = (lambda code: code) if isinstance(self.grid.cells, (str, list)) else chr
+        bounds = [(ord(low), ord(high)) for low, high in ranges]
+        memo = {}
+
+        def matches(code):
+            result = memo.get(code)
+            if result is None:
+                point = ord(to_char(code))
+                result = memo[code] = any(low <= point <= high for low, high in bounds) != negated
+            return result
+
+        return matches
+
+    def _matching_cells(self, matcher):
+        """Get the ids of all cells a non-star matcher accepts, in row-major order."""
+        if not callable(matcher):
+            return self.positions[matcher]
+        cells, stride, cols = self.grid.cells, self.grid.stride, self.cols
+        return [cell for row in range(0, self.rows * stride, stride)
+                for cell in range(row, row + cols) if matcher(cells[cell])]
+
+    def _relaxed_pattern_starts(self, matchers):
+        """
+        Get the cells from which a star-free run of matchers can be walked, allowing revisits.
+
+        Args:
+            matchers (list): Non-star token matchers, in walking order
+
+        Returns:
+            set[int]: Cells matching the first matcher that can begin such a walk
+        """
+        if not matchers:
+            return set()
+        adjacency = self.adjacency
+        alive = set(self._matching_cells(matchers[-1]))
+        for matcher in reversed(matchers[:-1]):
+            if not alive:
+                break
+            alive = {cell for cell in self._matching_cells(matcher)
+                     if any(neighbor in alive for neighbor in adjacency[cell])}
+        return alive
+
+    def _first_pattern_extension(self, start, matchers, visited, nodes=None):
+        """Get a copy of the first path found by _iter_pattern_extend, or None."""
+        paths = self._iter_pattern_extend(start, matchers, visited, nodes)
+        try:
+            path = next(paths, None)
+            return None if path is None else path[:]
+        finally:
+            paths.close()
+
+    def _iter_pattern_extend(self, start, matchers, visited, nodes=None):
+        """
+        Enumerate paths continuing from a cell that match a sequence of tokens.
+
+        A non-star token consumes one matching neighbor. A star, which is
+        never the last token, is a state looping on any unvisited neighbor:
+        each step first tries to leave it through the next token, then to
+        take one more cell. Only cells connected to a cell where the
+        following star-free tokens can be walked are taken, nearest such
+        cells first, so stars head straight for a way out but still try
+        every detour before giving up. Cells of the path being built are
+        marked in visited, including while a path is yielded.
+
+        Args:
+            start (int): Cell the paths continue from, not part of the paths
+            matchers (list): Token matchers from _token_matcher, in walking order
+            visited (bytearray): Cells that can't be used
+            nodes (list[int] or None): Number of cells the search may still add to paths,
+                                       decremented in place, None for no limit
+
+        Yields:
+            list[int]: Cell ids of each path, reused between yields
+
+        Raises:
+            _BudgetExhausted: If nodes runs out
+        """
+        cells = self.grid.cells
+        adjacency = self.adjacency
+        neighbors_by_char = self.neighbors_by_char
+        length = len(matchers)
+        # Index after each star -> cells where the star-free tokens from there can begin
+        exits = {}
+        # Index of each star -> distance of every cell from the nearest exit, ignoring visited cells
+        distances = {}
+
+        def run_exits(state):
+            if state not in exits:
+                end = state
+                while end < length and matchers[end] is not None:
+                    end += 1
+                exits[state] = self._relaxed_pattern_starts(matchers[state:end])
+            return exits[state]
+
+        def exit_distances(state):
+            if state not in distances:
+                distance = dict.fromkeys(run_exits(state + 1), 0)
+                frontier = list(distance)
+                steps = 0
+                while frontier:
+                    steps += 1
+                    following = []
+                    for current in frontier:
+                        for neighbor in adjacency[current]:
+                            if neighbor not in distance:
+                                distance[neighbor] = steps
+                                following.append(neighbor)
+                    frontier = following
+                distances[state] = distance
+            return distances[state]
+
+        def can_exit(state, cell):
+            # Breadth-first search for an exit through unvisited cells
+            targets = run_exits(state + 1)
+            seen = {cell}
+            frontier = [cell]
+            while frontier:
+                following = []
+                for current in frontier:
+                    for neighbor in adjacency[current]:
+                        if neighbor in seen or visited[neighbor]:
+                            continue
+                        if neighbor in targets:
+                            return True
+                        seen.add(neighbor)
+                        following.append(neighbor)
+                frontier = following
+            return False
+
+        def star_moves(state, cell, entering):
+            if entering and not can_exit(state, cell):
+                return
+            targets = run_exits(state + 1)
+            for next_state, neighbor in moves(state + 1, cell):
+                if neighbor in targets:
+                    yield next_state, neighbor
+            distance = exit_distances(state)
+            for neighbor in sorted((neighbor for neighbor in adjacency[cell] if neighbor in distance),
+                                   key=distance.__getitem__):
+                yield state, neighbor
+
+        def moves(state, cell, entering=True):
+            matcher = matchers[state]
+            if matcher is None:
+                return star_moves(state, cell, entering)
+            if callable(matcher):
+                return ((state + 1, neighbor) for neighbor in adjacency[cell] if matcher(cells[neighbor]))
+            return ((state + 1, neighbor) for neighbor in neighbors_by_char(cell).get(matcher, ()))
+
+        path = []
+        # Frames of (automaton state, pending moves); every frame but the first consumed one cell
+        frames = [(0, moves(0, start) if length else None)]
+        try:
+            while frames:
+                state, pending = frames[-1]
+                if state == length:
+                    yield path
+                else:
+                    for next_state, cell in pending:
+                        if visited[cell]:
+                            continue
+                        if nodes is not None:
+                            nodes[0] -= 1
+                            if nodes[0] < 0:
+                                raise _BudgetExhausted
+                        visited[cell] = 1
+                        path.append(cell)
+                        frames.append((next_state, moves(next_state, cell, next_state != state)
+                                       if next_state < length else None))
+                        break
+                    else:
+                        frames.pop()
+                        if frames:
+                            visited[path.pop()] = 0
+                    continue
+                # Step back from the complete path to look for the next one
+                frames.pop()
+                if frames:
+                    visited[path.pop()] = 0
+        finally:
+            for cell in path:
+                visited[cell] = 0
+
+    def find_string_relaxed(self, target_string):
+        """
+        Check whether a string can be spelled by a walk that may revisit cells.
+
+        Args:
+            target_string (str): String to check
+
+        Returns:
+            bool: True if a walk spelling the string exists, False otherwise
+        """
+        if not self.rows or not self.cols:
+            return False
+        if not target_string:
+            return True
+        target_string = self.grid.encode(target_string)
+        return target_string is not None and bool(self.relaxed_starts(target_string))
+
+    def relaxed_starts(self, target_string, vectorized=None):
+        """
+        Get the cells from which a walk spelling a string can start, allowing revisits.
+
+        The set of cells that can spell the string from index i on is
+        propagated backward one character at a time: a cell holding
+        character i qualifies if one of its neighbors qualifies for i + 1.
+        Every path of the exact search starts in one of these cells.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string
+            vectorized (bool or None): Use NumPy shifted masks, None to use them on grids
+                                       of at least VECTORIZE_MIN_CELLS cells when NumPy is installed
+
+        Returns:
+            list[int]: Start cell ids in row-major order
+
+        Raises:
+            ImportError: If vectorized is True and NumPy is not installed
+        """
+        if vectorized is None:
+            vectorized = self.rows * self.cols >= VECTORIZE_MIN_CELLS and _numpy() is not None
+        if vectorized:
+            return self._relaxed_starts_numpy(target_string)
+        neighbors_by_char = self.neighbors_by_char
+        alive = set(self.positions[target_string[-1]])
+        for i in range(len(target_string) - 2, -1, -1):
+            following = target_string[i + 1]
+            alive = {cell for cell in self.positions[target_string[i]]
+                     if any(n in alive for n in neighbors_by_char(cell).get(following, ()))}
+            if not alive:
+                break
+        return sorted(alive)
+
+    def _relaxed_starts_numpy(self, target_string):
+        """Vectorized relaxed_starts, ORing the frontier mask shifted by each of the four moves."""
+        numpy = _numpy()
+        if numpy is None:
+            raise ImportError("vectorized reachability requires NumPy")
+        codes = self.code_array()
+        ords = target_string if not isinstance(target_string, str) else [ord(char) for char in target_string]
+        mask = codes == ords[-1]
+        for code in reversed(ords[:-1]):
+            if not mask.any():
+                break
+            # reach marks cells with a neighbor in the mask: right, left, down, up
+            reach = numpy.zeros_like(mask)
+            reach[:, :-1] |= mask[:, 1:]
+            reach[:, 1:] |= mask[:, :-1]
+            reach[:-1, :] |= mask[1:, :]
+            reach[1:, :] |= mask[:-1, :]
+            mask = reach
+            mask &= codes == code
+        rows, cols = numpy.nonzero(mask)
+        return (rows * self.grid.stride + cols).tolist()
+
+    def dead_end_memo(self, target_string):
+        """
+        Create the dead-end memo of a string, see DeadEndMemo.
+
+        Args:
+            target_string (str or bytes): Non-empty string, encoded for this grid if it isn't a str
+
+        Returns:
+            DeadEndMemo or None: Memo of the string, None if some character can't be
+                                 stored in this grid
+        """
+        if isinstance(target_string, str):
+            target_string = self.grid.encode(target_string)
+        return None if target_string is None else DeadEndMemo(self, target_string)
+
+    def code_array(self):
+        """
+        Get the cells as a NumPy array, building it on first use.
+
+        Returns:
+            numpy.ndarray: rows x cols uint32 array of code points (or byte values)
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if self._code_array is None:
+            numpy = _numpy()
+            if numpy is None:
+                raise ImportError("code_array requires NumPy")
+            grid = self.grid
+            cells = grid.cells
+            if isinstance(cells, (str, list)):
+                flat = numpy.frombuffer(''.join(cells).encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+            else:
+                flat = numpy.frombuffer(cells, dtype=numpy.uint8)
+            # The padding after the last row may be missing
+            padded = numpy.zeros(grid.rows * grid.stride, dtype=numpy.uint32)
+            padded[:len(flat)] = flat
+            self._code_array = padded.reshape(grid.rows, grid.stride)[:, :grid.cols]
+        return self._code_array
+
+    def find_string_with_path(self, target_string, engine='greedy', workers=None, stats=None,
+                              timeout=None, max_nodes=None, memo=False):
+        """
+        Find a string in the indexed matrix and return the path.
+
+        With several workers the start positions are split between worker
+        processes, and the first path found by any worker is returned, so the
+        path may differ from the one an in-process search would return.
+
+        With a timeout or node budget the search runs in-process and stops
+        once the budget is spent, returning a SearchResult that tells whether
+        the string was found, proven absent or undetermined, along with the
+        longest partial path reached. Nodes are the start cells tried and
+        cells added to paths, as reported to SearchStats hooks. The greedy
+        engine can't prove a string absent, so its misses are undetermined
+        unless the string is rejected before searching, and so are paths it
+        returns that aren't valid.
+
+        With memo the engine keeps a DeadEndMemo of the string and never
+        steps into a cell from which the rest of the string can't be spelled
+        even revisiting cells. Settling a state costs a small search the
+        first time, so this pays off on repetitive grids where the same dead
+        ends are reached again and again rather than on random ones; the
+        greedy engine also finds paths it would otherwise miss.
+
+        Args:
+            target_string (str): String to search for
+            engine (str): Search engine to use, one of ENGINES
+            workers (int or None): Number of worker processes, None to search in-process
+            stats (SearchStats or None): Filled in with statistics about the search
+            timeout (float or None): Seconds the search may run, None for no limit
+            max_nodes (int or None): Number of nodes the search may visit, None for no limit
+            memo (bool): Skip states recorded as dead ends in a DeadEndMemo of the string
+
+        Returns:
+            list[tuple[int, int]] or None or SearchResult: List of (row, col) coordinates
+                forming the path, or None if string is not found; a SearchResult when
+                timeout or max_nodes is given
+
+        Raises:
+            ValueError: If engine is not one of ENGINES, or a budget is combined with workers
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+        if timeout is not None or max_nodes is not None:
+            return self._find_path_bounded(target_string, engine, workers, stats, timeout, max_nodes, memo)
+        if stats is None:
+            return self._find_path(target_string, engine, workers, None, memo)
+        stats.reset()
+        stats.engine = engine
+        started = perf_counter()
+        path = self._find_path(target_string, engine, workers, stats, memo)
+        stats.elapsed = perf_counter() - started
+        stats.found = path is not None
+        return path
+
+    def _find_path_bounded(self, target_string, engine, workers, stats, timeout, max_nodes, memo=False):
+        """
+        Run an in-process search that gives up once its budget is spent.
+
+        Returns:
+            SearchResult: Outcome of the search
+        """
+        if workers is not None and workers > 1:
+            raise ValueError("timeout and max_nodes are only supported for in-process searches")
+        # The budget is enforced by the stats hook, chained to the caller's own hook
+        stats = SearchStats() if stats is None else stats
+        budget = _SearchBudget(timeout, max_nodes, stats.hook)
+        stats.reset()
+        stats.engine = engine
+        stats.hook = budget
+        started = perf_counter()
+        try:
+            path = self._find_path(target_string, engine, None, stats, memo)
+        except _BudgetExhausted:
+            return SearchResult('undetermined', None, budget.best, budget.best_index)
+        finally:
+            stats.hook = budget.hook
+            stats.elapsed = perf_counter() - started
+        result = self._search_result(target_string, engine, path, budget.best, budget.best_index)
+        stats.found = result.found
+        return result
+
+    def _search_result(self, target_string, engine, path, partial_path=None, partial_index=0):
+        """
+        Wrap the outcome of a completed search in a SearchResult.
+
+        Returns:
+            SearchResult: Found or not found, or undetermined when the greedy
+                          engine missed the string or returned an invalid path
+        """
+        if engine == 'greedy':
+            # Greedy may miss paths and join its halves into invalid ones
+            if path is not None and not self._is_valid_path(path, target_string):
+                return SearchResult('undetermined', None, partial_path, partial_index)
+            if path is None and not self._provably_absent(target_string):
+                return SearchResult('undetermined', None, partial_path, partial_index)
+        if path is None:
+            return SearchResult('not_found', None, partial_path, partial_index)
+        return SearchResult('found', path)
+
+    def _provably_absent(self, target_string):
+        """Check whether a string is rejected before searching, see rejection_reason."""
+        if not self.rows or not self.cols:
+            return bool(target_string)
+        if not target_string:
+            return False
+        encoded = self.grid.encode(target_string)
+        return encoded is None or self.rejection_reason(encoded) is not None
+
+    def _is_valid_path(self, path, target_string):
+        """Check that a path of distinct, adjacent (row, col) cells spells a string."""
+        if len(path) != len(target_string) or len(set(path)) != len(path):
+            return False
+        if any(manhattan_distance(first, second) != 1 for first, second in zip(path, path[1:])):
+            return False
+        grid = self.grid
+        codes = grid.encode(target_string)
+        return codes is not None and all(
+            grid.cells[row * grid.stride + col] == code for (row, col), code in zip(path, codes))
+
+    def _find_path(self, target_string, engine, workers, stats, memo=False):
+        """
+        Reject hopeless strings, then run the search engine.
+
+        Args:
+            target_string (str): String to search for
+            engine (str): Search engine to use, one of ENGINES
+            workers (int or None): Number of worker processes, None to search in-process
+            stats (SearchStats or None): Filled in with statistics about the search
+            memo (bool): Let the engine skip dead-end states, see DeadEndMemo
+
+        Returns:
+            list[tuple[int, int]] or None: Path found, or None
+        """
+        # Return None for empty matrix
+        if not self.rows or not self.cols:
+            return None
+        # Return empty path for empty string
+        if not target_string:
+            return []
+        # Engines compare cells against the encoded string
+        target_string = self.grid.encode(target_string)
+        # Reject strings that provably can't be found before searching
+        reason = 'char_counts' if target_string is None else self.rejection_reason(target_string)
+        if reason is not None:
+            if stats is not None:
+                stats.rejected = reason
+            return None
+        if workers is not None and workers > 1:
+            path = self._search_parallel(target_string, engine, workers, memo)
+        else:
+            path = self._search(target_string, engine, stats=stats, memo=memo)
+        return None if path is None else self.to_path(path)
+
+    def _search(self, target_string, engine, part=None, stop=None, stats=None, memo=False):
+        """
+        Run a search engine on a non-empty string.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string to search for
+            engine (str): Search engine to use, one of ENGINES
+            part (tuple[int, int] or None): (k, n) to only try every n-th start position from the k-th
+            stop (multiprocessing.Event or None): Event that aborts the search once set
+            stats (SearchStats or None): Filled in with statistics about the search
+            memo (bool): Skip dead-end states, see DeadEndMemo
+
+        Returns:
+            list[int] or None: Cell ids of the path found, or None
+        """
+        if engine == 'backtrack':
+            return self._search_backtrack(target_string, part, stop, stats, memo=memo)
+        if engine == 'bidirectional':
+            return self._search_bidirectional(target_string, part, stop, stats, memo)
+        if engine == 'frontier':
+            return self._search_backtrack(target_string, part, stop, stats, relaxed=True, memo=memo)
+        return self._search_greedy(target_string, part, stop, stats, memo)
+
+    def _search_parallel(self, target_string, engine, workers, memo=False):
+        """
+        Split the start positions of a search between worker processes.
+
+        Each worker receives the grid once, when it starts, and builds its own
+        index. Worker k tries every workers-th start position from the k-th.
+        As soon as one worker finds a path, a shared event tells the others to
+        stop and queued tasks are cancelled.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string to search for
+            engine (str): Search engine to use, one of ENGINES
+            workers (int): Number of worker processes
+            memo (bool): Let each worker skip dead-end states, see DeadEndMemo
+
+        Returns:
+            list[int] or None: Cell ids of the path found, or None
+        """
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        stop = multiprocessing.Event()
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=self._worker_args(stop)) as pool:
+            pending = {pool.submit(_worker_search, target_string, engine, (k, workers), memo)
+                       for k in range(workers)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = future.result()
+                    if path is not None:
+                        stop.set()
+                        for other in pending:
+                            other.cancel()
+                        return path
+        return None
+
+    def _find_all_parallel(self, words, workers):
+        """
+        Split a word list into batches searched by worker processes.
+
+        Args:
+            words (Iterable[str]): Strings to search for
+            workers (int): Number of worker processes
+
+        Returns:
+            dict[str, list[tuple[int, int]] or None]: Mapping of each word to its path,
+                                                     or None if the word is not found
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        results = dict.fromkeys(words)
+        unique = list(results)
+        # A few batches per worker keeps the processes busy when batches are uneven
+        batches = [unique[k::workers * 4] for k in range(workers * 4)]
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=self._worker_args(None)) as pool:
+            for batch_results in pool.map(_worker_find_all, [batch for batch in batches if batch]):
+                results.update(batch_results)
+        return results
+
+    def _worker_args(self, stop):
+        """Arguments of _init_worker, sending the index file rather than the grid when there is one."""
+        if self.source is not None:
+            return None, stop, self.source
+        return self.grid, stop
+
+    def _search_greedy(self, target_string, part=None, stop=None, stats=None, memo=False):
+        """
+        Bidirectional greedy walk outward from the rarest character.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string to search for
+            part (tuple[int, int] or None): (k, n) to only try every n-th start position from the k-th
+            stop (multiprocessing.Event or None): Event that aborts the search once set
+            stats (SearchStats or None): Filled in with statistics about the search
+            memo (bool): Skip dead-end states in both the prefix and the suffix walk
+
+        Returns:
+            list[int] or None: Cell ids of the path found, or None
+        """
+        # Positions of all characters come from the index instead of rescanning the matrix
+        char_positions = self.positions
+        # If any character in the target string is not found or there are less occurrences than in the searched string, return None
+        # And keep track of the character with the lowest amount of positions
+        min_char = None
+        min_count = self.rows * self.cols + 1
+        for char in target_string:
+            if not char_positions.get(char) or len(char_positions[char]) < target_string.count(char):
+                if stats is not None:
+                    stats.rejected = 'char_counts'
+                return None
+            if len(char_positions[char]) < min_count:
+                min_count = len(char_positions[char])
+                min_char = char
+
+        # One memo of dead-end states serves the walks toward both ends of the string
+        live = DeadEndMemo(self, target_string).live if memo else None
+
+        neighbors_by_char = self.neighbors_by_char
+        hook = stats.hook if stats is not None else None
+        position = self.grid.position
+        admit = self._start_filter(target_string)
+        tried = nodes = backtracks = pruned = 0
+        path = list(None for _ in target_string)
+        # Start from each position of the character with the fewest occurrences
+        start_positions = char_positions[min_char]
+        if part is not None:
+            start_positions = start_positions[part[0]::part[1]]
+        try:
+            for start in start_positions:
+                if stop is not None and stop.is_set():
+                    return None
+                # For every matrix start position iterate on its position in the target string
+                for start_index in get_char_positions_in_string(target_string, min_char):
+                    if (admit is not None and not admit(start, start_index)) or \
+                            (live is not None and not (live(start, start_index, -1) and live(start, start_index))):
+                        pruned += 1
+                        continue
+                    tried += 1
+                    if hook is not None:
+                        hook('start', position(start), start_index)
+                    path[start_index] = start
+                    # Check for every valid direction whether the predecessor character is reachable
+                    # If so, start an iterative approach until the first character is reached
+                    # In that approach, do not check positions already in the path
+                    visited = set()
+                    current = start
+                    idx = start_index
+                    while current is not None and current not in visited and idx > 0:
+                        visited.add(current)
+                        # Get the valid moves from the current position
+                        for direction in neighbors_by_char(current).get(target_string[idx - 1], ()):
+                            if live is not None and not live(direction, idx - 1, -1):
+                                pruned += 1
+                                continue
+                            path[idx - 1] = direction
+                            current = direction
+                            idx -= 1
+                            nodes += 1
+                            if hook is not None:
+                                hook('expand', position(direction), idx)
+                            break
+                        else:
+                            break
+                    # Do the same for the successor characters but first remove the start position from visited if existent
+                    if start in visited:
+                        visited.remove(start)
+                    current = start
+                    idx = start_index
+                    while current is not None and current not in visited and idx < len(target_string) - 1:
+                        visited.add(current)
+                        for direction in neighbors_by_char(current).get(target_string[idx + 1], ()):
+                            if direction not in visited and (live is None or live(direction, idx + 1)):
+                                path[idx + 1] = direction
+                                current = direction
+                                idx += 1
+                                nodes += 1
+                                if hook is not None:
+                                    hook('expand', position(direction), idx)
+                                break
+                            pruned += 1
+                        else:
+                            # Go back to the previous position and remove the current from the path and the previous from the visited set
+                            if idx > start_index:
+                                backtracks += 1
+                                if hook is not None:
+                                    hook('backtrack', position(path[idx]), idx)
+                                path[idx] = None
+                                idx -= 1
+                                current = path[idx]
+                                visited.remove(current)
+                            else:
+                                break
+                    # If the length of the path matches the length of the target string and there are no None values, return the path
+                    if len(path) == len(target_string) and all(pos is not None for pos in path):
+                        return path
+            return None
+        finally:
+            if stats is not None:
+                stats._add(min_char, tried, nodes, backtracks, pruned)
+
+    def _search_backtrack(self, target_string, part=None, stop=None, stats=None, relaxed=False, memo=False):
+        """
+        Exhaustive depth-first search with a bytearray of visited cells.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string to search for
+            part (tuple[int, int] or None): (k, n) to only try every n-th start position from the k-th
+            stop (multiprocessing.Event or None): Event that aborts the search once set
+            stats (SearchStats or None): Filled in with statistics about the search
+            relaxed (bool): Only start from cells left by relaxed_starts
+            memo (bool): Skip dead-end states, see DeadEndMemo
+
+        Returns:
+            list[int] or None: Cell ids of the path found, or None
+        """
+        paths = self._iter_backtrack(target_string, part, stop, stats, relaxed, memo)
+        try:
+            return next(paths, None)
+        finally:
+            paths.close()
+
+    def _iter_backtrack(self, target_string, part=None, stop=None, stats=None, relaxed=False, memo=False):
+        """
+        Enumerate every path of a string by exhaustive depth-first search.
+
+        The search starts from whichever end of the string is rarer in the
+        matrix, and visited cells are tracked by cell id so marking and
+        unmarking a cell is a single byte write. Paths are produced as the
+        search reaches them, so stopping early costs nothing extra.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string to search for
+            part (tuple[int, int] or None): (k, n) to only try every n-th start position from the k-th
+            stop (multiprocessing.Event or None): Event that aborts the search once set
+            stats (SearchStats or None): Filled in with statistics about the search
+            relaxed (bool): Only start from cells left by relaxed_starts
+            memo (bool): Skip dead-end states, see DeadEndMemo
+
+        Yields:
+            list[int]: Cell ids of each distinct path
+        """
+        char_positions = self.positions
+        for char in set(target_string):
+            if len(char_positions.get(char, ())) < target_string.count(char):
+                if stats is not None:
+                    stats.rejected = 'char_counts'
+                return
+        # Search the reversed string when its first character is rarer
+        reverse = len(char_positions[target_string[-1]]) < len(char_positions[target_string[0]])
+        word = target_string[::-1] if reverse else target_string
+
+        neighbors_by_char = self.neighbors_by_char
+        hook = stats.hook if stats is not None else None
+        length = len(word)
+        visited = bytearray(self.rows * self.grid.stride)
+        tried = nodes = backtracks = pruned = 0
+        start_positions = char_positions[word[0]]
+        if relaxed:
+            narrowed = self.relaxed_starts(word)
+            pruned = len(start_positions) - len(narrowed)
+            start_positions = narrowed
+            if not narrowed and stats is not None:
+                stats.rejected = 'relaxed'
+        live = DeadEndMemo(self, word).live if memo else None
+        if part is not None:
+            start_positions = start_positions[part[0]::part[1]]
+        admit = self._start_filter(target_string)
+        if admit is not None:
+            anchor_index = length - 1 if reverse else 0
+            admitted = [start for start in start_positions if admit(start, anchor_index)]
+            pruned += len(start_positions) - len(admitted)
+            start_positions = admitted
+        try:
+            for start in start_positions:
+                if stop is not None and stop.is_set():
+                    return
+                if live is not None and not live(start, 0):
+                    pruned += 1
+                    continue
+                tried += 1
+                nodes += 1
+                if hook is not None:
+                    self._hook_event(hook, 'start', start, 0, length, reverse)
+                path = [start]
+                # Only neighbors holding the next character are ever tried
+                moves = [iter(neighbors_by_char(start).get(word[1], ()) if length > 1 else ())]
+                visited[start] = 1
+                while path:
+                    if len(path) < length:
+                        for cell in moves[-1]:
+                            if not visited[cell] and (live is None or live(cell, len(path))):
+                                visited[cell] = 1
+                                path.append(cell)
+                                nodes += 1
+                                if hook is not None:
+                                    self._hook_event(hook, 'expand', cell, len(path) - 1, length, reverse)
+                                if len(path) < length:
+                                    moves.append(iter(neighbors_by_char(cell).get(word[len(path)], ())))
+                                break
+                            pruned += 1
+                        else:
+                            # All moves from the deepest cell failed, step back one level
+                            backtracks += 1
+                            if hook is not None:
+                                self._hook_event(hook, 'backtrack', path[-1], len(path) - 1, length, reverse)
+                            visited[path.pop()] = 0
+                            moves.pop()
+                    else:
+                        yield path[::-1] if reverse else path[:]
+                        # Step back from the complete path to look for the next one
+                        visited[path.pop()] = 0
+        finally:
+            if stats is not None:
+                stats._add(word[0], tried, nodes, backtracks, pruned)
+
+    def _choose_anchor(self, target_string):
+        """
+        Pick the index and width of the anchor for a bidirectional search.
+
+        Every single character and every adjacent pair of the string is a
+        candidate. Its cost is the number of places it occurs in the matrix
+        times the length of the longer half left to search on either side, so
+        a rare occurrence near the middle of the string wins over an equally
+        rare one at an end.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string
+
+        Returns:
+            tuple[int, int]: Index of the first anchor character and anchor width (1 or 2)
+        """
+        positions = self.positions
+        last = len(target_string) - 1
+        best = None
+        for index, char in enumerate(target_string):
+            cost = len(positions[char]) * (1 + max(index, last - index))
+            if best is None or cost < best[0]:
+                best = (cost, index, 1)
+        if last:
+            counts = self.bigram_counts
+            for index, pair in enumerate(zip(target_string, target_string[1:])):
+                cost = counts[pair] * (1 + max(index, last - 1 - index))
+                if cost < best[0]:
+                    best = (cost, index, 2)
+        return best[1], best[2]
+
+    def _search_bidirectional(self, target_string, part=None, stop=None, stats=None, memo=False):
+        """
+        Exhaustive search growing the prefix and suffix of the string from an anchor.
+
+        For each occurrence of the anchor, the shorter half is enumerated by
+        depth-first search and each of its paths is joined with a path of the
+        other half that avoids its cells. Paths of the longer half found for
+        earlier joins are tried first, and an occurrence is dropped as soon as
+        the longer half can't be completed even on its own.
+
+        Args:
+            target_string (str or bytes): Non-empty encoded string to search for
+            part (tuple[int, int] or None): (k, n) to only try every n-th seed from the k-th
+            stop (multiprocessing.Event or None): Event that aborts the search once set
+            stats (SearchStats or None): Filled in with statistics about the search
+            memo (bool): Skip dead-end states in both halves, see DeadEndMemo
+
+        Returns:
+            list[int] or None: Cell ids of the path found, or None
+        """
+        anchor, width = self._choose_anchor(target_string)
+        # Cells holding the anchor, as tuples of width consecutive path cells
+        seeds = [(cell,) for cell in self.positions[target_string[anchor]]]
+        if width == 2:
+            following = target_string[anchor + 1]
+            seeds = [(cell, neighbor) for (cell,) in seeds
+                     for neighbor in self.neighbors_by_char(cell).get(following, ())]
+        if part is not None:
+            seeds = seeds[part[0]::part[1]]
+
+        hook = stats.hook if stats is not None else None
+        position = self.grid.position
+        tried = pruned = 0
+        # Nodes expanded, backtracks and pruned moves of the half searches
+        counters = [0, 0, 0]
+        admit = self._start_filter(target_string)
+        if admit is not None:
+            admitted = [seed for seed in seeds if admit(seed[0], anchor)]
+            pruned = len(seeds) - len(admitted)
+            seeds = admitted
+        # One memo of dead-end states serves the prefix and the suffix searches
+        live = DeadEndMemo(self, target_string).live if memo else None
+
+        # The prefix is matched backward from the anchor, the suffix forward
+        prefix = target_string[:anchor][::-1]
+        suffix = target_string[anchor + width:]
+        last = anchor + width - 1
+        visited = bytearray(self.rows * self.grid.stride)
+        try:
+            for seed in seeds:
+                if stop is not None and stop.is_set():
+                    return None
+                if live is not None and not (live(seed[0], anchor, -1) and live(seed[-1], last)):
+                    pruned += 1
+                    continue
+                tried += 1
+                counters[0] += width
+                if hook is not None:
+                    hook('start', position(seed[0]), anchor)
+                    if width == 2:
+                        hook('expand', position(seed[1]), last)
+                for cell in seed:
+                    visited[cell] = 1
+                try:
+                    path = self._join_halves(seed, prefix, suffix, anchor, last,
+                                             visited, counters, hook, live)
+                finally:
+                    for cell in seed:
+                        visited[cell] = 0
+                if path is not None:
+                    return path
+            return None
+        finally:
+            if stats is not None:
+                stats._add(target_string[anchor], tried, counters[0], counters[1],
+                           pruned + counters[2])
+
+    def _join_halves(self, seed, prefix, suffix, anchor, last, visited, counters, hook, live=None):
+        """
+        Find disjoint prefix and suffix paths around one anchor occurrence.
+
+        Args:
+            seed (tuple[int, ...]): Cells of the anchor, already marked as visited
+            prefix (str or bytes): Characters before the anchor, nearest first
+            suffix (str or bytes): Characters after the anchor
+            anchor (int): String index of the first anchor cell
+            last (int): String index of the last anchor cell
+            visited (bytearray): Cells currently on the path
+            counters (list[int]): Nodes expanded, backtracks and pruned moves, updated in place
+            hook (callable or None): Event hook of SearchStats
+            live (callable or None): DeadEndMemo.live of the string, to skip dead-end states
+
+        Returns:
+            list[int] or None: Cell ids of the whole path, or None
+        """
+        # Enumerate the shorter half, join each of its paths with the longer one
+        if len(prefix) <= len(suffix):
+            outer = (seed[0], prefix, visited, counters, hook, anchor, -1, live)
+            inner = (seed[-1], suffix, visited, counters, hook, last, 1, live)
+        else:
+            outer = (seed[-1], suffix, visited, counters, hook, last, 1, live)
+            inner = (seed[0], prefix, visited, counters, hook, anchor, -1, live)
+
+        # The longer half has to exist on its own before any join is tried
+        found = self._first_extension(*inner)
+        if found is None:
+            return None
+        candidates = [found]
+        outer_paths = self._iter_extend(*outer)
+        try:
+            for outer_path in outer_paths:
+                for inner_path in candidates:
+                    if not any(visited[cell] for cell in inner_path):
+                        break
+                else:
+                    # None of the known paths avoids this one, search around it
+                    inner_path = self._first_extension(*inner)
+                    if inner_path is None:
+                        continue
+                    candidates = [inner_path] + candidates[:JOIN_CANDIDATES - 1]
+                if len(prefix) <= len(suffix):
+                    return outer_path[::-1] + list(seed) + inner_path
+                return inner_path[::-1] + list(seed) + outer_path
+            return None
+        finally:
+            outer_paths.close()
+
+    def _first_extension(self, start, word, visited, counters, hook, index, step, live=None):
+        """Get a copy of the first path found by _iter_extend, or None."""
+        paths = self._iter_extend(start, word, visited, counters, hook, index, step, live)
+        try:
+            path = next(paths, None)
+            return None if path is None else path[:]
+        finally:
+            paths.close()
+
+    def _iter_extend(self, start, word, visited, counters, hook=None, index=0, step=1, live=None):
+        """
+        Enumerate paths spelling a word that continue from a cell.
+
+        Cells of the path being built are marked in visited, including while
+        a path is yielded, and unmarked when the search moves on or the
+        generator is closed.
+
+        Args:
+            start (int): Cell the paths continue from, not part of the paths
+            word (str or bytes): Characters of the cells after start
+            visited (bytearray): Cells that can't be used
+            counters (list[int]): Nodes expanded, backtracks and pruned moves, updated in place
+            hook (callable or None): Event hook of SearchStats
+            index (int): String index of start, for hook events and live
+            step (int): 1 if the word follows start in the string, -1 if it precedes it
+            live (callable or None): DeadEndMemo.live of the string, to skip dead-end states
+
+        Yields:
+            list[int]: Cell ids of each path, reused between yields
+        """
+        if not word:
+            yield []
+            return
+        neighbors_by_char = self.neighbors_by_char
+        position = self.grid.position
+        length = len(word)
+        nodes = backtracks = pruned = 0
+        path = []
+        moves = [iter(neighbors_by_char(start).get(word[0], ()))]
+        try:
+            while moves:
+                for cell in moves[-1]:
+                    if not visited[cell] and (live is None or live(cell, index + step * (len(path) + 1), step)):
+                        visited[cell] = 1
+                        path.append(cell)
+                        nodes += 1
+                        if hook is not None:
+                            hook('expand', position(cell), index + step * len(path))
+                        if len(path) < length:
+                            moves.append(iter(neighbors_by_char(cell).get(word[len(path)], ())))
+                        break
+                    pruned += 1
+                else:
+                    # All moves from the deepest cell failed, step back one level
+                    moves.pop()
+                    if path:
+                        backtracks += 1
+                        if hook is not None:
+                            hook('backtrack', position(path[-1]), index + step * len(path))
+                        visited[path.pop()] = 0
+                    continue
+                if len(path) == length:
+                    yield path
+                    # Step back from the complete path to look for the next one
+                    visited[path.pop()] = 0
+        finally:
+            for cell in path:
+                visited[cell] = 0
+            counters[0] += nodes
+            counters[1] += backtracks
+            counters[2] += pruned
+
+    def _hook_event(self, hook, event, cell, depth, length, reverse):
+        """Report a search event with the cell position and its index in the target string."""
+        hook(event, self.grid.position(cell), length - 1 - depth if reverse else depth)
+
+
+class MutableIndex(MatrixIndex):
+    """
+    Index over a board that changes a few cells at a time.
+
+    The index works on its own MutableGrid copy of the matrix. set_cell()
+    updates the character positions, checkerboard colour counts, bigram
+    counts and neighbor groups touched by the change, so an edit costs time
+    proportional to the neighborhood of the cell rather than the board.
+
+    Results of find_string_with_path are kept in a bounded LRU table.
+    An edit only drops the results it can affect: paths running through the
+    changed cell, and misses for strings that could now pass through it,
+    meaning the new character sits next to the characters it would have to
+    follow and precede in the string.
+
+    Attributes:
+        maxsize (int): Maximum number of cached results
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that ran a search
+        evictions (int): Results dropped to stay within maxsize
+    """
+
+    def __init__(self, matrix, maxsize=1024):
+        """
+        Set up the index tables for a copy of a matrix.
+
+        Args:
+            matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+            maxsize (int): Maximum number of cached results
+        """
+        if isinstance(matrix, CompactGrid):
+            grid = MutableGrid(''.join(matrix), matrix.rows, matrix.cols)
+        else:
+            grid = MutableGrid.from_matrix(matrix)
+        super().__init__(grid)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # (target string, engine) -> path cell ids or None, least recently used first
+        self._results = OrderedDict()
+        # Cell -> keys of cached paths through it, character -> keys of cached misses
+        self._paths_by_cell = {}
+        self._misses_by_char = {}
+
+    def info(self):
+        """
+        Get the counters and size of the result cache for monitoring.
+
+        Returns:
+            dict: hits, misses, evictions and results
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'results': len(self._results)}
+
+    def find_string_with_path(self, target_string, engine='greedy', workers=None, stats=None,
+                              timeout=None, max_nodes=None, memo=False):
+        """
+        Find a string in the board and return the path, using cached results.
+
+        On a hit, stats only records the engine and whether a path was found.
+        Searches with a budget are answered from the cache as well, and
+        their result is stored unless it is undetermined.
+
+        Args:
+            target_string (str): String to search for
+            engine (str): Search engine to use, one of ENGINES
+            workers (int or None): Number of worker processes, None to search in-process
+            stats (SearchStats or None): Filled in with statistics about the search
+            timeout (float or None): Seconds the search may run, None for no limit
+            max_nodes (int or None): Number of nodes the search may visit, None for no limit
+            memo (bool): Skip states recorded as dead ends in a DeadEndMemo of the string
+
+        Returns:
+            list[tuple[int, int]] or None or SearchResult: List of (row, col) coordinates
+                forming the path, or None if string is not found; a SearchResult when
+                timeout or max_nodes is given
+        """
+        bounded = timeout is not None or max_nodes is not None
+        # The memo lets the greedy engine find paths it would miss, so it is part of the key
+        key = (target_string, engine, memo)
+        if key in self._results:
+            self._results.move_to_end(key)
+            self.hits += 1
+            cells = self._results[key]
+            if stats is not None:
+                stats.reset()
+                stats.engine = engine
+                stats.found = cells is not None
+            path = None if cells is None else self.to_path(cells)
+            if bounded:
+                return self._search_result(target_string, engine, path)
+            return path
+        self.misses += 1
+        result = super().find_string_with_path(target_string, engine, workers, stats, timeout, max_nodes, memo)
+        if not bounded:
+            self._store(key, result)
+        elif result.status != 'undetermined':
+            self._store(key, result.path)
+        return result
+
+    def set_cell(self, row, col, char):
+        """
+        Change one cell and update the index tables and cached results.
+
+        Args:
+            row (int): Row index
+            col (int): Column index
+            char (str): New character
+
+        Returns:
+            int: Number of cached results dropped
+
+        Raises:
+            IndexError: If the position is outside the grid
+            ValueError: If char is not a single character
+        """
+        grid = self.grid
+        old = grid.set_cell(row, col, char)
+        if old == char:
+            return 0
+        cell = grid.cell_id(row, col)
+        neighbors = self.adjacency[cell]
+        cells = grid.cells
+
+        # Position lists stay sorted; characters not looked up yet are found lazily
+        if old in self.positions:
+            cell_list = self.positions[old]
+            del cell_list[bisect_left(cell_list, cell)]
+        if char in self.positions:
+            insort(self.positions[char], cell)
+
+        colour = (row + col) & 1
+        for code, delta in ((old, -1), (char, 1)):
+            counts = self._colour_counts.get(code)
+            if counts is not None:
+                counts = list(counts)
+                counts[colour] += delta
+                self._colour_counts[code] = tuple(counts)
+
+        if self._bigram_counts is not None:
+            counts = self._bigram_counts
+            for neighbor in neighbors:
+                value = cells[neighbor]
+                for pair in ((old, value), (value, old)):
+                    counts[pair] -= 1
+                    # Absent pairs must not be in the counter, has_bigrams relies on it
+                    if counts[pair] <= 0:
+                        del counts[pair]
+                counts[(char, value)] += 1
+                counts[(value, char)] += 1
+
+        # Neighbor groups of the surrounding cells are rebuilt on next use
+        for neighbor in neighbors:
+            self._transitions.pop(neighbor, None)
+        if self._code_array is not None:
+            self._code_array[row, col] = ord(char)
+
+        return self._invalidate_cell(cell, char, {cells[neighbor] for neighbor in neighbors})
+
+    def _store(self, key, path):
+        """Cache a search result and register the cells or characters it depends on."""
+        if path is None:
+            cells = None
+            for char in set(key[0]):
+                self._misses_by_char.setdefault(char, set()).add(key)
+        else:
+            cells = tuple(self.grid.cell_id(row, col) for row, col in path)
+            for cell in cells:
+                self._paths_by_cell.setdefault(cell, set()).add(key)
+        self._results[key] = cells
+        self._results.move_to_end(key)
+        while len(self._results) > max(self.maxsize, 0):
+            self._forget(*self._results.popitem(last=False))
+            self.evictions += 1
+
+    def _forget(self, key, cells):
+        """Unregister a result dropped from the cache."""
+        if cells is None:
+            registry, entries = self._misses_by_char, set(key[0])
+        else:
+            registry, entries = self._paths_by_cell, cells
+        for entry in entries:
+            keys = registry.get(entry)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del registry[entry]
+
+    def _invalidate_cell(self, cell, char, around):
+        """
+        Drop the cached results a changed cell can affect.
+
+        Args:
+            cell (int): Changed cell id
+            char (str): New character of the cell
+            around (set[str]): Characters of the neighbors of the cell
+
+        Returns:
+            int: Number of results dropped
+        """
+        stale = set(self._paths_by_cell.get(cell, ()))
+        for key in self._misses_by_char.get(char, ()):
+            target = key[0]
+            last = len(target) - 1
+            # A new path would hold char at some index i in this cell, between the neighbors at i - 1 and i + 1
+            if any(target[i] == char and (i == 0 or target[i - 1] in around) and
+                   (i == last or target[i + 1] in around) for i in range(len(target))):
+                stale.add(key)
+        for key in stale:
+            self._forget(key, self._results.pop(key))
+        return len(stale)
+
+
+class SearchCache:
+    """
+    Bounded LRU cache of search results and matrix indexes.
+
+    Results are keyed by the fingerprint of the matrix contents, the target
+    string and the engine, so a repeated query skips the search entirely,
+    including for strings that weren't found. The MatrixIndex of recently
+    used matrices is kept too, so a new string on a known board doesn't
+    rebuild the lookup tables. Since keys depend on the contents, a board
+    changed in place gets a new fingerprint and never sees stale results;
+    invalidate() frees the entries of a board that is no longer used.
+
+    The cache can be shared between threads. Searches run outside the lock,
+    so two threads missing on the same key may both search.
+
+    Attributes:
+        maxsize (int): Maximum number of cached results
+        max_indexes (int): Maximum number of cached matrix indexes
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that ran a search
+        evictions (int): Results and indexes dropped to stay within the limits
+    """
+
+    def __init__(self, maxsize=1024, max_indexes=16):
+        """
+        Create an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of cached results
+            max_indexes (int): Maximum number of cached matrix indexes
+        """
+        self.maxsize = maxsize
+        self.max_indexes = max_indexes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Keys in least to most recently used order
+        self._results = OrderedDict()
+        self._indexes = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    def __repr__(self):
+        return (f"SearchCache(results={len(self._results)}/{self.maxsize}, "
+                f"indexes={len(self._indexes)}/{self.max_indexes}, "
+                f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})")
+
+    def info(self):
+        """
+        Get the counters and sizes of the cache for monitoring.
+
+        Returns:
+            dict: hits, misses, evictions, results and indexes
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'results': len(self._results), 'indexes': len(self._indexes)}
+
+    def get_index(self, matrix, fingerprint=None):
+        """
+        Get the cached index of a matrix, building it on a miss.
+
+        Args:
+            matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+            fingerprint (tuple or None): matrix_fingerprint(matrix), if already known
+
+        Returns:
+            MatrixIndex: Index over the matrix contents
+        """
+        if fingerprint is None:
+            fingerprint = matrix_fingerprint(matrix)
+        with self._lock:
+            index = self._indexes.get(fingerprint)
+            if index is not None:
+                self._indexes.move_to_end(fingerprint)
+                return index
+        index = MatrixIndex(matrix)
+        with self._lock:
+            # Keep the index another thread may have stored meanwhile
+            index = self._indexes.setdefault(fingerprint, index)
+            self._indexes.move_to_end(fingerprint)
+            self._evict(self._indexes, self.max_indexes)
+        return index
+
+    def find_string_in_matrix(self, matrix, target_string, engine='greedy', workers=None, stats=None):
+        """
+        Check whether a string can be found in a matrix, using cached results.
+
+        Args:
+            matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+            target_string (str): String to search for
+            engine (str): Search engine to use, one of ENGINES
+            workers (int or None): Number of worker processes, None to search in-process
+            stats (SearchStats or None): Filled in with statistics about the search
+
+        Returns:
+            bool: True if string is found, False otherwise
+        """
+        return self.find_string_with_path(matrix, target_string, engine, workers, stats) is not None
+
+    def find_string_with_path(self, matrix, target_string, engine='greedy', workers=None, stats=None):
+        """
+        Find a string in a matrix and return the path, using cached results.
+
+        On a hit, stats only records the engine and whether a path was found.
+
+        Args:
+            matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+            target_string (str): String to search for
+            engine (str): Search engine to use, one of ENGINES
+            workers (int or None): Number of worker processes, None to search in-process
+            stats (SearchStats or None): Filled in with statistics about the search
+
+        Returns:
+            list[tuple[int, int]] or None: List of (row, col) coordinates forming the path,
+                                          or None if string is not found
+        """
+        fingerprint = matrix_fingerprint(matrix)
+        key = (fingerprint, target_string, engine)
+        with self._lock:
+            cached = key in self._results
+            if cached:
+                self._results.move_to_end(key)
+                self.hits += 1
+                path = self._results[key]
+            else:
+                self.misses += 1
+        if cached:
+            if stats is not None:
+                stats.reset()
+                stats.engine = engine
+                stats.found = path is not None
+            return None if path is None else list(path)
+
+        path = self.get_index(matrix, fingerprint).find_string_with_path(target_string, engine, workers, stats)
+        with self._lock:
+            # Store an immutable copy, so callers can't change cached paths
+            self._results[key] = None if path is None else tuple(path)
+            self._results.move_to_end(key)
+            self._evict(self._results, self.maxsize)
+        return path
+
+    def invalidate(self, matrix=None):
+        """
+        Drop the cached results and index of a matrix, or everything.
+
+        Args:
+            matrix (list[list[str]] or CompactGrid or None): Matrix whose entries to drop,
+                                                            None to empty the cache
+
+        Returns:
+            int: Number of results dropped
+        """
+        with self._lock:
+            if matrix is None:
+                dropped = len(self._results)
+                self._results.clear()
+                self._indexes.clear()
+                return dropped
+        fingerprint = matrix_fingerprint(matrix)
+        with self._lock:
+            keys = [key for key in self._results if key[0] == fingerprint]
+            for key in keys:
+                del self._results[key]
+            self._indexes.pop(fingerprint, None)
+        return len(keys)
+
+    def _evict(self, entries, limit):
+        """Drop the least recently used entries beyond a limit, with the lock held."""
+        while len(entries) > max(limit, 0):
+            entries.popitem(last=False)
+            self.evictions += 1
+
+
+class BoardCorpus:
+    """
+    Inverted index over many boards, for finding one string on all of them.
+
+    For every board the corpus records its character counts and the pairs
+    of characters in horizontally or vertically adjacent cells, as posting
+    lists from each character and pair to the boards holding it. A query
+    intersects the posting lists of the characters and adjacent pairs of
+    the string, shortest first, and only runs the exact search on the
+    boards left.
+
+    Boards are identified by the order they were added in, starting at 0.
+    """
+
+    def __init__(self, boards=()):
+        """
+        Index a collection of boards.
+
+        Args:
+            boards (Iterable[list[list[str]] or CompactGrid]): Boards to add
+        """
+        self._boards = []
+        # Character -> {board id: number of cells holding it}
+        self._char_postings = {}
+        # Ordered pair of adjacent characters -> set of board ids
+        self._pair_postings = {}
+        for board in boards:
+            self.add(board)
+
+    def __len__(self):
+        return len(self._boards)
+
+    def __getitem__(self, board_id):
+        return self._boards[board_id]
+
+    def __repr__(self):
+        return f"BoardCorpus(boards={len(self._boards)})"
+
+    def add(self, board):
+        """
+        Add a board to the corpus.
+
+        Args:
+            board (list[list[str]] or CompactGrid): 2D matrix of characters
+
+        Returns:
+            int: Id of the board
+
+        Raises:
+            ValueError: If rows differ in length or cells are not single characters
+        """
+        grid = as_compact_grid(board)
+        board_id = len(self._boards)
+        rows = list(grid)
+        for char, count in Counter(''.join(rows)).items():
+            self._char_postings.setdefault(char, {})[board_id] = count
+        # Pairs are recorded in both directions, since a path can step either way
+        pairs = set()
+        previous = None
+        for row in rows:
+            pairs.update(zip(row, row[1:]))
+            if previous is not None:
+                pairs.update(zip(previous, row))
+            previous = row
+        pairs.update([(b, a) for a, b in pairs])
+        for pair in pairs:
+            self._pair_postings.setdefault(pair, set()).add(board_id)
+        self._boards.append(grid)
+        return board_id
+
+    def shortlist(self, target_string):
+        """
+        Get the boards that could contain a string.
+
+        Args:
+            target_string (str): String to search for
+
+        Returns:
+            list[int]: Ids of the boards holding each character of the string at least as
+                       often as the string does, and each of its pairs of adjacent characters
+                       in adjacent cells, in increasing order
+        """
+        if not target_string:
+            return [board_id for board_id, grid in enumerate(self._boards) if grid.rows and grid.cols]
+        counts = Counter(target_string)
+        postings = [self._char_postings.get(char, {}) for char in counts]
+        postings += [self._pair_postings.get(pair, ()) for pair in set(zip(target_string, target_string[1:]))]
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates = {board_id for board_id in candidates if board_id in posting}
+        char_postings = self._char_postings
+        return sorted(board_id for board_id in candidates
+                      if all(char_postings[char][board_id] >= count for char, count in counts.items()))
+
+    def find_string(self, target_string, engine='backtrack', workers=None):
+        """
+        Find a string on every board of the corpus.
+
+        Only the shortlisted boards are searched. With several workers they
+        are split into batches searched by worker processes, each receiving
+        only the boards of its batches. The default engine is exhaustive, so
+        every board holding the string is reported, with a valid path.
+
+        Args:
+            target_string (str): String to search for
+            engine (str): Search engine to use, one of ENGINES; greedy may miss boards
+            workers (int or None): Number of worker processes, None to search in-process
+
+        Returns:
+            dict[int, list[tuple[int, int]]]: Board id -> path, for the boards containing
+                                              the string, in increasing board order
+
+        Raises:
+            ValueError: If engine is not one of ENGINES
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+        shortlist = self.shortlist(target_string)
+        if workers is None or workers <= 1 or len(shortlist) <= 1:
+            return _search_boards([(board_id, self._boards[board_id]) for board_id in shortlist],
+                                  target_string, engine)
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        # A few batches per worker keeps the processes busy when boards differ in cost
+        batches = [[(board_id, self._boards[board_id]) for board_id in shortlist[k::workers * 4]]
+                   for k in range(min(workers * 4, len(shortlist)))]
+        found = {}
+        with ProcessPoolExecutor(workers) as pool:
+            for batch_found in pool.map(_search_boards, batches, [target_string] * len(batches),
+                                        [engine] * len(batches)):
+                found.update(batch_found)
+        return dict(sorted(found.items()))
+
+
+class AsyncSearchService:
+    """
+    Asyncio front end running searches in an executor.
+
+    Queries are put on a bounded queue and a fixed number of worker tasks
+    hand them to the executor, so callers wait for room in the queue when
+    the service is saturated instead of piling up work. Identical queries
+    (same board contents, string and engine) that are in flight together
+    share one search. Board fingerprints are computed in the executor as
+    well, or callers that already know a board can pass their own key. A
+    caller that is cancelled or times out stops waiting without affecting
+    the other callers of the same query, and a query nobody waits for
+    anymore is skipped if it hasn't started yet. A search already running
+    in the executor can't be interrupted; it finishes in the background and
+    its result is dropped.
+
+    The service attaches to the event loop it is first used in, and starts
+    over when used in a new loop.
+    """
+
+    def __init__(self, executor=None, concurrency=4, max_pending=64, cache=None):
+        """
+        Create a service; worker tasks start on first use.
+
+        Args:
+            executor (concurrent.futures.Executor or None): Executor running the searches,
+                                                            None for the loop's default
+            concurrency (int): Number of searches handed to the executor at once
+            max_pending (int): Number of queued queries before callers wait, 0 for no limit
+            cache (SearchCache or None): Cache shared by the searches; only usable with
+                                         executors running in the same process
+        """
+        self.executor = executor
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.cache = cache
+        self._loop = None
+        self._queue = None
+        self._tasks = []
+        # Query key -> [future, number of waiting callers]
+        self._inflight = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    @property
+    def pending(self):
+        """int: Number of distinct queries queued or running."""
+        return len(self._inflight)
+
+    async def find_string_with_path(self, matrix, target_string, engine='greedy', timeout=None,
+                                    board_key=None):
+        """
+        Find a string in a matrix and return the path.
+
+        Args:
+            matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+            target_string (str): String to search for
+            engine (str): Search engine to use, one of ENGINES
+            timeout (float or None): Seconds to wait for the result, including time
+                                     spent fingerprinting and waiting for room in the queue
+            board_key (Hashable or None): Key identifying the board contents, None to
+                                          fingerprint the matrix in the executor
+
+        Returns:
+            list[tuple[int, int]] or None: List of (row, col) coordinates forming the path,
+                                          or None if string is not found
+
+        Raises:
+            ValueError: If engine is not one of ENGINES
+            TimeoutError: If the result isn't ready within timeout
+        """
+        import asyncio
+
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+        self._start()
+        loop = self._loop
+        deadline = None if timeout is None else loop.time() + timeout
+        if board_key is None:
+            # Hashing a large board would stall the event loop
+            fingerprint = loop.run_in_executor(self.executor, matrix_fingerprint, matrix)
+            board_key = await asyncio.wait_for(fingerprint, timeout)
+            if deadline is not None:
+                timeout = max(deadline - loop.time(), 0)
+        key = (board_key, target_string, engine)
+        entry = self._inflight.get(key)
+        put = None
+        if entry is None:
+            entry = self._inflight[key] = [loop.create_future(), 0]
+            # The queue put outlives this caller, other callers may share the query
+            put = asyncio.ensure_future(self._queue.put((key, matrix, target_string, engine, entry[0])))
+        future = entry[0]
+        entry[1] += 1
+
+        async def result():
+            if put is not None:
+                await asyncio.shield(put)
+            return await asyncio.shield(future)
+
+        try:
+            path = await asyncio.wait_for(result(), timeout)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not future.done():
+                # Nobody waits for this query anymore
+                future.cancel()
+                if self._inflight.get(key) is entry:
+                    del self._inflight[key]
+        # Callers sharing a search each get their own list
+        return None if path is None else list(path)
+
+    async def find_all_strings(self, matrix, words, engine='greedy', timeout=None, board_key=None):
+        """
+        Find many strings in a matrix, one query per distinct word.
+
+        Args:
+            matrix (list[list[str]] or CompactGrid): 2D matrix of characters
+            words (Iterable[str]): Strings to search for
+            engine (str): Search engine to use, one of ENGINES
+            timeout (float or None): Seconds to wait for all results
+            board_key (Hashable or None): Key identifying the board contents, None to
+                                          fingerprint the matrix in the executor
+
+        Returns:
+            dict[str, list[tuple[int, int]] or None]: Mapping of each word to its path,
+                                                     or None if the word is not found
+
+        Raises:
+            TimeoutError: If the results aren't ready within timeout
+        """
+        import asyncio
+
+        async def queries():
+            # Fingerprint the board once for all the words
+            key = board_key
+            if key is None:
+                self._start()
+                key = await self._loop.run_in_executor(self.executor, matrix_fingerprint, matrix)
+            return await asyncio.gather(*(self.find_string_with_path(matrix, word, engine, board_key=key)
+                                          for word in unique))
+
+        unique = list(dict.fromkeys(words))
+        paths = await asyncio.wait_for(queries(), timeout)
+        return dict(zip(unique, paths))
+
+    async def aclose(self):
+        """Stop the worker tasks and cancel queries that haven't finished."""
+        import asyncio
+
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for future, _ in self._inflight.values():
+            future.cancel()
+        self._inflight.clear()
+        self._loop = self._queue = None
+
+    def _start(self):
+        """Set up the queue and worker tasks in the running loop."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(self.max_pending)
+        self._inflight = {}
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def _work(self):
+        """Worker task handing queued queries to the executor."""
+        from functools import partial
+
+        loop = self._loop
+        queue = self._queue
+        while True:
+            key, matrix, target_string, engine, future = await queue.get()
+            try:
+                if future.done():
+                    continue
+                search = partial(find_string_with_path, matrix, target_string, engine, cache=self.cache)
+                try:
+                    path = await loop.run_in_executor(self.executor, search)
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(path)
+            finally:
+                # Fail waiters if the service is closed during the search
+                if not future.done():
+                    future.cancel()
+                entry = self._inflight.get(key)
+                if entry is not None and entry[0] is future:
+                    del self._inflight[key]
+                queue.task_done()
+
+
+def _numpy():
+    """Get the NumPy module, or None if it isn't installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+# Shared service used by the module-level async functions, created on first use
+_default_service = None
+
+
+def _get_default_service():
+    """Get the shared AsyncSearchService, creating it on first use."""
+    global _default_service
+    if _default_service is None:
+        _default_service = AsyncSearchService()
+    return _default_service
+
+
+# Per-process state of parallel search workers, set up by _init_worker
+_worker_index = None
+_worker_stop = None
+
+
+def _init_worker(grid, stop, source=None):
+    """
+    Build the index of a worker process once, when the process starts.
+    
+    Args:
+        grid (CompactGrid or None): Grid shared by all tasks of the pool
+        stop (multiprocessing.Event or None): Event set once any worker finds a path
+        source (str or None): Index file to load instead of building the index from grid
+    """
+    global _worker_index, _worker_stop
+    _worker_index = MatrixIndex(grid) if source is None else load_index(source)
+    _worker_stop = stop
+
+
+def _worker_search(target_string, engine, part, memo=False):
+    """
+    Search one share of the start positions in a worker process.
+    
+    Args:
+        target_string (str or bytes): Non-empty encoded string to search for
+        engine (str): Search engine to use, one of ENGINES
+        part (tuple[int, int]): (k, n) share of the start positions
+        memo (bool): Skip dead-end states, see DeadEndMemo
+        
+    Returns:
+        list[int] or None: Cell ids of the path found, or None
+    """
+    path = _worker_index._search(target_string, engine, part, _worker_stop, memo=memo)
+    if path is not None:
+        _worker_stop.set()
+    return path
+
+
+def _worker_search_batch(words, engine):
+    """
+    Search a batch of words from the command line in a worker process.
+    
+    Args:
+        words (list[str]): Strings to search for
+        engine (str or None): Engine for per-word searches, None for the batch trie search
+        
+    Returns:
+        tuple[list[str], dict]: The words and the mapping of each word to its path or None
+    """
+    return _search_batch(_worker_index, words, engine)
+
+
+def _worker_find_all(words):
+    """
+    Run a batch search for a share of the words in a worker process.
+    
+    Args:
+        words (list[str]): Strings to search for
+        
+    Returns:
+        dict[str, list[tuple[int, int]] or None]: Mapping of each word to its path
+    """
+    return _worker_index.find_all_strings(words)
+
+
+def _search_boards(boards, target_string, engine):
+    """
+    Search a string on several boards, in-process or in a worker process.
+
+    Args:
+        boards (list[tuple[int, CompactGrid]]): Board ids and boards
+        target_string (str): String to search for
+        engine (str): Search engine to use, one of ENGINES
+
+    Returns:
+        dict[int, list[tuple[int, int]]]: Board id -> path, for the boards containing the string
+    """
+    found = {}
+    for board_id, grid in boards:
+        path = MatrixIndex(grid).find_string_with_path(target_string, engine)
+        if path is not None:
+            found[board_id] = path
+    return found
+
+
+def _iter_tiles(rows, cols, tile_size, halo):
+    """
+    Split a grid into tiles with halos.
+
+    Args:
+        rows (int): Number of rows of the grid
+        cols (int): Number of columns of the grid
+        tile_size (int): Number of rows and columns of each tile, without its halo
+        halo (int): Number of cells added on every side of a tile, clipped to the grid
+
+    Yields:
+        tuple[int, int, int, int]: (row, col, rows, cols) of each tile with its halo,
+                                   in row-major order
+    """
+    for top in range(0, rows, tile_size):
+        row = max(0, top - halo)
+        height = min(rows, top + tile_size + halo) - row
+        for left in range(0, cols, tile_size):
+            col = max(0, left - halo)
+            yield row, col, height, min(cols, left + tile_size + halo) - col
+
+
+def _search_tile(grid, tile, target_string, engine, adjacencies):
+    """
+    Search one tile of a grid, returning the path in tile coordinates or None.
+
+    Neighbor tables come from adjacencies, a dict of (rows, cols) shape to
+    Adjacency owned by the caller, rather than from the shared cache, which
+    would keep the tables of every tile shape alive after the search.
+    """
+    region = grid.region(*tile)
+    shape = (region.rows, region.cols)
+    adjacency = adjacencies.get(shape)
+    if adjacency is None:
+        adjacency = adjacencies[shape] = Adjacency(*shape)
+    return MatrixIndex(region, adjacency).find_string_with_path(target_string, engine)
+
+
+def _search_tiles_parallel(grid, tiles, target_string, engine, workers):
+    """
+    Search tiles in worker processes, yielding (tile, path) pairs in tile order.
+
+    Workers receive the grid once, when they start, and only the bounds of
+    each tile afterwards; a mapped grid is reopened from its path. Up to two
+    tiles per worker are in flight, and tiles not started yet are cancelled
+    once the caller stops iterating.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers, initializer=_init_tile_worker, initargs=(grid,)) as pool:
+        pending = deque()
+        try:
+            for tile in tiles:
+                pending.append((tile, pool.submit(_worker_search_tile, tile, target_string, engine)))
+                if len(pending) >= 2 * workers:
+                    tile, future = pending.popleft()
+                    yield tile, future.result()
+            while pending:
+                tile, future = pending.popleft()
+                yield tile, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+# Grid searched by tiled search workers and the neighbor tables of its tile
+# shapes, set up by _init_tile_worker
+_worker_grid = None
+_worker_adjacencies = None
+
+
+def _init_tile_worker(grid):
+    """
+    Keep the grid of a tiled search worker process.
+
+    Args:
+        grid (CompactGrid): Grid whose tiles the worker searches
+    """
+    global _worker_grid, _worker_adjacencies
+    _worker_grid = grid
+    _worker_adjacencies = {}
+
+
+def _worker_search_tile(tile, target_string, engine):
+    """
+    Search one tile in a worker process.
+
+    Args:
+        tile (tuple[int, int, int, int]): (row, col, rows, cols) of the tile
+        target_string (str): Non-empty string to search for
+        engine (str): Search engine to use, one of ENGINES
+
+    Returns:
+        list[tuple[int, int]] or None: Path in tile coordinates, or None
+    """
+    return _search_tile(_worker_grid, tile, target_string, engine, _worker_adjacencies)
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    ``python -m string_finder search --grid board.txt --words words.txt``
+    searches every word of a word list (or stdin) in a grid file, one word
+    per line, and writes one JSON object per word to stdout as results come
+    in. Without arguments the sample matrix demo runs.
+
+    Args:
+        argv (list[str] or None): Command-line arguments, None for sys.argv[1:]
+
+    Returns:
+        int: Exit status
+    """
+    import sys
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        _run_demo()
+        return 0
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m string_finder',
+                                     description="Find strings in 2D character grids")
+    commands = parser.add_subparsers(dest='command', required=True)
+    search = commands.add_parser('search', help="search a word list in a grid file",
+                                 description="Search a word list in a grid file and write "
+                                             "one JSON object per word to stdout")
+    search.add_argument('--grid', required=True, help="grid file, one row per line")
+    search.add_argument('--words', default='-', help="word list, one word per line (default stdin)")
+    search.add_argument('--engine', choices=ENGINES,
+                        help="search each word with this engine instead of the batch trie search")
+    search.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    search.add_argument('--batch-size', type=int, default=256, help="words searched per batch")
+    search.add_argument('--found-only', action='store_true', help="only write words that were found")
+    search.add_argument('--no-mmap', action='store_true', help="read the grid into memory instead of mapping it")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    try:
+        grid = _load_grid(args.grid, mmap=not args.no_mmap)
+        words = sys.stdin if args.words == '-' else open(args.words, encoding='utf-8')
+    except (OSError, ValueError) as exc:
+        print(f"{parser.prog}: error: {exc}", file=sys.stderr)
+        return 1
+    try:
+        _write_results(grid, words, args, sys.stdout)
+    except BrokenPipeError:
+        # The reader went away, e.g. output piped into head; silence the final flush
+        import os
+
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if words is not sys.stdin:
+            words.close()
+        if isinstance(grid, MappedGrid):
+            grid.close()
+    return 0
+
+
+def _load_grid(path, mmap):
+    """
+    Load a grid file for the command line, reading it as text when it can't be mapped.
+
+    Mapping needs one byte per cell, so non-ASCII grids are read as UTF-8
+    text instead of being rejected. If the text loader fails too, the
+    original mapping error is raised, since it names the file.
+    """
+    if not mmap:
+        return load_matrix(path, mmap=False)
+    try:
+        return load_matrix(path)
+    except ValueError as exc:
+        try:
+            return load_matrix(path, mmap=False)
+        except ValueError:
+            raise exc from None
+
+
+def _read_batches(lines, size):
+    """Group the non-empty lines of a word list into lists of up to size words."""
+    batch = []
+    for line in lines:
+        word = line.rstrip('\r\n')
+        if word:
+            batch.append(word)
+            if len(batch) == size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _write_results(grid, lines, args, out):
+    """
+    Search batches of words and write one JSON line per word, in input order.
+
+    With several workers, a persistent pool keeps up to two batches per
+    worker in flight, so large word lists are streamed rather than read
+    into memory first.
+    """
+    import json
+
+    batches = _read_batches(lines, args.batch_size)
+    if args.workers is not None and args.workers > 1:
+        results = _search_batches_parallel(grid, batches, args.engine, args.workers)
+    else:
+        index = MatrixIndex(grid)
+        results = (_search_batch(index, batch, args.engine) for batch in batches)
+    for batch, paths in results:
+        for word in batch:
+            path = paths[word]
+            if path is not None or not args.found_only:
+                out.write(json.dumps({'word': word, 'found': path is not None, 'path': path}) + '\n')
+        out.flush()
+
+
+def _search_batch(index, words, engine):
+    """
+    Search one batch of words.
+
+    Args:
+        index (MatrixIndex): Index over the grid
+        words (list[str]): Strings to search for
+        engine (str or None): Engine for per-word searches, None for the batch trie search
+
+    Returns:
+        tuple[list[str], dict]: The words and the mapping of each word to its path or None
+    """
+    if engine is None:
+        return words, index.find_all_strings(words)
+    return words, {word: index.find_string_with_path(word, engine) for word in words}
+
+
+def _search_batches_parallel(grid, batches, engine, workers):
+    """Search batches in worker processes, yielding results in input order."""
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(grid, None)) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_worker_search_batch, batch, engine))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _run_demo():
+    """Search a few strings in a sample matrix and print the results."""
+    # Example usage - you can test your implementation here
+    sample_matrix = [
+        ['H', 'E', 'L', 'L', 'O'],
+        ['W', 'O', 'R', 'L', 'D'],
+        ['P', 'Y', 'T', 'H', 'O'],
+        ['N', 'A', 'L', 'G', 'N']
+    ]
+    
+    print("Sample matrix:")
+    for row in sample_matrix:
+        print(' '.join(row))
+    
+    # Test your implementation
+    result = find_string_with_path(sample_matrix, "HELLO")
+    assert result is not None, "String 'HELLO' should be found in the matrix"
+    print(f"Found 'HELLO': {result}")
+
+    result = find_string_with_path(sample_matrix, "HWPN")
+    assert result is not None, "String 'HWPN' should be found in the matrix"
+    print(f"Found 'HWPN': {result}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
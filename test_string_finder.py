@@ -5,8 +5,23 @@ Comprehensive tests for finding strings in 2D character matrices
 using horizontal and vertical single-step moves.
 """
 
+import asyncio
+import io
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+import string_finder
 from string_finder import find_string_in_matrix, find_string_with_path, is_valid_position, get_valid_moves
+from string_finder import MatrixIndex, find_all_strings, build_trie, ENGINES, CompactGrid
+from string_finder import get_adjacency, load_matrix, MappedGrid, iter_string_paths
+from string_finder import count_string_occurrences, SearchStats, SearchCache, matrix_fingerprint
+from string_finder import MutableGrid, MutableIndex
+from string_finder import AsyncSearchService, async_find_string_with_path, async_find_all_strings
+from string_finder import main, save_index, load_index, find_string_relaxed
+from string_finder import compile_pattern, find_pattern_with_path, find_string_tiled, SearchResult
+from string_finder import BoardCorpus, DeadEndMemo
 
 
 class TestStringFinder:
@@ -200,6 +215,1519 @@ class TestEdgeCases:
         assert find_string_in_matrix(matrix, long_string) == False
 
 
+class TestMatrixIndex:
+    """Test the reusable precomputed index."""
+
+    def setup_method(self):
+        """Set up an index over a word matrix."""
+        self.matrix = [
+            ['H', 'E', 'L', 'L', 'O'],
+            ['W', 'O', 'R', 'L', 'D'],
+            ['P', 'Y', 'T', 'H', 'O'],
+            ['N', 'A', 'L', 'G', 'N']
+        ]
+        self.index = MatrixIndex(self.matrix)
+
+    def test_char_positions(self):
+        """Test that character positions are collected in row-major order."""
+        assert self.index.get_char_positions('H') == [(0, 0), (2, 3)]
+        assert self.index.get_char_positions('Z') == []
+
+    def test_matches_module_functions(self):
+        """Test that index queries agree with the module-level functions."""
+        for word in ["HELLO", "WORLD", "PYTHON", "HWPN", "HELP", "ACE", ""]:
+            assert self.index.find_string_with_path(word) == find_string_with_path(self.matrix, word)
+            assert self.index.find_string_in_matrix(word) == find_string_in_matrix(self.matrix, word)
+
+    def test_empty_matrix(self):
+        """Test that an index over an empty matrix finds nothing."""
+        assert MatrixIndex([]).find_string_with_path("A") is None
+        assert MatrixIndex([[]]).find_string_in_matrix("A") == False
+
+
+class TestFindAllStrings:
+    """Test the trie-based batch search."""
+
+    def setup_method(self):
+        """Set up a word matrix."""
+        self.matrix = [
+            ['C', 'A', 'T', 'S'],
+            ['O', 'D', 'O', 'U'],
+            ['D', 'O', 'G', 'N'],
+            ['E', 'R', 'S', 'D']
+        ]
+
+    def test_build_trie(self):
+        """Test that shared prefixes are merged in the trie."""
+        trie = build_trie(["CAT", "CAR"])
+        assert list(trie) == ['C']
+        assert set(trie['C']['A']) == {'T', 'R'}
+        assert trie['C']['A']['T'][None] == "CAT"
+
+    def test_batch_results(self):
+        """Test that every word maps to a valid path or None."""
+        words = ["CAT", "DOG", "CODE", "CATS", "DOGS", "COW", "ZEBRA", "C", ""]
+        results = find_all_strings(self.matrix, words)
+        assert set(results) == set(words)
+        for word in ["CAT", "DOG", "CODE", "CATS", "C"]:
+            path = results[word]
+            assert path is not None
+            assert ''.join(self.matrix[r][c] for r, c in path) == word
+            assert len(set(path)) == len(path)
+        assert results[""] == []
+        assert results["COW"] is None
+        assert results["ZEBRA"] is None
+
+    def test_agrees_with_single_search(self):
+        """Test that batch results agree with single-word searches."""
+        words = ["ABC", "ADG", "AEI", "ADE", "ABEF", "ACEG", "IFC"]
+        matrix = [['A', 'B', 'C'], ['D', 'E', 'F'], ['G', 'H', 'I']]
+        results = find_all_strings(matrix, words)
+        for word in words:
+            assert (results[word] is not None) == find_string_in_matrix(matrix, word)
+
+    def test_empty_matrix(self):
+        """Test that nothing is found in an empty matrix."""
+        assert find_all_strings([], ["A", ""]) == {"A": None, "": None}
+
+
+class TestSearchEngines:
+    """Test the selectable search engines."""
+
+    def setup_method(self):
+        """Set up a matrix with repeated characters."""
+        self.repeat_matrix = [
+            ['A', 'A', 'B', 'A'],
+            ['A', 'B', 'A', 'B'],
+            ['B', 'A', 'A', 'A'],
+            ['A', 'B', 'B', 'A']
+        ]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_basic_cases(self, engine):
+        """Test that every engine handles the basic cases."""
+        matrix = [['A', 'B', 'C'], ['D', 'E', 'F'], ['G', 'H', 'I']]
+        assert find_string_with_path(matrix, "ABC", engine) == [(0, 0), (0, 1), (0, 2)]
+        assert find_string_in_matrix(matrix, "ADEH", engine) == True
+        assert find_string_in_matrix(matrix, "AEI", engine) == False
+        assert find_string_in_matrix(matrix, "", engine) == True
+        assert find_string_in_matrix([], "A", engine) == False
+
+    def test_backtrack_finds_paths_greedy_misses(self):
+        """Test that the backtracking engine is complete where greedy is not."""
+        matrix = [['B', 'B', 'A'], ['B', 'B', 'B'], ['B', 'B', 'A']]
+        assert find_string_with_path(matrix, "BBBBA") is None
+        path = find_string_with_path(matrix, "BBBBA", engine='backtrack')
+        assert path is not None
+        assert ''.join(matrix[r][c] for r, c in path) == "BBBBA"
+        assert len(set(path)) == len(path)
+
+    def test_backtrack_repeated_characters(self):
+        """Test backtracking over a low-entropy matrix."""
+        for word in ["ABAB", "AABBA", "BABA", "AAAA"]:
+            path = find_string_with_path(self.repeat_matrix, word, engine='backtrack')
+            assert path is not None
+            assert ''.join(self.repeat_matrix[r][c] for r, c in path) == word
+        assert find_string_with_path(self.repeat_matrix, "BBBB", engine='backtrack') is None
+
+    def test_unknown_engine(self):
+        """Test that an unknown engine name is rejected."""
+        with pytest.raises(ValueError):
+            find_string_with_path(self.repeat_matrix, "AB", engine='quantum')
+
+
+class TestCompactGrid:
+    """Test the flat grid representation."""
+
+    def setup_method(self):
+        """Set up a matrix and its compact grid."""
+        self.matrix = [
+            ['S', 'T', 'A', 'R'],
+            ['P', 'A', 'T', 'H'],
+            ['E', 'N', 'D', 'S']
+        ]
+        self.grid = CompactGrid.from_matrix(self.matrix)
+
+    def test_layout(self):
+        """Test flat storage and cell id conversion."""
+        assert self.grid.cells == "STARPATHENDS"
+        assert (self.grid.rows, self.grid.cols) == (3, 4)
+        assert self.grid.cell_id(1, 2) == 6
+        assert self.grid.position(6) == (1, 2)
+        assert self.grid.to_matrix() == self.matrix
+
+    def test_row_access(self):
+        """Test that the grid can stand in for a list of lists."""
+        assert len(self.grid) == 3
+        assert self.grid[2][1] == 'N'
+        assert is_valid_position(self.grid, 2, 3) == True
+        assert is_valid_position(self.grid, 3, 0) == False
+        assert get_valid_moves(self.grid, 0, 0) == get_valid_moves(self.matrix, 0, 0)
+
+    def test_search_accepts_grid(self):
+        """Test that the public search functions accept a compact grid."""
+        for engine in ENGINES:
+            assert find_string_with_path(self.grid, "PATH", engine) == [(1, 0), (1, 1), (1, 2), (1, 3)]
+            assert find_string_in_matrix(self.grid, "STAR", engine) == True
+            assert find_string_in_matrix(self.grid, "SEND", engine) == False
+        assert find_all_strings(self.grid, ["END"]) == {"END": [(2, 0), (2, 1), (2, 2)]}
+
+    def test_invalid_shapes(self):
+        """Test that ragged matrices and multi-character cells are rejected."""
+        with pytest.raises(ValueError):
+            CompactGrid.from_matrix([['A', 'B'], ['C']])
+        with pytest.raises(ValueError):
+            CompactGrid.from_matrix([['AB', 'C']])
+        with pytest.raises(ValueError):
+            CompactGrid("ABC", 2, 2)
+
+
+class TestAdjacency:
+    """Test the cached neighbor table."""
+
+    @pytest.mark.parametrize("rows, cols", [(1, 1), (1, 5), (5, 1), (3, 4)])
+    def test_matches_get_valid_moves(self, rows, cols):
+        """Test that the table lists the same moves in the same order."""
+        matrix = [['A'] * cols for _ in range(rows)]
+        adjacency = get_adjacency(rows, cols)
+        assert len(adjacency) == rows * cols
+        for cell in range(rows * cols):
+            row, col = divmod(cell, cols)
+            moves = [divmod(neighbor, cols) for neighbor in adjacency[cell]]
+            assert moves == get_valid_moves(matrix, row, col)
+
+    def test_shared_per_shape(self):
+        """Test that indexes over matrices of the same shape share the table."""
+        first = MatrixIndex([['A', 'B'], ['C', 'D']])
+        second = MatrixIndex([['W', 'X'], ['Y', 'Z']])
+        assert first.adjacency is second.adjacency
+        assert MatrixIndex([['A', 'B']]).adjacency is not first.adjacency
+
+    def test_get_valid_moves_empty_matrix(self):
+        """Test that an empty matrix has no valid moves."""
+        assert get_valid_moves([], 0, 0) == []
+        assert get_valid_moves([[]], 0, 0) == []
+
+
+class TestTransitionIndex:
+    """Test the character transition tables."""
+
+    def setup_method(self):
+        """Set up an index over a small matrix."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['D', 'E', 'F'],
+            ['G', 'H', 'I']
+        ]
+        self.index = MatrixIndex(self.matrix)
+
+    def test_bigram_counts(self):
+        """Test that adjacent pairs are counted in both directions."""
+        counts = self.index.bigram_counts
+        assert counts[('A', 'B')] == 1
+        assert counts[('B', 'A')] == 1
+        assert counts[('A', 'D')] == 1
+        assert ('A', 'E') not in counts
+        assert ('C', 'D') not in counts  # Row wrap is not adjacent
+        # 12 adjacent cell pairs in a 3x3 grid, each counted both ways
+        assert sum(counts.values()) == 24
+
+    def test_has_bigrams(self):
+        """Test upfront rejection of strings with impossible steps."""
+        assert self.index.has_bigrams("ABEF") == True
+        assert self.index.has_bigrams("AEI") == False
+        assert self.index.has_bigrams("A") == True
+        assert self.index.has_bigrams("") == True
+        assert self.index.find_string_with_path("CD") is None
+
+    def test_neighbors_by_char(self):
+        """Test grouping of neighbors by their character."""
+        index = MatrixIndex([['A', 'B', 'A'], ['B', 'A', 'B']])
+        center = index.grid.cell_id(0, 1)
+        groups = index.neighbors_by_char(center)
+        assert index.to_path(groups['A']) == [(0, 2), (0, 0), (1, 1)]
+        assert 'B' not in groups
+        assert index.neighbors_by_char(center) is groups
+
+
+class TestParallelSearch:
+    """Test searches split across worker processes."""
+
+    def setup_method(self):
+        """Set up a word matrix."""
+        self.matrix = [
+            ['C', 'A', 'T', 'S'],
+            ['O', 'D', 'O', 'U'],
+            ['D', 'O', 'G', 'N'],
+            ['E', 'R', 'S', 'D']
+        ]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_parallel_path(self, engine):
+        """Test that a parallel search returns a valid path or None."""
+        path = find_string_with_path(self.matrix, "DOGS", engine, workers=2)
+        assert path is not None
+        assert ''.join(self.matrix[r][c] for r, c in path) == "DOGS"
+        assert find_string_with_path(self.matrix, "CATZ", engine, workers=2) is None
+        assert find_string_in_matrix(self.matrix, "CODE", engine, workers=2) == True
+
+    def test_parallel_batch(self):
+        """Test that a parallel batch search agrees with the in-process one."""
+        words = ["CAT", "DOG", "CODE", "COW", "SUN", "DOGS", "", "ZZZ"]
+        parallel = find_all_strings(self.matrix, words, workers=2)
+        serial = find_all_strings(self.matrix, words)
+        assert set(parallel) == set(words)
+        for word in words:
+            assert (parallel[word] is None) == (serial[word] is None)
+
+
+class TestLoadMatrix:
+    """Test loading grids from text files."""
+
+    def setup_method(self):
+        """Set up the expected matrix."""
+        self.matrix = [
+            ['C', 'A', 'T', 'S'],
+            ['O', 'D', 'O', 'U'],
+            ['D', 'O', 'G', 'N'],
+            ['E', 'R', 'S', 'D']
+        ]
+
+    @pytest.mark.parametrize("content", [b"CATS\nODOU\nDOGN\nERSD\n", b"CATS\r\nODOU\r\nDOGN\r\nERSD"])
+    def test_mapped_grid(self, tmp_path, content):
+        """Test that a mapped grid reads cells from the file with a row stride."""
+        path = tmp_path / "board.txt"
+        path.write_bytes(content)
+        with load_matrix(str(path)) as grid:
+            assert isinstance(grid, MappedGrid)
+            assert (grid.rows, grid.cols) == (4, 4)
+            assert grid.stride == content.index(b"\n") + 1
+            assert grid.to_matrix() == self.matrix
+            for engine in ENGINES:
+                for word in ["CAT", "DOGS", "CODE", "SUN", "ZZ", "\u00e9"]:
+                    assert find_string_with_path(grid, word, engine) == find_string_with_path(self.matrix, word, engine)
+            results = find_all_strings(grid, ["CAT", "CODE", "COW"])
+            assert results["CAT"] == [(0, 0), (0, 1), (0, 2)]
+            assert results["COW"] is None
+
+    def test_in_memory_grid(self, tmp_path):
+        """Test loading a grid into memory."""
+        path = tmp_path / "board.txt"
+        path.write_text("CATS\nODOU\nDOGN\nERSD\n")
+        grid = load_matrix(str(path), mmap=False)
+        assert not isinstance(grid, MappedGrid)
+        assert grid.to_matrix() == self.matrix
+
+    def test_ragged_file(self, tmp_path):
+        """Test that lines of different widths are rejected."""
+        path = tmp_path / "board.txt"
+        path.write_text("CATS\nODO\nDOGN\n")
+        with pytest.raises(ValueError):
+            load_matrix(str(path))
+
+    def test_non_ascii_file(self, tmp_path):
+        """Test that mapping a non-ASCII file is refused rather than misread."""
+        path = tmp_path / "board.txt"
+        path.write_text("\u00c4BC\n\u00d6EF\n", encoding='utf-8')
+        with pytest.raises(ValueError, match="mmap=False"):
+            load_matrix(str(path))
+        grid = load_matrix(str(path), mmap=False)
+        assert grid.to_matrix() == [['\u00c4', 'B', 'C'], ['\u00d6', 'E', 'F']]
+
+
+class TestIterStringPaths:
+    """Test lazy enumeration of all paths."""
+
+    def setup_method(self):
+        """Set up a matrix with repeated characters."""
+        self.repeat_matrix = [
+            ['A', 'A', 'B'],
+            ['A', 'B', 'A'],
+            ['B', 'A', 'A']
+        ]
+
+    def test_all_paths(self):
+        """Test that every distinct path is generated exactly once."""
+        paths = list(iter_string_paths(self.repeat_matrix, "AB"))
+        assert len(paths) == 8
+        assert len({tuple(path) for path in paths}) == 8
+        for path in paths:
+            assert ''.join(self.repeat_matrix[r][c] for r, c in path) == "AB"
+        assert sorted(iter_string_paths(self.repeat_matrix, "BA")) == sorted(path[::-1] for path in paths)
+
+    def test_limit(self):
+        """Test that generation stops after the limit."""
+        everything = list(iter_string_paths(self.repeat_matrix, "ABA"))
+        assert list(iter_string_paths(self.repeat_matrix, "ABA", limit=3)) == everything[:3]
+        assert list(iter_string_paths(self.repeat_matrix, "ABA", limit=0)) == []
+
+    def test_lazy(self):
+        """Test that paths are produced on demand."""
+        paths = iter_string_paths(self.repeat_matrix, "AAB")
+        first = next(paths)
+        assert ''.join(self.repeat_matrix[r][c] for r, c in first) == "AAB"
+
+    def test_edge_cases(self):
+        """Test empty inputs and strings that can't be found."""
+        assert list(iter_string_paths(self.repeat_matrix, "")) == [[]]
+        assert list(iter_string_paths([], "A")) == []
+        assert list(iter_string_paths(self.repeat_matrix, "BB")) == []
+        assert list(iter_string_paths(self.repeat_matrix, "C")) == []
+
+
+class TestCountStringOccurrences:
+    """Test counting paths by dynamic programming."""
+
+    def setup_method(self):
+        """Set up a matrix with repeated characters."""
+        self.repeat_matrix = [
+            ['A', 'A', 'B'],
+            ['A', 'B', 'A'],
+            ['B', 'A', 'A']
+        ]
+
+    def test_counts_match_enumeration(self):
+        """Test that simple counts match the number of enumerated paths."""
+        for word in ["A", "AB", "ABA", "AAB", "BAAB", "ABAB", "BB"]:
+            expected = len(list(iter_string_paths(self.repeat_matrix, word)))
+            assert count_string_occurrences(self.repeat_matrix, word, simple=True) == expected
+
+    def test_cell_reuse(self):
+        """Test that walks may revisit cells unless simple paths are requested."""
+        matrix = [['A', 'B']]
+        assert count_string_occurrences(matrix, "ABA") == 1
+        assert count_string_occurrences(matrix, "ABA", simple=True) == 0
+        # Without repeated characters at even distance, both counts agree
+        assert count_string_occurrences(self.repeat_matrix, "AB") == 8
+        assert count_string_occurrences(self.repeat_matrix, "AB", simple=True) == 8
+
+    def test_edge_cases(self):
+        """Test empty inputs and strings that can't be found."""
+        assert count_string_occurrences(self.repeat_matrix, "") == 1
+        assert count_string_occurrences([], "A") == 0
+        assert count_string_occurrences(self.repeat_matrix, "C") == 0
+        assert count_string_occurrences(self.repeat_matrix, "BB") == 0
+
+
+class TestSearchStats:
+    """Test per-query search statistics and hooks."""
+
+    def setup_method(self):
+        """Set up a word matrix."""
+        self.matrix = [
+            ['H', 'E', 'L', 'L', 'O'],
+            ['W', 'O', 'R', 'L', 'D'],
+            ['P', 'Y', 'T', 'H', 'O'],
+            ['N', 'A', 'L', 'G', 'N']
+        ]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_found(self, engine):
+        """Test statistics of a successful search."""
+        stats = SearchStats()
+        path = find_string_with_path(self.matrix, "PYTHON", engine, stats=stats)
+        assert path is not None
+        assert stats.engine == engine
+        assert stats.found == True
+        assert stats.rejected is None
+        assert stats.anchor_char in "PYTHON"
+        assert stats.start_positions >= 1
+        assert stats.nodes_expanded >= len("PYTHON") - 1
+        assert stats.elapsed > 0
+
+    def test_rejected(self):
+        """Test that upfront rejections are recorded."""
+        stats = SearchStats()
+        assert find_string_in_matrix(self.matrix, "HY", stats=stats) == False
+        assert stats.rejected == 'bigrams'
+        assert stats.nodes_expanded == 0
+        assert find_string_in_matrix(self.matrix, "EOE", engine='backtrack', stats=stats) == False
+        assert stats.rejected == 'char_counts'
+
+    def test_backtracks_counted(self):
+        """Test that dead ends are counted as backtracks."""
+        stats = SearchStats()
+        # Searched from the rarer B, trying the dead-end A on its right first
+        assert find_string_with_path([['A', 'A', 'B', 'A']], "AAB", engine='backtrack', stats=stats) == [(0, 0), (0, 1), (0, 2)]
+        assert stats.backtracks == 1
+        assert stats.anchor_char == 'B'
+
+    def test_hook(self):
+        """Test that the hook receives search events with positions and indices."""
+        events = []
+        stats = SearchStats(hook=lambda event, position, index: events.append((event, position, index)))
+        path = find_string_with_path(self.matrix, "WORLD", engine='backtrack', stats=stats)
+        assert events[0][0] == 'start'
+        expanded = [(position, index) for event, position, index in events if event == 'expand']
+        assert expanded[-len(path) + 1:] == list(zip(path, range(5)))[1:]
+        assert stats.as_dict()['found'] == True
+
+
+class TestFeasibilityPruning:
+    """Test the cheap impossibility checks run before searching."""
+
+    def setup_method(self):
+        """Set up an index over a small matrix."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['D', 'E', 'F'],
+            ['G', 'H', 'I']
+        ]
+        self.index = MatrixIndex(self.matrix)
+
+    def test_rejection_reasons(self):
+        """Test each kind of upfront rejection."""
+        index = MatrixIndex([['A', 'B'], ['B', 'A']])
+        assert index.rejection_reason("ABABA") == 'length'
+        assert index.rejection_reason("AAA") == 'char_counts'
+        # Both A cells share a colour, so they can't be one step apart
+        assert index.rejection_reason("AA") == 'parity'
+        assert self.index.rejection_reason("ACB") == 'parity'
+        assert self.index.rejection_reason("AE") == 'parity'
+        assert self.index.rejection_reason("AF") == 'bigrams'
+        assert self.index.rejection_reason("ABEF") is None
+
+    def test_colour_counts(self):
+        """Test counting characters per checkerboard colour."""
+        index = MatrixIndex([['A', 'A', 'B'], ['A', 'B', 'A']])
+        assert index.colour_counts('A') == (1, 3)
+        assert index.colour_counts('B') == (2, 0)
+        assert index.parity_options("BAB") == [0]
+        assert index.parity_options("AB") == [1]
+
+    def test_start_filter(self):
+        """Test that start positions far from a rare character are ruled out."""
+        matrix = [['X', 'A', 'A', 'A', 'A', 'A'],
+                  ['A', 'A', 'A', 'A', 'A', 'A'],
+                  ['A', 'A', 'A', 'A', 'A', 'Y']]
+        index = MatrixIndex(matrix)
+        admit = index._start_filter("AAX")
+        assert admit(index.grid.cell_id(0, 2), 0) == True
+        assert admit(index.grid.cell_id(1, 1), 0) == True
+        assert admit(index.grid.cell_id(2, 4), 0) == False
+        # Wrong colour for its string index
+        assert admit(index.grid.cell_id(0, 1), 0) == False
+        stats = SearchStats()
+        path = index.find_string_with_path("AAX", engine='backtrack', stats=stats)
+        assert path == [(0, 2), (0, 1), (0, 0)]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_results_unchanged(self, engine):
+        """Test that pruning keeps results for feasible strings."""
+        for word in ["ABC", "ADG", "ADE", "ABEF", "IFC", "ABEDGHIF"]:
+            path = self.index.find_string_with_path(word, engine)
+            assert path is not None
+            assert ''.join(self.matrix[r][c] for r, c in path) == word
+
+
+class TestBidirectionalSearch:
+    """Test the bidirectional engine growing both halves from an anchor."""
+
+    def test_anchor_prefers_rare_middle(self):
+        """Test that the anchor is a rare character or pair near the middle."""
+        index = MatrixIndex([['A', 'B', 'A', 'B', 'Z', 'B', 'A', 'B', 'A']])
+        assert index._choose_anchor(index.grid.encode("ABABZBABA")) == (4, 1)
+        # B is unique but near the end; the AB pair is as rare and more central
+        index = MatrixIndex([['Z', 'A', 'B', 'Z', 'A', 'A', 'A', 'A', 'Z']])
+        assert index._choose_anchor(index.grid.encode("AAABZ")) == (2, 2)
+
+    def test_finds_paths_around_anchor(self):
+        """Test that prefix and suffix paths are joined without sharing cells."""
+        matrix = [
+            ['A', 'A', 'A'],
+            ['A', 'Z', 'A'],
+            ['A', 'A', 'A']
+        ]
+        for word in ["AAZAA", "AAAAZ", "ZAAAA", "AAAAAZAA"]:
+            path = find_string_with_path(matrix, word, engine='bidirectional')
+            assert path is not None
+            assert len(set(path)) == len(path)
+            assert ''.join(matrix[r][c] for r, c in path) == word
+        # Z has only four neighbors, so both halves can't use more than four A cells
+        assert find_string_with_path(matrix, "AAAZAA", engine='bidirectional') is not None
+        assert find_string_with_path(matrix, "AAAAAZAAAA", engine='bidirectional') is None
+
+    def test_fewer_nodes_than_backtrack(self):
+        """Test that anchoring on a distinctive middle cuts the explored states."""
+        matrix = [['A'] * 12 for _ in range(12)]
+        matrix[6][6] = 'Z'
+        word = "A" * 8 + "Z" + "A" * 8
+        stats = {engine: SearchStats() for engine in ('backtrack', 'bidirectional')}
+        for engine, engine_stats in stats.items():
+            assert find_string_with_path(matrix, word, engine, stats=engine_stats) is not None
+        assert stats['bidirectional'].anchor_char == 'Z'
+        assert stats['bidirectional'].nodes_expanded < stats['backtrack'].nodes_expanded
+
+
+class TestSearchCache:
+    """Test the LRU cache of search results and indexes."""
+
+    def setup_method(self):
+        """Set up a small matrix."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['D', 'E', 'F'],
+            ['G', 'H', 'I']
+        ]
+
+    def test_fingerprint(self):
+        """Test that fingerprints follow the contents, not the object."""
+        fingerprint = matrix_fingerprint(self.matrix)
+        assert fingerprint[:2] == (3, 3)
+        assert matrix_fingerprint([row[:] for row in self.matrix]) == fingerprint
+        assert matrix_fingerprint(CompactGrid.from_matrix(self.matrix)) == fingerprint
+        assert matrix_fingerprint([['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']]) != fingerprint
+        changed = [row[:] for row in self.matrix]
+        changed[1][1] = 'X'
+        assert matrix_fingerprint(changed) != fingerprint
+        with pytest.raises(ValueError):
+            matrix_fingerprint([['A', 'B'], ['C']])
+
+    def test_hits_and_misses(self):
+        """Test that repeated queries, found or not, are answered from the cache."""
+        cache = SearchCache()
+        assert find_string_with_path(self.matrix, "ABC", cache=cache) == [(0, 0), (0, 1), (0, 2)]
+        assert find_string_in_matrix(self.matrix, "AEI", cache=cache) == False
+        assert cache.info() == {'hits': 0, 'misses': 2, 'evictions': 0, 'results': 2, 'indexes': 1}
+        # An equal copy of the board hits the same entries
+        copy = [row[:] for row in self.matrix]
+        assert find_string_with_path(copy, "ABC", cache=cache) == [(0, 0), (0, 1), (0, 2)]
+        assert find_string_in_matrix(copy, "AEI", cache=cache) == False
+        assert (cache.hits, cache.misses) == (2, 2)
+        # Another engine is a separate entry
+        cache.find_string_with_path(copy, "ABC", engine='backtrack')
+        assert (cache.hits, cache.misses, len(cache)) == (2, 3, 3)
+
+    def test_cached_path_is_copied(self):
+        """Test that changing a returned path doesn't change the cache."""
+        cache = SearchCache()
+        cache.find_string_with_path(self.matrix, "ABC").append((9, 9))
+        cache.find_string_with_path(self.matrix, "ABC").clear()
+        assert cache.find_string_with_path(self.matrix, "ABC") == [(0, 0), (0, 1), (0, 2)]
+
+    def test_stats_on_hit(self):
+        """Test that stats record the result of a cached lookup."""
+        cache = SearchCache()
+        stats = SearchStats()
+        cache.find_string_with_path(self.matrix, "ABC", stats=stats)
+        assert stats.nodes_expanded > 0
+        cache.find_string_with_path(self.matrix, "ABC", stats=stats)
+        assert stats.found == True
+        assert stats.nodes_expanded == 0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used results and indexes are dropped."""
+        cache = SearchCache(maxsize=2, max_indexes=1)
+        cache.find_string_in_matrix(self.matrix, "ABC")
+        cache.find_string_in_matrix(self.matrix, "DEF")
+        cache.find_string_in_matrix(self.matrix, "ABC")
+        cache.find_string_in_matrix(self.matrix, "GHI")
+        assert cache.evictions == 1
+        cache.find_string_in_matrix(self.matrix, "ABC")
+        assert cache.hits == 2
+        cache.find_string_in_matrix(self.matrix, "DEF")
+        assert cache.misses == 4
+        other = [['X', 'Y']]
+        index = cache.get_index(other)
+        assert cache.get_index([['X', 'Y']]) is index
+        assert cache.info()['indexes'] == 1
+
+    def test_changed_board(self):
+        """Test that a board changed in place is searched again."""
+        cache = SearchCache()
+        board = [row[:] for row in self.matrix]
+        assert cache.find_string_in_matrix(board, "ABX") == False
+        board[0][2] = 'X'
+        assert cache.find_string_in_matrix(board, "ABX") == True
+        assert cache.misses == 2
+
+    def test_invalidate(self):
+        """Test dropping the entries of one board or of all boards."""
+        cache = SearchCache()
+        other = [['X', 'Y']]
+        for word in ["ABC", "ADG", "AEI"]:
+            cache.find_string_in_matrix(self.matrix, word)
+        cache.find_string_in_matrix(other, "XY")
+        assert cache.invalidate(self.matrix) == 3
+        assert cache.info()['results'] == 1
+        assert cache.info()['indexes'] == 1
+        cache.find_string_in_matrix(other, "XY")
+        assert cache.hits == 1
+        assert cache.invalidate() == 1
+        assert len(cache) == 0
+
+
+class TestMutableIndex:
+    """Test incremental index updates for boards that change."""
+
+    def setup_method(self):
+        """Set up a small matrix."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['D', 'E', 'F'],
+            ['G', 'H', 'I']
+        ]
+
+    def test_mutable_grid(self):
+        """Test changing cells of a mutable grid."""
+        grid = MutableGrid.from_matrix(self.matrix)
+        assert grid.set_cell(1, 1, 'X') == 'E'
+        assert grid[1] == "DXF"
+        assert grid.find_cells('X') == [4]
+        assert find_string_in_matrix(grid, "BXH") == True
+        with pytest.raises(IndexError):
+            grid.set_cell(3, 0, 'X')
+        with pytest.raises(ValueError):
+            grid.set_cell(0, 0, 'XY')
+
+    def test_copies_matrix(self):
+        """Test that the index doesn't change the matrix it was built from."""
+        index = MutableIndex(self.matrix)
+        index.set_cell(0, 0, 'Z')
+        assert self.matrix[0][0] == 'A'
+        assert index.grid[0] == "ZBC"
+
+    def test_tables_follow_edits(self):
+        """Test that lookup tables match a freshly built index after edits."""
+        index = MutableIndex(self.matrix)
+        # Build the tables before editing
+        index.get_char_positions('A')
+        index.get_char_positions('E')
+        index.bigram_counts
+        index.colour_counts('A')
+        index.neighbors_by_char(1)
+        index.set_cell(1, 1, 'A')
+        index.set_cell(0, 0, 'E')
+        fresh = MatrixIndex(index.grid.to_matrix())
+        assert index.get_char_positions('A') == [(1, 1)]
+        assert index.get_char_positions('E') == [(0, 0)]
+        assert index.bigram_counts == fresh.bigram_counts
+        assert ('A', 'E') not in index.bigram_counts
+        assert index.colour_counts('A') == fresh.colour_counts('A')
+        assert index.neighbors_by_char(1) == fresh.neighbors_by_char(1)
+
+    def test_results_follow_edits(self):
+        """Test that searches see edits, including for cached results."""
+        index = MutableIndex(self.matrix)
+        assert index.find_string_with_path("ABC") == [(0, 0), (0, 1), (0, 2)]
+        assert index.find_string_in_matrix("AXC") == False
+        index.set_cell(0, 1, 'X')
+        assert index.find_string_in_matrix("ABC") == False
+        assert index.find_string_with_path("AXC") == [(0, 0), (0, 1), (0, 2)]
+        assert index.hits == 0
+
+    def test_invalidates_only_affected_results(self):
+        """Test that an edit keeps cached results it can't affect."""
+        index = MutableIndex(self.matrix)
+        index.find_string_in_matrix("ABC")
+        index.find_string_in_matrix("GHI")
+        index.find_string_in_matrix("AXC")
+        index.find_string_in_matrix("IXG")
+        # Only the path through the cell and the miss that fits around it go
+        assert index.set_cell(0, 1, 'X') == 2
+        assert index.info()['results'] == 2
+        index.find_string_in_matrix("GHI")
+        index.find_string_in_matrix("IXG")
+        assert index.hits == 2
+        # Setting a cell to its current character changes nothing
+        assert index.set_cell(0, 1, 'X') == 0
+
+    def test_eviction(self):
+        """Test that the result cache stays within maxsize."""
+        index = MutableIndex(self.matrix, maxsize=1)
+        index.find_string_in_matrix("ABC")
+        index.find_string_in_matrix("AXC")
+        assert index.info() == {'hits': 0, 'misses': 2, 'evictions': 1, 'results': 1}
+        assert index.set_cell(0, 1, 'Y') == 0
+
+
+class GatedExecutor(ThreadPoolExecutor):
+    """Thread pool counting submitted searches and holding them until opened."""
+
+    def __init__(self):
+        super().__init__(max_workers=4)
+        self.submitted = 0
+        self.gate = threading.Event()
+
+    def submit(self, fn, *args, **kwargs):
+        if fn is string_finder.matrix_fingerprint:
+            return super().submit(fn, *args, **kwargs)
+        self.submitted += 1
+
+        def gated():
+            self.gate.wait(5)
+            return fn(*args, **kwargs)
+
+        return super().submit(gated)
+
+
+class TestAsyncSearchService:
+    """Test the asyncio front end."""
+
+    def setup_method(self):
+        """Set up a small matrix."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['D', 'E', 'F'],
+            ['G', 'H', 'I']
+        ]
+
+    def test_module_functions(self):
+        """Test the module-level async functions with the shared service."""
+        assert asyncio.run(async_find_string_with_path(self.matrix, "ABC")) == [(0, 0), (0, 1), (0, 2)]
+        assert asyncio.run(async_find_string_with_path(self.matrix, "AEI")) is None
+        results = asyncio.run(async_find_all_strings(self.matrix, ["ADG", "AEI", "ADG"]))
+        assert results == {"ADG": [(0, 0), (1, 0), (2, 0)], "AEI": None}
+
+    def test_unknown_engine(self):
+        """Test that an unknown engine is rejected before queueing."""
+        with pytest.raises(ValueError):
+            asyncio.run(async_find_string_with_path(self.matrix, "AB", engine='quantum'))
+
+    def test_coalesces_identical_queries(self):
+        """Test that identical in-flight queries share one search."""
+        executor = GatedExecutor()
+
+        async def run():
+            async with AsyncSearchService(executor) as service:
+                queries = [service.find_string_with_path([row[:] for row in self.matrix], "ABC")
+                           for _ in range(5)]
+                queries.append(service.find_string_with_path(self.matrix, "ADG"))
+                queries = asyncio.gather(*queries)
+                await asyncio.sleep(0.01)
+                executor.gate.set()
+                return await queries
+
+        paths = asyncio.run(run())
+        executor.shutdown()
+        assert paths[:5] == [[(0, 0), (0, 1), (0, 2)]] * 5
+        assert paths[0] is not paths[1]
+        assert executor.submitted == 2
+
+    def test_timeout_and_cancellation(self):
+        """Test that a caller timing out doesn't affect others sharing the query."""
+        executor = GatedExecutor()
+
+        async def run():
+            async with AsyncSearchService(executor) as service:
+                waiting = asyncio.ensure_future(service.find_string_with_path(self.matrix, "ABC"))
+                with pytest.raises(asyncio.TimeoutError):
+                    await service.find_string_with_path(self.matrix, "ABC", timeout=0.01)
+                assert not waiting.done()
+                executor.gate.set()
+                assert await waiting == [(0, 0), (0, 1), (0, 2)]
+                # A cancelled query nobody else waits for is dropped
+                executor.gate.clear()
+                query = asyncio.ensure_future(service.find_string_with_path(self.matrix, "ADG"))
+                await asyncio.sleep(0.01)
+                assert service.pending == 1
+                query.cancel()
+                await asyncio.sleep(0)
+                assert service.pending == 0
+                executor.gate.set()
+
+        asyncio.run(run())
+        executor.shutdown()
+
+    def test_board_keys(self, monkeypatch):
+        """Test that boards are fingerprinted off the event loop, or keyed by the caller."""
+        threads = []
+
+        def fingerprint(matrix):
+            threads.append(threading.current_thread())
+            return matrix_fingerprint(matrix)
+
+        monkeypatch.setattr(string_finder, 'matrix_fingerprint', fingerprint)
+        executor = GatedExecutor()
+
+        async def run():
+            async with AsyncSearchService(executor) as service:
+                results = await service.find_all_strings(self.matrix, ["ABC", "ADG", "AEI"])
+                assert len(threads) == 1
+                assert threads[0] is not threading.current_thread()
+                # Equal keys share a search even for different matrices
+                executor.gate.clear()
+                queries = asyncio.gather(service.find_string_with_path(self.matrix, "ABC", board_key='board'),
+                                         service.find_string_with_path([], "ABC", board_key='board'))
+                await asyncio.sleep(0.01)
+                executor.gate.set()
+                return results, await queries
+
+        executor.gate.set()
+        results, shared = asyncio.run(run())
+        executor.shutdown()
+        assert results == {"ABC": [(0, 0), (0, 1), (0, 2)], "ADG": [(0, 0), (1, 0), (2, 0)], "AEI": None}
+        assert shared == [[(0, 0), (0, 1), (0, 2)]] * 2
+        assert len(threads) == 1
+        assert executor.submitted == 4
+
+    def test_backpressure(self):
+        """Test that callers wait for room once the queue is full."""
+        executor = GatedExecutor()
+
+        async def run():
+            async with AsyncSearchService(executor, concurrency=1, max_pending=1) as service:
+                first = asyncio.ensure_future(service.find_string_with_path(self.matrix, "ABC"))
+                second = asyncio.ensure_future(service.find_string_with_path(self.matrix, "ADG"))
+                await asyncio.sleep(0.01)
+                # The worker holds the first query and the second fills the queue
+                assert executor.submitted == 1
+                assert service._queue.full()
+                with pytest.raises(asyncio.TimeoutError):
+                    await service.find_string_with_path(self.matrix, "GHI", timeout=0.01)
+                executor.gate.set()
+                return await first, await second
+
+        assert asyncio.run(run()) == ([(0, 0), (0, 1), (0, 2)], [(0, 0), (1, 0), (2, 0)])
+        executor.shutdown()
+
+
+class TestCommandLine:
+    """Test the command-line entry point."""
+
+    def setup_method(self):
+        """Set up the rows of a grid file."""
+        self.rows = ["HELLO", "WORLD", "PYTHO", "NALGN"]
+
+    def write_files(self, tmp_path, words):
+        """Write the grid and word list files."""
+        grid_path = tmp_path / "board.txt"
+        grid_path.write_text("\n".join(self.rows) + "\n")
+        words_path = tmp_path / "words.txt"
+        words_path.write_text("\n".join(words) + "\n")
+        return str(grid_path), str(words_path)
+
+    def run(self, capsys, argv):
+        """Run the CLI and parse its JSON Lines output."""
+        assert main(argv) == 0
+        return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    def test_search_word_file(self, tmp_path, capsys):
+        """Test searching a word list in input order, duplicates included."""
+        grid, words = self.write_files(tmp_path, ["HELLO", "XYZ", "", "HWPN", "HELLO"])
+        results = self.run(capsys, ["search", "--grid", grid, "--words", words, "--batch-size", "2"])
+        assert [result['word'] for result in results] == ["HELLO", "XYZ", "HWPN", "HELLO"]
+        assert results[0] == {'word': "HELLO", 'found': True,
+                              'path': [[0, 0], [0, 1], [0, 2], [0, 3], [0, 4]]}
+        assert results[1] == {'word': "XYZ", 'found': False, 'path': None}
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_stdin_found_only(self, tmp_path, capsys, monkeypatch, engine):
+        """Test reading words from stdin and filtering out misses."""
+        grid, _ = self.write_files(tmp_path, [])
+        monkeypatch.setattr('sys.stdin', io.StringIO("WORLD\nQQQ\nHWPN\n"))
+        results = self.run(capsys, ["search", "--grid", grid, "--engine", engine, "--found-only", "--no-mmap"])
+        assert [result['word'] for result in results] == ["WORLD", "HWPN"]
+        assert all(result['found'] for result in results)
+
+    def test_workers(self, tmp_path, capsys):
+        """Test that a worker pool keeps the input order."""
+        words = ["HELLO", "WORLD", "XYZ", "HWPN", "PYTHO", "NALGN"] * 3
+        grid, words_path = self.write_files(tmp_path, words)
+        results = self.run(capsys, ["search", "--grid", grid, "--words", words_path,
+                                    "--workers", "2", "--batch-size", "2"])
+        assert [result['word'] for result in results] == words
+
+    def test_errors(self, tmp_path, capsys):
+        """Test that a missing grid file is reported."""
+        assert main(["search", "--grid", str(tmp_path / "missing.txt")]) == 1
+        assert "missing.txt" in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            main(["search"])
+
+    def test_non_ascii_grid(self, tmp_path, capsys):
+        """Test that a UTF-8 grid is read as text rather than mapped byte by byte."""
+        grid_path = tmp_path / "board.txt"
+        grid_path.write_text("\u00c4BC\n\u00d6EF\n", encoding='utf-8')
+        words_path = tmp_path / "words.txt"
+        words_path.write_text("\u00c4\u00d6\nBC\n", encoding='utf-8')
+        results = self.run(capsys, ["search", "--grid", str(grid_path), "--words", str(words_path)])
+        assert results == [{'word': "\u00c4\u00d6", 'found': True, 'path': [[0, 0], [1, 0]]},
+                           {'word': "BC", 'found': True, 'path': [[0, 1], [0, 2]]}]
+
+        grid_path.write_text("\u00c4BC\n\u00d6E\n", encoding='utf-8')
+        assert main(["search", "--grid", str(grid_path), "--words", str(words_path)]) == 1
+        assert "board.txt" in capsys.readouterr().err
+
+    def test_demo(self, capsys):
+        """Test that running without arguments shows the demo."""
+        assert main([]) == 0
+        assert "Found 'HELLO'" in capsys.readouterr().out
+
+
+class TestIndexFiles:
+    """Test saving and loading prebuilt indexes."""
+
+    def setup_method(self):
+        """Set up a matrix and some words."""
+        self.matrix = [
+            ['A', 'B', 'C', 'E'],
+            ['S', 'F', 'C', 'S'],
+            ['A', 'D', 'E', 'E']
+        ]
+        self.words = ["ABCCED", "SEE", "ABCB", "ASA", "FCS", "XYZ", "E"]
+
+    def assert_same_results(self, loaded, matrix):
+        """Check that a loaded index answers like a freshly built one."""
+        fresh = MatrixIndex(matrix)
+        for word in self.words:
+            for engine in ENGINES:
+                assert loaded.find_string_with_path(word, engine) == fresh.find_string_with_path(word, engine)
+            assert loaded.count_string_occurrences(word) == fresh.count_string_occurrences(word)
+        assert loaded.find_all_strings(self.words) == fresh.find_all_strings(self.words)
+
+    def test_round_trip(self, tmp_path):
+        """Test that a loaded index keeps the tables and answers of the original."""
+        path = str(tmp_path / "board.idx")
+        index = MatrixIndex(self.matrix)
+        save_index(index, path)
+        loaded = load_index(path)
+        assert loaded.source == path
+        assert loaded.grid.to_matrix() == self.matrix
+        # Position lists and neighbors are used in place from the mapped file
+        assert isinstance(loaded.positions['E'], memoryview)
+        assert list(loaded.positions['E']) == index.positions['E']
+        assert list(loaded.adjacency[5]) == list(index.adjacency[5])
+        assert loaded.bigram_counts == index.bigram_counts
+        assert loaded.colour_counts('C') == index.colour_counts('C')
+        self.assert_same_results(loaded, self.matrix)
+
+    def test_unicode_and_mapped_grids(self, tmp_path):
+        """Test cells outside Latin-1 and grids mapped from text files."""
+        matrix = [row[:] for row in self.matrix]
+        matrix[0][0] = '\u0416'
+        save_index(MatrixIndex(matrix), str(tmp_path / "unicode.idx"))
+        loaded = load_index(str(tmp_path / "unicode.idx"))
+        assert loaded.find_string_with_path("\u0416BC") == [(0, 0), (0, 1), (0, 2)]
+
+        grid_path = tmp_path / "board.txt"
+        grid_path.write_bytes(b"ABCE\r\nSFCS\r\nADEE\r\n")
+        with load_matrix(str(grid_path)) as grid:
+            save_index(MatrixIndex(grid), str(tmp_path / "mapped.idx"))
+        loaded = load_index(str(tmp_path / "mapped.idx"))
+        assert loaded.grid.stride == 6
+        self.assert_same_results(loaded, self.matrix)
+
+    def test_parallel_workers_load_file(self, tmp_path):
+        """Test that worker processes serve queries from the index file."""
+        path = str(tmp_path / "board.idx")
+        save_index(MatrixIndex(self.matrix), path)
+        loaded = load_index(path)
+        assert loaded._worker_args(None) == (None, None, path)
+        assert loaded.find_string_with_path("ABCCED", 'backtrack', workers=2) is not None
+
+    def test_invalid_files(self, tmp_path):
+        """Test that foreign, corrupt and truncated files are rejected."""
+        path = tmp_path / "board.idx"
+        save_index(MatrixIndex(self.matrix), str(path))
+        data = bytearray(path.read_bytes())
+        data[-20] ^= 0xFF
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="checksum"):
+            load_index(str(path))
+        # Skipping the check trusts the file
+        load_index(str(path), verify=False)
+        path.write_bytes(b"ABCE\nSFCS\n" * 20)
+        with pytest.raises(ValueError, match="not a string finder index"):
+            load_index(str(path))
+        path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            load_index(str(path))
+
+
+class TestRelaxedReachability:
+    """Test the relaxed reachability pre-filter and the frontier engine."""
+
+    def setup_method(self):
+        """Set up a small matrix."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['D', 'E', 'F'],
+            ['G', 'H', 'I']
+        ]
+
+    def test_relaxed_allows_revisits(self):
+        """Test that relaxed walks may reuse cells, unlike paths."""
+        matrix = [['A', 'B']]
+        assert find_string_relaxed(matrix, "ABABA") == True
+        assert find_string_in_matrix(matrix, "ABABA", engine='backtrack') == False
+        assert find_string_relaxed(matrix, "AA") == False
+        assert find_string_relaxed(self.matrix, "AEI") == False
+        assert find_string_relaxed(self.matrix, "") == True
+        assert find_string_relaxed([], "A") == False
+
+    def test_relaxed_starts(self):
+        """Test that only cells able to begin a walk are kept."""
+        matrix = [
+            ['A', 'B', 'A'],
+            ['A', 'C', 'A'],
+            ['A', 'A', 'B']
+        ]
+        index = MatrixIndex(matrix)
+        assert index.to_path(index.relaxed_starts("AB")) == [(0, 0), (0, 2), (1, 2), (2, 1)]
+        assert index.to_path(index.relaxed_starts("ABA")) == [(0, 0), (0, 2), (1, 2), (2, 1)]
+        assert index.relaxed_starts("CB") == [4]
+        assert index.relaxed_starts("BCB") == [1]
+
+    def test_frontier_engine_stats(self):
+        """Test that the frontier engine reports narrowed and rejected starts."""
+        stats = SearchStats()
+        matrix = [['B', 'C', 'B', 'C'], ['A', 'C', 'C', 'A']]
+        assert find_string_with_path(matrix, "BA", engine='frontier', stats=stats) == [(0, 0), (1, 0)]
+        # The B without an A next to it is never tried
+        assert stats.start_positions == 1
+        assert stats.pruned >= 1
+        stats = SearchStats()
+        matrix = [['B', 'C', 'A'], ['B', 'B', 'A']]
+        assert find_string_in_matrix(matrix, "BCAB", engine='frontier', stats=stats) == False
+        assert stats.rejected == 'relaxed'
+        assert stats.nodes_expanded == 0
+
+    def test_numpy_matches_sets(self, tmp_path):
+        """Test that vectorized propagation matches the per-cell sets."""
+        pytest.importorskip("numpy")
+        import random
+        rng = random.Random(20)
+        matrix = [[rng.choice("ABC") for _ in range(17)] for _ in range(13)]
+        grid_path = tmp_path / "board.txt"
+        grid_path.write_text("\n".join(''.join(row) for row in matrix))
+        indexes = [MatrixIndex(matrix), MatrixIndex(load_matrix(str(grid_path)))]
+        for _ in range(50):
+            word = ''.join(rng.choice("ABC") for _ in range(rng.randint(1, 8)))
+            for index in indexes:
+                encoded = index.grid.encode(word)
+                assert (index.relaxed_starts(encoded, vectorized=True) ==
+                        index.relaxed_starts(encoded, vectorized=False))
+        mutable = MutableIndex(matrix)
+        mutable.code_array()
+        mutable.set_cell(0, 0, 'Z')
+        assert mutable.relaxed_starts("ZA", vectorized=True) == mutable.relaxed_starts("ZA", vectorized=False)
+
+
+class TestPatternSearch:
+    """Test wildcard pattern search."""
+
+    def setup_method(self):
+        """Set up a small matrix."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['D', 'E', 'F'],
+            ['G', 'H', 'I']
+        ]
+
+    def assert_matches(self, matrix, path, text):
+        """Check that a path is a valid path spelling the given text."""
+        assert len(set(path)) == len(path)
+        assert all(abs(r1 - r2) + abs(c1 - c2) == 1 for (r1, c1), (r2, c2) in zip(path, path[1:]))
+        assert ''.join(matrix[r][c] for r, c in path) == text
+
+    def test_compile_pattern(self):
+        """Test the tokens a pattern compiles to."""
+        assert compile_pattern("A?*[B-DX]").tokens == (
+            ('char', 'A'), ('any',), ('star',), ('class', (('B', 'D'), ('X', 'X')), False))
+        assert compile_pattern("A**B").tokens == (('char', 'A'), ('star',), ('char', 'B'))
+        assert compile_pattern(r"[^]A]\\*").tokens == (
+            ('class', ((']', ']'), ('A', 'A')), True), ('char', '\\'), ('star',))
+        assert compile_pattern("\\?").tokens == (('char', '?'),)
+        assert compile_pattern("A*?B").min_length == 3
+        with pytest.raises(ValueError):
+            compile_pattern("[AB")
+        with pytest.raises(ValueError):
+            compile_pattern("AB\\")
+
+    def test_single_wildcards(self):
+        """Test ? and character classes."""
+        assert find_pattern_with_path(self.matrix, "A?C") == [(0, 0), (0, 1), (0, 2)]
+        assert find_pattern_with_path(self.matrix, "A[D-F]I") is None
+        assert find_pattern_with_path(self.matrix, "A[^B]G") == [(0, 0), (1, 0), (2, 0)]
+        assert find_pattern_with_path(self.matrix, "[XYZ]") is None
+        assert find_pattern_with_path(self.matrix, "???") is not None
+        assert find_pattern_with_path(self.matrix, "?" * 10) is None
+
+    def test_star(self):
+        """Test that stars match runs of any length, including none."""
+        path = find_pattern_with_path(self.matrix, "A*I")
+        assert path[0] == (0, 0) and path[-1] == (2, 2)
+        assert find_pattern_with_path(self.matrix, "AB*C") == [(0, 0), (0, 1), (0, 2)]
+        path = find_pattern_with_path(self.matrix, "G*C*E")
+        assert [self.matrix[r][c] for r, c in path][::len(path) - 1] == ['G', 'E']
+        self.assert_matches(self.matrix, path, ''.join(self.matrix[r][c] for r, c in path))
+        # Reaching E after C would need cells the walk from G already used
+        assert find_pattern_with_path([['G', 'E', 'C']], "G*C*E") is None
+        # Only matched when the star takes a longer way out than the shortest one
+        matrix = [['A', 'B'], ['A', 'A'], ['C', 'C'], ['B', 'B']]
+        path = find_pattern_with_path(matrix, "A*?A[AB][AB]")
+        self.assert_matches(matrix, path, ''.join(matrix[r][c] for r, c in path))
+        assert len(path) == 6
+        assert find_pattern_with_path(self.matrix, "*") == []
+        assert find_pattern_with_path(self.matrix, "") == []
+        assert find_pattern_with_path([], "A") is None
+
+    def test_escapes_and_grids(self, tmp_path):
+        """Test escaped wildcards and bytes and memory-mapped grids."""
+        matrix = [['*', '?'], ['A', 'B']]
+        assert find_pattern_with_path(matrix, r"\*\?") == [(0, 0), (0, 1)]
+        assert find_pattern_with_path(matrix, r"\?\*B") is None
+        grid_path = tmp_path / "board.txt"
+        grid_path.write_text("ABC\nDEF\nGHI\n")
+        for grid in (CompactGrid(b"ABCDEFGHI", 3, 3), load_matrix(str(grid_path))):
+            assert find_pattern_with_path(grid, "[A-B]?[^A]") == [(0, 0), (0, 1), (0, 2)]
+            assert find_pattern_with_path(grid, "H*\u00e9") is None
+
+    def test_matches_paths(self):
+        """Test found paths against the pattern on a larger matrix."""
+        import random
+        import re
+        rng = random.Random(21)
+        matrix = [[rng.choice("ABCD") for _ in range(8)] for _ in range(8)]
+        for pattern in ["A?B", "AB*DC", "[AB]*[CD]?A", "D[^D]*D", "????*??"]:
+            path = find_pattern_with_path(matrix, pattern)
+            assert path is not None
+            text = ''.join(matrix[r][c] for r, c in path)
+            regex = pattern.replace('?', '.').replace('*', '.*')
+            assert re.fullmatch(regex, text)
+            self.assert_matches(matrix, path, text)
+
+    def test_boxed_in_anchor_does_not_stall(self):
+        """Test that an anchor whose prefixes all block its suffix doesn't hold up the search."""
+        import random
+        import re
+        import time
+        rng = random.Random(3)
+        letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        for size in (30, 60):
+            matrix = [[rng.choice(letters) for _ in range(size)] for _ in range(size)]
+        started = time.perf_counter()
+        path = find_pattern_with_path(matrix, "A*B*C*D*E*F")
+        assert time.perf_counter() - started < 5
+        text = ''.join(matrix[r][c] for r, c in path)
+        assert re.fullmatch("A.*B.*C.*D.*E.*F", text)
+        self.assert_matches(matrix, path, text)
+
+    def test_small_anchor_budget(self, monkeypatch):
+        """Test that anchors running out of budget are retried until the search can tell."""
+        patterns = ["A*I*C", "B*H*D*F", "E*A*I", "?*?*?*?*?*?*?*?*?", "?*?*?*?*?*?*?*?*?*?"]
+        expected = [find_pattern_with_path(self.matrix, pattern) is None for pattern in patterns]
+        monkeypatch.setattr(string_finder, 'PATTERN_ANCHOR_NODES', 1)
+        assert [find_pattern_with_path(self.matrix, pattern) is None for pattern in patterns] == expected
+        matrix = [['A', 'B'], ['A', 'A'], ['C', 'C'], ['B', 'B']]
+        path = find_pattern_with_path(matrix, "A*?A[AB][AB]")
+        self.assert_matches(matrix, path, ''.join(matrix[r][c] for r, c in path))
+
+    def test_missing_segment_is_rejected_early(self):
+        """Test that a run between stars that can't be spelled fails fast."""
+        matrix = [['AB'[(row + col) % 2] for col in range(100)] for row in range(100)]
+        assert find_pattern_with_path(matrix, "A*B*AA*B") is None
+
+
+class TestTiledSearch:
+    """Test searching grids one tile at a time."""
+
+    def setup_method(self):
+        """Set up a matrix with words crossing tile boundaries."""
+        self.matrix = [
+            ['C', 'A', 'T', 'S', 'X'],
+            ['O', 'X', 'X', 'E', 'X'],
+            ['D', 'O', 'G', 'A', 'X'],
+            ['E', 'X', 'X', 'L', 'X']
+        ]
+
+    def test_region(self):
+        """Test copying rectangles of each kind of grid."""
+        assert CompactGrid.from_matrix(self.matrix).region(1, 2, 2, 3).to_matrix() == [
+            ['X', 'E', 'X'], ['G', 'A', 'X']]
+        grid = CompactGrid(b"AB\r\nCD\r\n", 2, 2, 4)
+        assert grid.region(0, 1, 2, 1).cells == b"BD"
+        assert MutableGrid.from_matrix(self.matrix).region(3, 0, 1, 2).cells == "EX"
+        assert CompactGrid.from_matrix(self.matrix).region(0, 0, 0, 0).rows == 0
+        with pytest.raises(IndexError):
+            CompactGrid.from_matrix(self.matrix).region(3, 0, 2, 1)
+
+    def test_tiles_match_whole_grid(self):
+        """Test that paths crossing tiles are found in grid coordinates."""
+        for word in ["CATS", "CODE", "SEAL", "DOGA", "CATSEAGOD", "XXXXX", "ZEBRA"]:
+            expected = find_string_with_path(self.matrix, word, 'backtrack')
+            for tile_size in (1, 2, 3, 10):
+                path = find_string_tiled(self.matrix, word, tile_size, 'backtrack')
+                assert (path is None) == (expected is None), (word, tile_size)
+                if path is not None:
+                    assert ''.join(self.matrix[r][c] for r, c in path) == word
+                    assert len(set(path)) == len(path)
+        # The default engine is exhaustive, so tiles never yield invalid paths
+        matrix = [['D', 'C'], ['C', 'B'], ['B', 'C']]
+        assert find_string_tiled(matrix, "CDCB", 4) == find_string_with_path(matrix, "CDCB", 'backtrack')
+        assert find_string_tiled(self.matrix, "", 2) == []
+        assert find_string_tiled([], "A", 2) is None
+        with pytest.raises(ValueError):
+            find_string_tiled(self.matrix, "CAT", 0)
+
+    def test_tiles_leave_adjacency_cache_alone(self):
+        """Test that tile neighbor tables aren't kept in the shared cache."""
+        get_adjacency.cache_clear()
+        find_string_tiled(self.matrix, "ZEBRA", 2)
+        assert get_adjacency.cache_info().currsize == 0
+
+    def test_tile_adjacency_per_shape(self, monkeypatch):
+        """Test that each tile shape gets its neighbor table built once per search."""
+        shapes = []
+
+        class CountingAdjacency(string_finder.Adjacency):
+            def __init__(self, rows, cols, stride=None):
+                shapes.append((rows, cols))
+                super().__init__(rows, cols, stride)
+
+        monkeypatch.setattr(string_finder, 'Adjacency', CountingAdjacency)
+        matrix = [['X'] * 12 for _ in range(12)]
+        assert find_string_tiled(matrix, "XXY", 2) is None
+        assert 0 < len(shapes) == len(set(shapes)) < 36
+
+    def test_grid_file(self, tmp_path):
+        """Test searching a grid file in tiles, in-process and in workers."""
+        grid_path = tmp_path / "board.txt"
+        grid_path.write_text("\n".join(''.join(row) for row in self.matrix) + "\n")
+        assert find_string_tiled(str(grid_path), "SEAL", 2) == [(0, 3), (1, 3), (2, 3), (3, 3)]
+        path = find_string_tiled(str(grid_path), "CODE", 2, workers=2)
+        assert path == [(0, 0), (1, 0), (2, 0), (3, 0)]
+        assert find_string_tiled(str(grid_path), "ZEBRA", 2, workers=2) is None
+
+
+class TestSearchBudget:
+    """Test searches bounded by a timeout or node budget."""
+
+    def setup_method(self):
+        """Set up a simple matrix and a board where most searches are hopeless."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['D', 'E', 'F'],
+            ['G', 'H', 'I']
+        ]
+        self.hard_matrix = [['A'] * 8 for _ in range(8)]
+        self.hard_matrix[0][1] = self.hard_matrix[1][0] = 'B'
+        self.hard_word = 'A' * 30 + 'B' + 'A' * 31 + 'B'
+
+    def assert_partial(self, matrix, word, result):
+        """Check that the partial path of a result spells its part of the word."""
+        path, index = result.partial_path, result.partial_index
+        assert len(set(path)) == len(path)
+        assert all(abs(r1 - r2) + abs(c1 - c2) == 1 for (r1, c1), (r2, c2) in zip(path, path[1:]))
+        assert ''.join(matrix[r][c] for r, c in path) == word[index:index + len(path)]
+
+    def test_found_and_not_found(self):
+        """Test definite results within the budget."""
+        for engine in ENGINES:
+            result = find_string_with_path(self.matrix, "ABEH", engine, max_nodes=1000)
+            assert result.status == 'found' and result.found
+            assert result.path == find_string_with_path(self.matrix, "ABEH", engine)
+            assert result.partial_path == result.path
+            result = find_string_with_path(self.matrix, "ABI", engine, timeout=10)
+            assert result.status == 'not_found' and result.path is None
+        result = find_string_in_matrix(self.matrix, "ADG", timeout=10)
+        assert isinstance(result, SearchResult) and result.found
+        for index in (MatrixIndex(self.matrix), MutableIndex(self.matrix)):
+            assert index.find_string_in_matrix("ADG", 'backtrack', timeout=10).found
+            assert index.find_string_in_matrix("ABI", max_nodes=1000).status == 'not_found'
+            assert index.find_string_in_matrix("ADG") is True
+
+    def test_greedy_verdicts(self):
+        """Test that greedy misses and invalid greedy paths are left undetermined."""
+        matrix = [['A', 'B', 'A', 'B', 'B'], ['A', 'B', 'D', 'B', 'B'], ['C', 'A', 'A', 'C', 'C']]
+        assert find_string_with_path(matrix, "ABDAA", 'backtrack') is not None
+        assert find_string_with_path(matrix, "ABDAA", timeout=5).status == 'undetermined'
+        matrix = [['A', 'B', 'A', 'A', 'A'], ['A', 'B', 'A', 'B', 'A'], ['B', 'A', 'A', 'B', 'B'],
+                  ['A', 'A', 'A', 'B', 'A'], ['B', 'B', 'B', 'B', 'B']]
+        assert find_string_with_path(matrix, "AABBBBAB", timeout=5).status == 'undetermined'
+        # Results cached by an unbounded search are judged the same way
+        index = MutableIndex(matrix)
+        index.find_string_with_path("AABBBBAB")
+        result = index.find_string_with_path("AABBBBAB", max_nodes=1000)
+        assert result.status == 'undetermined' and result.path is None
+        # Strings rejected before searching are still proven absent
+        assert find_string_with_path(matrix, "AZ", timeout=5).status == 'not_found'
+
+    def test_node_budget(self):
+        """Test that an exhausted node budget leaves the result undetermined."""
+        for engine in ('backtrack', 'bidirectional'):
+            stats = SearchStats()
+            result = find_string_with_path(self.hard_matrix, self.hard_word, engine,
+                                           stats=stats, max_nodes=500)
+            assert result.status == 'undetermined' and result.path is None
+            assert len(result.partial_path) > 1
+            self.assert_partial(self.hard_matrix, self.hard_word, result)
+            assert stats.nodes_expanded <= 501
+            assert not stats.found
+
+    def test_timeout(self):
+        """Test that a search stops soon after its deadline."""
+        import time
+        started = time.perf_counter()
+        result = find_string_with_path(self.hard_matrix, self.hard_word, 'backtrack', timeout=0.05)
+        assert result.status == 'undetermined'
+        assert time.perf_counter() - started < 1
+        self.assert_partial(self.hard_matrix, self.hard_word, result)
+
+    def test_hooks_and_workers(self):
+        """Test that the caller's hook still sees events and budgets need in-process searches."""
+        events = []
+        stats = SearchStats(hook=lambda *event: events.append(event))
+        find_string_with_path(self.matrix, "ABC", 'backtrack', stats=stats, max_nodes=100)
+        assert events[0] == ('start', (0, 0), 0)
+        assert stats.hook is not None and stats.found
+        with pytest.raises(ValueError):
+            find_string_with_path(self.matrix, "ABC", workers=2, timeout=1)
+
+    def test_mutable_index_caches_definite_results(self):
+        """Test that only definite bounded results are cached."""
+        index = MutableIndex(self.hard_matrix)
+        assert index.find_string_with_path(self.hard_word, 'backtrack', max_nodes=50).status == 'undetermined'
+        assert index.info()['results'] == 0
+        assert index.find_string_with_path("AB", 'backtrack', max_nodes=50).found
+        result = index.find_string_with_path("AB", 'backtrack', timeout=1)
+        assert result.found and index.hits == 1
+
+
+class TestBoardCorpus:
+    """Test searching one string across many boards."""
+
+    def setup_method(self):
+        """Set up a few small boards."""
+        self.boards = [
+            [['C', 'A', 'T'], ['X', 'X', 'X']],
+            [['C', 'X', 'T'], ['X', 'A', 'X']],
+            [['T', 'A', 'C'], ['A', 'T', 'X']],
+            [['C', 'A'], ['T', 'X']],
+            []
+        ]
+        self.corpus = BoardCorpus(self.boards)
+
+    def test_shortlist(self):
+        """Test that boards lacking characters or adjacent pairs are left out."""
+        assert len(self.corpus) == 5
+        # Board 1 has the letters of CAT but no adjacent C and A; board 3 lacks an adjacent A and T
+        assert self.corpus.shortlist("CAT") == [0, 2]
+        assert self.corpus.shortlist("TAT") == [2]
+        assert self.corpus.shortlist("XXX") == [0]
+        assert self.corpus.shortlist("Z") == []
+        assert self.corpus.shortlist("") == [0, 1, 2, 3]
+
+    def test_find_string(self):
+        """Test that results match searching every board."""
+        for word in ["CAT", "TAC", "XX", "XXX", "ATX", "CATX", "Z", ""]:
+            expected = {}
+            for board_id, board in enumerate(self.boards):
+                path = find_string_with_path(board, word, 'backtrack')
+                if path is not None:
+                    expected[board_id] = path
+            assert self.corpus.find_string(word, 'backtrack') == expected, word
+        assert self.corpus.find_string("CAT", workers=2) == self.corpus.find_string("CAT")
+        with pytest.raises(ValueError):
+            self.corpus.find_string("CAT", engine='nope')
+
+    def test_matches_exhaustive_search(self):
+        """Test that the default search reports exactly the boards holding the string."""
+        import random
+        rng = random.Random(24)
+        boards = [[[rng.choice("AB") for _ in range(4)] for _ in range(4)] for _ in range(60)]
+        boards.append([['B', 'B'], ['B', 'B'], ['A', 'A']])
+        corpus = BoardCorpus(boards)
+        for word in ["BAB", "ABBA", "AAAB", "BABAB", "ABABABAB", "AAAAA"]:
+            expected = {}
+            for board_id, board in enumerate(boards):
+                path = find_string_with_path(board, word, 'backtrack')
+                if path is not None:
+                    expected[board_id] = path
+            found = corpus.find_string(word)
+            assert found == expected, word
+            for board_id, path in found.items():
+                assert len(set(path)) == len(path)
+                assert ''.join(boards[board_id][r][c] for r, c in path) == word
+
+    def test_add_grids(self, tmp_path):
+        """Test adding compact and memory-mapped grids."""
+        grid_path = tmp_path / "board.txt"
+        grid_path.write_text("TAX\nCAX\n")
+        grid = load_matrix(str(grid_path))
+        board_id = self.corpus.add(grid)
+        assert self.corpus[board_id] is grid
+        assert self.corpus.add(CompactGrid.from_matrix(self.boards[0])) == board_id + 1
+        assert self.corpus.shortlist("TAC") == [0, 2, board_id, board_id + 1]
+        assert self.corpus.find_string("XACT") == {3: [(1, 1), (0, 1), (0, 0), (1, 0)],
+                                                   board_id: [(1, 2), (1, 1), (1, 0), (0, 0)]}
+        grid.close()
+
+
+class TestDeadEndMemo:
+    """Test the dead-end memo of (cell, string index) states."""
+
+    def setup_method(self):
+        """Set up a matrix where one A leads only into a dead end."""
+        self.matrix = [
+            ['A', 'B', 'C'],
+            ['A', 'X', 'X'],
+            ['B', 'X', 'X']
+        ]
+        self.index = MatrixIndex(self.matrix)
+
+    def test_live_states(self):
+        """Test which states can complete the string in each direction."""
+        memo = self.index.dead_end_memo("ABC")
+        assert isinstance(memo, DeadEndMemo)
+        cell = self.index.grid.cell_id
+        assert memo.live(cell(0, 0), 0) == True
+        # The B below the second A has no C next to it
+        assert memo.live(cell(1, 0), 0) == False
+        assert memo.live(cell(2, 0), 1) == False
+        # Tables for walking back are only allocated when first needed
+        assert memo._settled[0] is None and memo._dead[0] is None
+        # Walking back toward the start, that B is fine
+        assert memo.live(cell(2, 0), 1, -1) == True
+        assert memo.live(cell(0, 2), 2, -1) == True
+        assert memo.live(cell(0, 2), 2) == True
+        assert self.index.dead_end_memo("A\u0100") is not None
+        assert MatrixIndex(CompactGrid(b"AB", 1, 2)).dead_end_memo("A\u0100") is None
+
+    def test_engines_agree(self):
+        """Test that the memo never changes whether a string is found."""
+        import random
+        rng = random.Random(25)
+        for _ in range(100):
+            matrix = [[rng.choice("AAB") for _ in range(5)] for _ in range(4)]
+            word = ''.join(rng.choice("AB") for _ in range(rng.randint(1, 8)))
+            index = MatrixIndex(matrix)
+            expected = index.find_string_with_path(word, 'backtrack') is not None
+            for engine in ('backtrack', 'bidirectional', 'frontier'):
+                path = index.find_string_with_path(word, engine, memo=True)
+                assert (path is not None) == expected, (matrix, word, engine)
+                if path is not None:
+                    assert ''.join(matrix[r][c] for r, c in path) == word
+                    assert len(set(path)) == len(path)
+
+    def test_prunes_repeated_dead_ends(self):
+        """Test that dead ends are cut off on a repetitive grid."""
+        import random
+        rng = random.Random(5)
+        matrix = [[rng.choice('A' * 12 + 'B') for _ in range(40)] for _ in range(40)]
+        word = 'A' * 8 + 'BBB' + 'A' * 8
+        plain, memo = SearchStats(), SearchStats()
+        assert find_string_with_path(matrix, word, 'backtrack', stats=plain) is not None
+        assert find_string_with_path(matrix, word, 'backtrack', stats=memo, memo=True) is not None
+        assert memo.nodes_expanded * 5 < plain.nodes_expanded
+        assert find_string_in_matrix(self.matrix, "ABC", memo=True) == True
+        assert find_string_in_matrix(self.matrix, "CBB", engine='bidirectional', memo=True) == False
+
+    def test_mutable_index_keys(self):
+        """Test that results with and without the memo are cached separately."""
+        index = MutableIndex(self.matrix)
+        assert index.find_string_with_path("ABC") == [(0, 0), (0, 1), (0, 2)]
+        assert index.find_string_with_path("ABC", memo=True) == [(0, 0), (0, 1), (0, 2)]
+        assert index.misses == 2 and index.hits == 0
+        index.find_string_with_path("ABC", memo=True)
+        assert index.hits == 1
+        assert index.find_string_in_matrix("ABC", memo=True) is True
+        assert index.hits == 2
+        assert MatrixIndex(self.matrix).find_string_in_matrix("CBB", 'backtrack', memo=True) is False
+        assert MatrixIndex(self.matrix).find_string_in_matrix("ABC", max_nodes=100, memo=True).found
+
+
 # Sample test data for manual testing
 SAMPLE_MATRICES = {
     "simple_3x3": [